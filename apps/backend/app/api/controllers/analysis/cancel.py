@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.schemas.analysis import CancelJobRequest, CancelJobResponse
+from app.schemas.analysis_jobs import AnalysisJobStatus
+from app.services.analysis_jobs_repo import (
+    AnalysisJobsRepoError,
+    get_analysis_job_by_id,
+    request_analysis_job_cancel,
+)
+from app.utils.poll_token import poll_token_is_valid, poll_token_precheck
+
+router = APIRouter()
+
+_INVALID_TOKEN_RESPONSE = JSONResponse(
+    status_code=401,
+    content={"error": "Invalid or expired token"},
+)
+
+_JOB_NOT_FOUND_RESPONSE = JSONResponse(
+    status_code=404,
+    content={"error": "Invalid or expired token"},
+)
+
+_JOB_FINISHED_RESPONSE = JSONResponse(
+    status_code=409,
+    content={"error": "Job already finished"},
+)
+
+_SERVICE_UNAVAILABLE_RESPONSE = JSONResponse(
+    status_code=502,
+    content={"error": "Service temporarily unavailable"},
+)
+
+
+@router.post("/cancel", response_model=CancelJobResponse)
+async def cancel_job(payload: CancelJobRequest) -> CancelJobResponse | JSONResponse:
+    """Cancel an analysis the client no longer waits for.
+
+    A queued job is cancelled immediately; a running job reports
+    status="running" with cancelRequested=true until its worker stops it at
+    the next stage boundary (poll /status for the final "cancelled").
+    Cancelling a cancelled job is a no-op; a finished job returns 409.
+    """
+    if not poll_token_precheck(payload.jobId, payload.jobToken):
+        return _INVALID_TOKEN_RESPONSE
+    try:
+        row = await get_analysis_job_by_id(payload.jobId)
+    except AnalysisJobsRepoError:
+        return _SERVICE_UNAVAILABLE_RESPONSE
+
+    # Same message for unknown jobs and bad tokens to prevent enumeration.
+    if row is None:
+        return _JOB_NOT_FOUND_RESPONSE
+    if not poll_token_is_valid(row, payload.jobToken):
+        return _INVALID_TOKEN_RESPONSE
+
+    job_id = str(row["id"])
+    status = AnalysisJobStatus(row["status"])
+    if status == AnalysisJobStatus.CANCELLED:
+        return CancelJobResponse(jobId=job_id, status=status, cancelRequested=True)
+    if status in (AnalysisJobStatus.SUCCEEDED, AnalysisJobStatus.FAILED):
+        return _JOB_FINISHED_RESPONSE
+
+    try:
+        new_status = await request_analysis_job_cancel(job_id)
+    except AnalysisJobsRepoError:
+        return _SERVICE_UNAVAILABLE_RESPONSE
+    if new_status is None:
+        # Finished between the read and the cancel request.
+        return _JOB_FINISHED_RESPONSE
+
+    return CancelJobResponse(
+        jobId=job_id,
+        status=AnalysisJobStatus(new_status),
+        cancelRequested=True,
+    )
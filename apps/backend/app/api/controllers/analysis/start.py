@@ -1,49 +1,169 @@
-import secrets
-from datetime import datetime, timedelta, timezone
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Any
 
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 
+from app.core.config import settings
 from app.core.problems import problem_response
 from app.schemas.analysis import VerifyAuthenticityRequest, VerifyAuthenticityResponse
 from app.schemas.analysis_jobs import AnalysisJobStage, AnalysisJobStatus
-from app.services.analysis_jobs_repo import AnalysisJobsRepoError, create_analysis_job
+from app.services.analysis_jobs_repo import (
+    AnalysisJobsRepoError,
+    create_analysis_job,
+    find_reusable_analysis_job,
+    get_analysis_job_by_request_id,
+    refresh_poll_token,
+)
 from app.services.integrity import (
     IntegrityShaMismatchError,
-    verify_sha256_bytes,
+    verify_supabase_object_integrity,
 )
-from app.services.supabase_storage import SupabaseStorageError, download_object_bytes
+from app.services.supabase_storage import SupabaseStorageError
+from app.utils.datetime_coercion import coerce_utc_datetime
+from app.utils.poll_token import issue_poll_token, poll_token_precheck
 
 router = APIRouter()
 
+_POLL_TOKEN_TTL = timedelta(hours=1)
+
+
+def _new_poll_token(job_id: str) -> tuple[str, datetime]:
+    # Whole seconds, so a signed token's expiry matches the stored one.
+    expires_at = (datetime.now(UTC) + _POLL_TOKEN_TTL).replace(microsecond=0)
+    return issue_poll_token(job_id, expires_at), expires_at
+
+
+def _is_same_submission(
+    row: dict[str, Any], payload: VerifyAuthenticityRequest, sha256: str
+) -> bool:
+    """Whether a job found by requestId was created for this same document."""
+    return (
+        row.get("bucket") == payload.storage.bucket
+        and row.get("path") == payload.storage.path
+        and str(row.get("sha256") or "").lower() == sha256
+    )
+
+
+async def _existing_job_response(
+    row: dict[str, Any], payload: VerifyAuthenticityRequest, sha256: str
+) -> VerifyAuthenticityResponse | JSONResponse:
+    """Answer a retried requestId with the job it already created.
+
+    The stored poll token is returned while it is valid; an expired one (or
+    one the status endpoints would no longer accept) is replaced so the
+    caller can poll again.  A requestId replayed for a different document
+    is rejected instead of handing out that job.
+    """
+    if not _is_same_submission(row, payload, sha256):
+        return problem_response(
+            "analysis_request_conflict",
+            extra={"requestId": str(payload.requestId)},
+        )
+
+    poll_token = row.get("poll_status_token")
+    try:
+        expires_at = coerce_utc_datetime(
+            row.get("poll_status_token_expires_at"),
+            field="poll_status_token_expires_at",
+        )
+    except ValueError:
+        expires_at = None
+    if (
+        not poll_token
+        or expires_at is None
+        or datetime.now(UTC) >= expires_at
+        or not poll_token_precheck(str(row["id"]), poll_token)
+    ):
+        poll_token, new_expires_at = _new_poll_token(str(row["id"]))
+        await refresh_poll_token(
+            job_id=str(row["id"]),
+            poll_token=poll_token,
+            expires_at=new_expires_at.isoformat(),
+        )
+
+    return VerifyAuthenticityResponse(
+        message="Analysis already started for this request",
+        success=True,
+        jobId=str(row["id"]),
+        status=AnalysisJobStatus(row["status"]),
+        jobToken=poll_token,
+    )
+
 
 @router.post("/start", response_model=VerifyAuthenticityResponse)
 async def start_analysis(
     payload: VerifyAuthenticityRequest,
 ) -> VerifyAuthenticityResponse | JSONResponse:
+    request_id = str(payload.requestId)
+    sha256 = payload.integrity.sha256.lower()
+    reused = False
     try:
-        content = await download_object_bytes(
-            bucket=payload.storage.bucket, path=payload.storage.path
-        )
-        verify_sha256_bytes(
-            content=content,
-            sha256=payload.integrity.sha256,
+        existing = await get_analysis_job_by_request_id(request_id)
+        if existing is not None:
+            return await _existing_job_response(existing, payload, sha256)
+
+        # Metadata check or streaming hash; the body is never held in memory.
+        hashed = await verify_supabase_object_integrity(
+            bucket=payload.storage.bucket,
+            path=payload.storage.path,
+            sha256=sha256,
         )
 
-        poll_token = secrets.token_urlsafe(32)
-        poll_token_expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+        # The id is chosen here rather than by the DB so it can be signed
+        # into the poll token before the row is inserted.
+        new_job_id = str(uuid.uuid4())
+        poll_token, poll_token_expires_at = _new_poll_token(new_job_id)
 
         job_row = {
+            "id": new_job_id,
             "status": AnalysisJobStatus.QUEUED.value,
             "stage": AnalysisJobStage.CREATED.value,
             "bucket": payload.storage.bucket,
             "path": payload.storage.path,
-            "sha256": payload.integrity.sha256,
+            "sha256": sha256,
             "poll_status_token": poll_token,
             "poll_status_token_expires_at": poll_token_expires_at.isoformat(),
             "source_type": payload.document.sourceType,
+            "request_id": request_id,
+            "pipeline_version": settings.pipeline_version,
         }
-        inserted = await create_analysis_job(job_row)
+
+        # Same document, same pipeline: share the stored result instead of
+        # queueing another run.  The new row keeps its own poll token.  Only
+        # a SHA-256 the server computed itself may select another job's
+        # result; a metadata checksum is client-writable, so those jobs are
+        # queued and the worker verifies the bytes.
+        previous = None
+        if hashed:
+            previous = await find_reusable_analysis_job(
+                sha256=sha256, pipeline_version=settings.pipeline_version
+            )
+        if previous is not None:
+            reused = True
+            job_row.update(
+                {
+                    "status": AnalysisJobStatus.SUCCEEDED.value,
+                    "stage": AnalysisJobStage.DONE.value,
+                    "results": previous.get("results"),
+                    "result_json": previous.get("result_json"),
+                    "completed_at": datetime.now(UTC).isoformat(),
+                    "reused_from_job_id": previous["id"],
+                }
+            )
+
+        try:
+            inserted = await create_analysis_job(job_row)
+        except AnalysisJobsRepoError as exc:
+            if exc.code != "analysis_job_duplicate_request":
+                raise
+            # A concurrent submission of the same requestId won the insert.
+            existing = await get_analysis_job_by_request_id(request_id)
+            if existing is None:
+                raise
+            return await _existing_job_response(existing, payload, sha256)
+
         job_id = (
             inserted.get("id")
             or inserted.get("job_id")
@@ -63,11 +183,20 @@ async def start_analysis(
     except IntegrityShaMismatchError:
         return problem_response(
             "integrity_sha_mismatch",
-            extra={"requestId": str(payload.requestId)},
+            extra={"requestId": request_id},
         )
 
     # TODO: Call worker
 
+    if reused:
+        return VerifyAuthenticityResponse(
+            message="Analysis result reused from a previous run",
+            success=True,
+            jobId=str(job_id),
+            status=AnalysisJobStatus.SUCCEEDED,
+            jobToken=poll_token,
+        )
+
     return VerifyAuthenticityResponse(
         message="Analysis started successfully",
         success=True,
@@ -1,77 +1,158 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime
+import hashlib
+import json
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+from uuid import UUID
 
-from fastapi import APIRouter, Query
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Header, Query, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from app.schemas.analysis import JobStatusResponse
+from app.core.config import settings
+from app.schemas.analysis import (
+    BatchStatusRequest,
+    BatchStatusResponse,
+    BatchStatusResult,
+    JobStatusResponse,
+)
 from app.schemas.analysis_jobs import AnalysisJobStatus
 from app.schemas.results import ResultsV1
 from app.services.analysis_jobs_repo import (
     AnalysisJobsRepoError,
     get_analysis_job_by_id,
+    get_analysis_job_results,
+    get_analysis_jobs_by_ids,
 )
+from app.services.status_feed import get_status_feed
 from app.utils.datetime_coercion import coerce_utc_datetime
+from app.utils.poll_token import poll_token_is_valid, poll_token_precheck
+from app.utils.ttl_cache import TTLCache
 
 router = APIRouter()
 
+_INVALID_TOKEN_ERROR = "Invalid or expired token"
+_SERVICE_UNAVAILABLE_ERROR = "Service temporarily unavailable"
+
+_TERMINAL_STATUSES = frozenset(
+    {
+        AnalysisJobStatus.SUCCEEDED,
+        AnalysisJobStatus.FAILED,
+        AnalysisJobStatus.CANCELLED,
+    }
+)
+
 _INVALID_TOKEN_RESPONSE = JSONResponse(
     status_code=401,
-    content={"error": "Invalid or expired token"},
+    content={"error": _INVALID_TOKEN_ERROR},
 )
 
 _JOB_NOT_FOUND_RESPONSE = JSONResponse(
     status_code=404,
-    content={"error": "Invalid or expired token"},
+    content={"error": _INVALID_TOKEN_ERROR},
 )
 
 _SERVICE_UNAVAILABLE_RESPONSE = JSONResponse(
     status_code=502,
-    content={"error": "Service temporarily unavailable"},
+    content={"error": _SERVICE_UNAVAILABLE_ERROR},
 )
 
+# Clients must revalidate every poll, but may do so with If-None-Match.
+_CACHE_CONTROL = "private, no-cache"
 
-@router.get("/status", response_model=JobStatusResponse)
-async def get_job_status(
-    jobId: str = Query(..., min_length=1),
-    jobToken: str = Query(..., min_length=1),
-) -> JobStatusResponse | JSONResponse:
-    try:
-        row = await get_analysis_job_by_id(jobId)
-    except AnalysisJobsRepoError:
-        return _SERVICE_UNAVAILABLE_RESPONSE
 
-    # Job not found — return 404 (same message as token mismatch to prevent enumeration)
-    if row is None:
-        return _JOB_NOT_FOUND_RESPONSE
+@dataclass(frozen=True)
+class _CachedStatus:
+    etag: str
+    body: bytes
 
-    # Token comparison
-    stored_token: str | None = row.get("poll_status_token")
-    if not stored_token or stored_token != jobToken:
-        return _INVALID_TOKEN_RESPONSE
 
-    # Expiry check
-    raw_expires_at = row.get("poll_status_token_expires_at")
-    if not raw_expires_at:
-        return _INVALID_TOKEN_RESPONSE
+# Terminal jobs no longer change, so their serialized status is kept in
+# memory for a while and served again while the row's ETag still matches,
+# without reading and validating the results again.  This does not save the
+# status read: the row is fetched on every poll so the token is checked
+# against the one stored now.  Skipping that read too would let a replaced
+# token keep working for up to the TTL, which is not worth one small query.
+_terminal_cache: TTLCache[str, _CachedStatus] = TTLCache(
+    ttl_seconds=settings.status_cache_ttl_seconds,
+    max_entries=settings.status_cache_max_entries,
+)
+
 
+def _is_uuid(value: str) -> bool:
     try:
-        expires_at = coerce_utc_datetime(raw_expires_at, field="poll_status_token_expires_at")
+        UUID(value)
     except ValueError:
-        return _INVALID_TOKEN_RESPONSE
+        return False
+    return True
+
+
+def _status_etag(row: dict[str, Any]) -> str:
+    """Strong ETag of a job's status; the worker bumps updated_at on writes."""
+    key = "|".join(
+        str(row.get(field)) for field in ("id", "status", "stage", "updated_at")
+    )
+    return f'"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        # If-None-Match uses the weak comparison, so W/ prefixes are ignored.
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
 
-    if datetime.now(UTC) >= expires_at:
-        return _INVALID_TOKEN_RESPONSE
 
-    # Build the response — never include poll_status_token or poll_status_token_expires_at
+def _conditional_response(
+    etag: str, body: bytes | None, if_none_match: str | None
+) -> Response:
+    headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+    if body is None or _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _with_results(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Attach ``results`` to the succeeded rows, read in one extra query.
+
+    Status rows are fetched without the (potentially large) results, which
+    are only read once a verified token shows the job has succeeded, so
+    polls of unfinished jobs stay small.  Raises AnalysisJobsRepoError.
+    """
+    pending = [
+        str(row["id"])
+        for row in rows
+        if row.get("status") == AnalysisJobStatus.SUCCEEDED and "results" not in row
+    ]
+    if not pending:
+        return rows
+    results = await get_analysis_job_results(pending)
+    return [
+        {**row, "results": results.get(str(row["id"]).lower())}
+        if str(row["id"]) in pending
+        else row
+        for row in rows
+    ]
+
+
+def _status_response(row: dict[str, Any]) -> JobStatusResponse | None:
+    """Build the client-facing status of a job row whose token was checked.
+
+    Never includes poll_status_token or poll_status_token_expires_at.
+    Returns None when the row's timestamps are malformed (served as 502).
+    """
     status = AnalysisJobStatus(row["status"])
 
     raw_created_at = row.get("created_at")
     try:
         submitted_at = coerce_utc_datetime(raw_created_at, field="created_at")
     except ValueError:
-        return _SERVICE_UNAVAILABLE_RESPONSE
+        return None
 
     raw_completed_at = row.get("completed_at")
     completed_at: datetime | None = None
@@ -79,7 +160,7 @@ async def get_job_status(
         try:
             completed_at = coerce_utc_datetime(raw_completed_at, field="completed_at")
         except ValueError:
-            return _SERVICE_UNAVAILABLE_RESPONSE
+            return None
 
     result: ResultsV1 | None = None
     if status == AnalysisJobStatus.SUCCEEDED:
@@ -102,3 +183,201 @@ async def get_job_status(
         submittedAt=submitted_at,
         completedAt=completed_at,
     )
+
+
+@router.get("/status", response_model=JobStatusResponse)
+async def get_job_status(
+    jobId: str = Query(..., min_length=1),
+    jobToken: str = Query(..., min_length=1),
+    if_none_match: str | None = Header(default=None),
+) -> Response:
+    """Current status of a job, with ETag / If-None-Match support.
+
+    Unchanged polls get a bodiless 304 without the response being built.
+    """
+    # Forged or expired signed tokens are rejected before any lookup.
+    if not poll_token_precheck(jobId, jobToken):
+        return _INVALID_TOKEN_RESPONSE
+    # A malformed id cannot match a row (and Postgres would reject it).
+    if not _is_uuid(jobId):
+        return _JOB_NOT_FOUND_RESPONSE
+
+    try:
+        row = await get_analysis_job_by_id(jobId)
+    except AnalysisJobsRepoError:
+        return _SERVICE_UNAVAILABLE_RESPONSE
+
+    # Job not found — return 404 (same message as token mismatch to prevent enumeration)
+    if row is None:
+        return _JOB_NOT_FOUND_RESPONSE
+
+    # Token comparison and expiry check
+    if not poll_token_is_valid(row, jobToken):
+        return _INVALID_TOKEN_RESPONSE
+
+    etag = _status_etag(row)
+    if _etag_matches(if_none_match, etag):
+        return _conditional_response(etag, None, if_none_match)
+    cached = _terminal_cache.get(str(row["id"]).lower())
+    if cached is not None and cached.etag == etag:
+        return _conditional_response(etag, cached.body, if_none_match)
+
+    try:
+        [row] = await _with_results([row])
+    except AnalysisJobsRepoError:
+        return _SERVICE_UNAVAILABLE_RESPONSE
+    response = _status_response(row)
+    if response is None:
+        return _SERVICE_UNAVAILABLE_RESPONSE
+    body = response.model_dump_json().encode()
+    if response.status in _TERMINAL_STATUSES:
+        _terminal_cache.set(str(row["id"]).lower(), _CachedStatus(etag, body))
+    return _conditional_response(etag, body, if_none_match)
+
+
+@router.post("/status:batch", response_model=BatchStatusResponse)
+async def get_job_statuses(
+    payload: BatchStatusRequest,
+) -> BatchStatusResponse | JSONResponse:
+    """Status of many jobs in one request, for clients polling several jobs.
+
+    All rows are fetched in a single query.  Each result carries the HTTP
+    status GET /status would have answered for that job (200, 401, 404 or
+    502) and either its status or the same error message, so a batch
+    reveals no more about unknown ids than single polls do.  Results come
+    back in request order; a failed DB query fails the whole batch with 502.
+    """
+    # A malformed id cannot match a row, and would make Postgres reject
+    # the whole IN list, so it is answered as "not found" without a query;
+    # jobs whose signed token fails the precheck are not queried either.
+    job_ids = [
+        item.jobId
+        for item in payload.jobs
+        if _is_uuid(item.jobId) and poll_token_precheck(item.jobId, item.jobToken)
+    ]
+    try:
+        rows = await get_analysis_jobs_by_ids(job_ids)
+    except AnalysisJobsRepoError:
+        return _SERVICE_UNAVAILABLE_RESPONSE
+    rows_by_id = {str(row["id"]).lower(): row for row in rows}
+
+    # Only rows whose token checks out are worth reading results for.
+    verified = [
+        row
+        for item in payload.jobs
+        if (row := rows_by_id.get(item.jobId.lower())) is not None
+        and poll_token_is_valid(row, item.jobToken)
+    ]
+    try:
+        verified = await _with_results(verified)
+    except AnalysisJobsRepoError:
+        return _SERVICE_UNAVAILABLE_RESPONSE
+    verified_by_id = {str(row["id"]).lower(): row for row in verified}
+
+    results: list[BatchStatusResult] = []
+    for item in payload.jobs:
+        row = rows_by_id.get(item.jobId.lower())
+        if not poll_token_precheck(item.jobId, item.jobToken):
+            results.append(_error_result(item.jobId, 401, _INVALID_TOKEN_ERROR))
+        elif row is None:
+            results.append(_error_result(item.jobId, 404, _INVALID_TOKEN_ERROR))
+        elif not poll_token_is_valid(row, item.jobToken):
+            results.append(_error_result(item.jobId, 401, _INVALID_TOKEN_ERROR))
+        elif (response := _status_response(verified_by_id[item.jobId.lower()])) is None:
+            results.append(_error_result(item.jobId, 502, _SERVICE_UNAVAILABLE_ERROR))
+        else:
+            results.append(
+                BatchStatusResult(jobId=item.jobId, statusCode=200, job=response)
+            )
+    return BatchStatusResponse(results=results)
+
+
+def _error_result(job_id: str, status_code: int, error: str) -> BatchStatusResult:
+    return BatchStatusResult(jobId=job_id, statusCode=status_code, error=error)
+
+
+@router.get("/status:stream", response_model=None)
+async def stream_job_status(
+    jobId: str = Query(..., min_length=1),
+    jobToken: str = Query(..., min_length=1),
+) -> StreamingResponse | JSONResponse:
+    """Server-Sent Events stream of a job's status, instead of polling /status.
+
+    The token is checked exactly as for /status, with the same 401/404/502
+    answers.  The stream then sends a ``status`` event with the current
+    JobStatusResponse, another on every status or stage change, and ends
+    after the terminal one.  Changes come from the process-wide status feed
+    (one DB read per interval for all open streams).  If the token expires
+    or is replaced, or the row becomes unreadable mid-stream, an ``error``
+    event carrying the equivalent statusCode and message ends it.
+    """
+    if not poll_token_precheck(jobId, jobToken):
+        return _INVALID_TOKEN_RESPONSE
+    if not _is_uuid(jobId):
+        return _JOB_NOT_FOUND_RESPONSE
+    try:
+        row = await get_analysis_job_by_id(jobId)
+    except AnalysisJobsRepoError:
+        return _SERVICE_UNAVAILABLE_RESPONSE
+    if row is None:
+        return _JOB_NOT_FOUND_RESPONSE
+    if not poll_token_is_valid(row, jobToken):
+        return _INVALID_TOKEN_RESPONSE
+    try:
+        [row] = await _with_results([row])
+    except AnalysisJobsRepoError:
+        return _SERVICE_UNAVAILABLE_RESPONSE
+    response = _status_response(row)
+    if response is None:
+        return _SERVICE_UNAVAILABLE_RESPONSE
+
+    return StreamingResponse(
+        _status_events(row, response, jobToken),
+        media_type="text/event-stream",
+        # Keep proxies from caching or buffering the stream.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _status_events(
+    row: dict[str, Any], response: JobStatusResponse, job_token: str
+) -> AsyncIterator[str]:
+    yield _sse_event("status", response.model_dump_json())
+    if response.status in _TERMINAL_STATUSES:
+        return
+
+    feed = get_status_feed()
+    subscription = feed.subscribe(str(row["id"]), row)
+    try:
+        while True:
+            changed = await subscription.next(settings.status_stream_keepalive_seconds)
+            if changed is not None:
+                row = changed
+            if not poll_token_is_valid(row, job_token):
+                yield _sse_error(401, _INVALID_TOKEN_ERROR)
+                return
+            if changed is None:
+                yield ": keep-alive\n\n"
+                continue
+            try:
+                [row] = await _with_results([row])
+            except AnalysisJobsRepoError:
+                yield _sse_error(502, _SERVICE_UNAVAILABLE_ERROR)
+                return
+            response = _status_response(row)
+            if response is None:
+                yield _sse_error(502, _SERVICE_UNAVAILABLE_ERROR)
+                return
+            yield _sse_event("status", response.model_dump_json())
+            if response.status in _TERMINAL_STATUSES:
+                return
+    finally:
+        feed.unsubscribe(subscription)
+
+
+def _sse_event(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+def _sse_error(status_code: int, error: str) -> str:
+    return _sse_event("error", json.dumps({"statusCode": status_code, "error": error}))
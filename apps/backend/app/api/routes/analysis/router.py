@@ -1,7 +1,8 @@
 from fastapi import APIRouter
 
-from app.api.controllers.analysis import start, status
+from app.api.controllers.analysis import cancel, start, status
 
 api_router = APIRouter(prefix="/analysis")
 api_router.include_router(start.router, tags=["analysis"])
 api_router.include_router(status.router, tags=["analysis"])
+api_router.include_router(cancel.router, tags=["analysis"])
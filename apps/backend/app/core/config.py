@@ -1,5 +1,6 @@
 import json
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -20,8 +21,37 @@ class Settings(BaseSettings):
     supabase_url: str = ""
     supabase_service_role_key: str = ""
     supabase_signed_url_ttl_seconds: int = 60
+    # Shared HTTP pool behind the Supabase client (PostgREST + Storage).
+    supabase_http_max_connections: int = 50
+    supabase_http_max_keepalive_connections: int = 20
+    supabase_http_keepalive_expiry_seconds: float = 30.0
+    supabase_http_timeout_seconds: float = 30.0
+    supabase_http2: bool = True
     max_file_size_bytes: int = 10 * 1024 * 1024  # 10 MB
+    # "stream": hash the object body on /start.  "metadata": trust the size and
+    # a checksum recorded in object metadata (falls back to "stream" without
+    # one); the worker always re-verifies the bytes it analyzes.
+    integrity_mode: Literal["stream", "metadata"] = "stream"
+    # Recorded on every job; /start only reuses results of the same version.
+    # Bump it whenever the worker pipeline changes what it produces.
+    pipeline_version: str = "1"
     max_extracted_text_chars: int = 1_000_000
+    # Upper bound on the jobs one POST /status:batch request may ask about.
+    status_batch_max_jobs: int = 50
+    # GET /status:stream: one shared poller per process reads all streamed
+    # jobs this often; idle streams get a keep-alive comment this often.
+    status_stream_poll_interval_seconds: float = 1.0
+    status_stream_keepalive_seconds: float = 15.0
+    # GET /status keeps recently served terminal response bodies in memory
+    # (per process) so their results are not re-read; the status row still
+    # is, on every poll.  0 disables the cache.
+    status_cache_ttl_seconds: float = 30.0
+    status_cache_max_entries: int = 1024
+    # When set, /start issues HMAC-signed poll tokens that the status and
+    # cancel endpoints verify before reading the job.  Unsigned tokens (issued
+    # before the secret was set) keep working unless accept_unsigned is off.
+    poll_token_secret: str = ""
+    poll_token_accept_unsigned: bool = True
 
     @property
     def allowed_buckets_set(self) -> set[str]:
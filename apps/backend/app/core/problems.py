@@ -59,6 +59,11 @@ PROBLEM_DEFS: dict[str, ProblemDef] = {
         title="Extracted text too large",
         default_detail="The extracted text exceeds the maximum allowed size.",
     ),
+    "analysis_request_conflict": ProblemDef(
+        status=409,
+        title="Request id already used",
+        default_detail="This requestId was already used for a different document.",
+    ),
     "db_unauthorized": ProblemDef(
         status=502,
         title="Database authorization failed",
@@ -69,6 +74,16 @@ PROBLEM_DEFS: dict[str, ProblemDef] = {
         title="Analysis job creation failed",
         default_detail="The server could not create the analysis job.",
     ),
+    "analysis_job_fetch_failed": ProblemDef(
+        status=502,
+        title="Analysis job lookup failed",
+        default_detail="The server could not look up existing analysis jobs.",
+    ),
+    "analysis_job_update_failed": ProblemDef(
+        status=502,
+        title="Analysis job update failed",
+        default_detail="The server could not update the analysis job.",
+    ),
 }
 
 
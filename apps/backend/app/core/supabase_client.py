@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
 
-from supabase import Client, create_client
+import httpx
+from supabase import AsyncClient, Client, create_client
+from supabase.lib.client_options import AsyncClientOptions, SyncClientOptions
 
 from app.core.config import settings
 
@@ -13,10 +16,123 @@ class SupabaseClientError(Exception):
     detail: str | None = None
 
 
-def get_supabase_admin_client() -> Client:
-    if not (settings.supabase_url or "").strip() or not (
-        settings.supabase_service_role_key or ""
-    ).strip():
+class SupabaseClients:
+    """Process-wide Supabase admin clients and the HTTP pools they run on.
+
+    Built once (normally in the FastAPI lifespan) so PostgREST and Storage
+    calls reuse keep-alive, HTTP/2-capable connections instead of paying a
+    new client, TCP and TLS setup on every request.
+
+    ``async_admin`` is the request path: it runs on the event loop over a
+    shared httpx.AsyncClient, so no worker thread is held per call.  The sync
+    ``admin`` client remains for the synchronous helpers.
+    """
+
+    def __init__(self, *, url: str, key: str) -> None:
+        self.limits = httpx.Limits(
+            max_connections=settings.supabase_http_max_connections,
+            max_keepalive_connections=settings.supabase_http_max_keepalive_connections,
+            keepalive_expiry=settings.supabase_http_keepalive_expiry_seconds,
+        )
+        self.http = httpx.Client(
+            limits=self.limits,
+            http2=settings.supabase_http2,
+            timeout=settings.supabase_http_timeout_seconds,
+            follow_redirects=True,
+        )
+        self.admin: Client = create_client(
+            url, key, options=SyncClientOptions(httpx_client=self.http)
+        )
+        self.async_http = httpx.AsyncClient(
+            limits=self.limits,
+            http2=settings.supabase_http2,
+            timeout=settings.supabase_http_timeout_seconds,
+            follow_redirects=True,
+        )
+        # AsyncClient.create() would await an auth session lookup; the service
+        # role key is sent as the bearer token, so construct it directly.
+        self.async_admin = AsyncClient(
+            url,
+            key,
+            AsyncClientOptions(
+                httpx_client=self.async_http,
+                headers={"Authorization": f"Bearer {key}"},
+            ),
+        )
+
+    def pool_stats(self) -> dict[str, int]:
+        """Return a snapshot of both connection pools (for logs and diagnostics)."""
+        stats = {
+            "max_connections": self.limits.max_connections or 0,
+            "max_keepalive_connections": self.limits.max_keepalive_connections or 0,
+        }
+        for prefix, client in (("", self.http), ("async_", self.async_http)):
+            pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            connections = list(getattr(pool, "connections", []) or [])
+            idle = sum(1 for conn in connections if conn.is_idle())
+            stats[f"{prefix}connections"] = len(connections)
+            stats[f"{prefix}idle"] = idle
+            stats[f"{prefix}active"] = len(connections) - idle
+        return stats
+
+    async def aclose(self) -> None:
+        self.http.close()
+        await self.async_http.aclose()
+
+
+_clients: SupabaseClients | None = None
+_clients_lock = threading.Lock()
+
+
+def _is_configured() -> bool:
+    return bool((settings.supabase_url or "").strip()) and bool(
+        (settings.supabase_service_role_key or "").strip()
+    )
+
+
+def get_supabase_clients() -> SupabaseClients:
+    """Return the shared client container, creating it on first use.
+
+    The lifespan normally creates it at startup; lazy creation keeps scripts
+    and tests that never run the lifespan working.
+    """
+    global _clients
+    if not _is_configured():
         raise SupabaseClientError(code="server_misconfigured")
 
-    return create_client(settings.supabase_url, settings.supabase_service_role_key)
+    clients = _clients
+    if clients is not None:
+        return clients
+    with _clients_lock:
+        if _clients is None:
+            _clients = SupabaseClients(
+                url=settings.supabase_url, key=settings.supabase_service_role_key
+            )
+        return _clients
+
+
+def get_supabase_admin_client() -> Client:
+    return get_supabase_clients().admin
+
+
+def get_supabase_async_admin_client() -> AsyncClient:
+    return get_supabase_clients().async_admin
+
+
+def init_supabase_clients() -> SupabaseClients | None:
+    """Create the shared clients at startup; a no-op when unconfigured.
+
+    A misconfigured server still starts so endpoints can report
+    server_misconfigured per request, as before.
+    """
+    if not _is_configured():
+        return None
+    return get_supabase_clients()
+
+
+async def close_supabase_clients() -> None:
+    global _clients
+    with _clients_lock:
+        clients, _clients = _clients, None
+    if clients is not None:
+        await clients.aclose()
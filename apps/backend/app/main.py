@@ -1,12 +1,32 @@
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.router import api_router
 from app.core.config import settings
+from app.core.supabase_client import close_supabase_clients, init_supabase_clients
+from app.services.status_feed import close_status_feed
+
+logger = logging.getLogger("app")
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    clients = init_supabase_clients()
+    try:
+        yield
+    finally:
+        await close_status_feed()
+        if clients is not None:
+            logger.info("Supabase HTTP pool at shutdown: %s", clients.pool_stats())
+        await close_supabase_clients()
 
 
 def create_app() -> FastAPI:
-    application = FastAPI(title=settings.app_name)
+    application = FastAPI(title=settings.app_name, lifespan=lifespan)
 
     application.add_middleware(
         CORSMiddleware,
@@ -130,3 +130,45 @@ class JobStatusResponse(BaseModel):
     error: str | None = None
     submittedAt: datetime
     completedAt: datetime | None = None
+
+
+class CancelJobRequest(BaseModel):
+    jobId: str = Field(min_length=1)
+    jobToken: str = Field(min_length=1)
+
+
+class CancelJobResponse(BaseModel):
+    jobId: str
+    status: AnalysisJobStatus
+    cancelRequested: bool
+
+
+class BatchStatusItem(BaseModel):
+    jobId: str = Field(min_length=1)
+    jobToken: str = Field(min_length=1)
+
+
+class BatchStatusRequest(BaseModel):
+    jobs: list[BatchStatusItem] = Field(min_length=1)
+
+    @field_validator("jobs")
+    @classmethod
+    def check_batch_size(cls, jobs: list[BatchStatusItem]) -> list[BatchStatusItem]:
+        if len(jobs) > settings.status_batch_max_jobs:
+            raise ValueError(
+                f"at most {settings.status_batch_max_jobs} jobs per request"
+            )
+        return jobs
+
+
+class BatchStatusResult(BaseModel):
+    """Outcome for one requested job: the status GET /status would return."""
+
+    jobId: str
+    statusCode: int
+    job: JobStatusResponse | None = None
+    error: str | None = None
+
+
+class BatchStatusResponse(BaseModel):
+    results: list[BatchStatusResult]
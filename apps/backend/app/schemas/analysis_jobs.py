@@ -6,6 +6,7 @@ class AnalysisJobStage(StrEnum):
     LANGGRAPH_RUNNING = "langgraph_running"
     VERIFYING_REFERENCES = "verifying_references"
     PERSISTING_RESULT = "persisting_result"
+    DONE = "done"
 
 
 class AnalysisJobStatus(StrEnum):
@@ -13,4 +14,5 @@ class AnalysisJobStatus(StrEnum):
     RUNNING = "running"
     SUCCEEDED = "succeeded"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
@@ -3,10 +3,23 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
-from anyio.to_thread import run_sync
 from postgrest.exceptions import APIError
 
-from app.core.supabase_client import SupabaseClientError, get_supabase_admin_client
+from app.core.supabase_client import (
+    SupabaseClientError,
+    get_supabase_async_admin_client,
+)
+
+# Postgres SQLSTATE for unique_violation.
+_UNIQUE_VIOLATION = "23505"
+
+# Columns the status endpoints read (including the poll token to check).
+# results is left out: it can be large and is only needed once a job has
+# succeeded, so it is read separately by get_analysis_job_results.
+_STATUS_COLUMNS = (
+    "id, status, stage, error, created_at, completed_at, updated_at,"
+    " poll_status_token, poll_status_token_expires_at"
+)
 
 
 @dataclass(frozen=True)
@@ -17,12 +30,12 @@ class AnalysisJobsRepoError(Exception):
 
 async def create_analysis_job(row: dict[str, Any]) -> dict[str, Any]:
     try:
-        supabase = get_supabase_admin_client()
+        supabase = get_supabase_async_admin_client()
     except SupabaseClientError as exc:
         raise AnalysisJobsRepoError(code=exc.code, detail=exc.detail) from exc
 
-    def _insert_sync() -> dict[str, Any]:
-        resp = supabase.table("analysis_jobs").insert(row).execute()
+    try:
+        resp = await supabase.table("analysis_jobs").insert(row).execute()
         data = getattr(resp, "data", None)
         if not isinstance(data, list) or not data:
             raise AnalysisJobsRepoError(
@@ -35,9 +48,6 @@ async def create_analysis_job(row: dict[str, Any]) -> dict[str, Any]:
                 detail="DB insert returned an unexpected row representation.",
             )
         return dict(data[0])
-
-    try:
-        return await run_sync(_insert_sync)
     except AnalysisJobsRepoError:
         raise
     except APIError as exc:
@@ -47,6 +57,11 @@ async def create_analysis_job(row: dict[str, Any]) -> dict[str, Any]:
                 code="db_unauthorized",
                 detail=str(exc),
             ) from exc
+        if code == _UNIQUE_VIOLATION:
+            # analysis_jobs_request_id_key: this requestId already has a job.
+            raise AnalysisJobsRepoError(
+                code="analysis_job_duplicate_request", detail=str(exc) or None
+            ) from exc
         raise AnalysisJobsRepoError(
             code="analysis_job_create_failed", detail=str(exc) or None
         ) from exc
@@ -56,47 +71,26 @@ async def create_analysis_job(row: dict[str, Any]) -> dict[str, Any]:
         ) from exc
 
 
-async def get_analysis_job_by_id(job_id: str) -> dict[str, Any] | None:
-    """Fetch a single analysis_jobs row by primary key.
+async def _fetch_rows(query: Any) -> list[dict[str, Any]]:
+    """Execute a select builder and return its rows.
 
-    Returns the full row dict (including poll_status_token and
-    poll_status_token_expires_at) or None when no row with that id exists.
-    Raises AnalysisJobsRepoError on any DB / client error so callers can map
-    it to a 502 uniformly.
+    Maps every DB / client failure to AnalysisJobsRepoError with code
+    analysis_job_fetch_failed (db_unauthorized for 401/403).
     """
     try:
-        supabase = get_supabase_admin_client()
-    except SupabaseClientError as exc:
-        raise AnalysisJobsRepoError(code=exc.code, detail=exc.detail) from exc
-
-    def _select_sync() -> dict[str, Any] | None:
-        resp = (
-            supabase.table("analysis_jobs")
-            .select(
-                "id, status, stage, results, error, created_at, completed_at,"
-                " poll_status_token, poll_status_token_expires_at"
-            )
-            .eq("id", job_id)
-            .limit(1)
-            .execute()
-        )
+        resp = await query.execute()
         data = getattr(resp, "data", None)
         if not isinstance(data, list):
             raise AnalysisJobsRepoError(
                 code="analysis_job_fetch_failed",
                 detail="DB select returned an unexpected response.",
             )
-        if not data:
-            return None
-        if not isinstance(data[0], dict):
+        if not all(isinstance(row, dict) for row in data):
             raise AnalysisJobsRepoError(
                 code="analysis_job_fetch_failed",
                 detail="DB select returned an unexpected row representation.",
             )
-        return dict(data[0])
-
-    try:
-        return await run_sync(_select_sync)
+        return [dict(row) for row in data]
     except AnalysisJobsRepoError:
         raise
     except APIError as exc:
@@ -113,3 +107,166 @@ async def get_analysis_job_by_id(job_id: str) -> dict[str, Any] | None:
         raise AnalysisJobsRepoError(
             code="analysis_job_fetch_failed", detail=str(exc) or None
         ) from exc
+
+
+async def _fetch_one(query: Any) -> dict[str, Any] | None:
+    """Execute a select builder and return its first row (or None)."""
+    rows = await _fetch_rows(query.limit(1))
+    return rows[0] if rows else None
+
+
+def _jobs_table() -> Any:
+    try:
+        supabase = get_supabase_async_admin_client()
+    except SupabaseClientError as exc:
+        raise AnalysisJobsRepoError(code=exc.code, detail=exc.detail) from exc
+    return supabase.table("analysis_jobs")
+
+
+async def get_analysis_job_by_id(job_id: str) -> dict[str, Any] | None:
+    """Fetch a single analysis_jobs row by primary key.
+
+    Returns the status columns (including poll_status_token and
+    poll_status_token_expires_at, but not results) or None when no row with
+    that id exists.
+    Raises AnalysisJobsRepoError on any DB / client error so callers can map
+    it to a 502 uniformly.
+    """
+    return await _fetch_one(_jobs_table().select(_STATUS_COLUMNS).eq("id", job_id))
+
+
+async def get_analysis_jobs_by_ids(job_ids: list[str]) -> list[dict[str, Any]]:
+    """Fetch the analysis_jobs rows for many ids in a single query.
+
+    Returns the same columns as get_analysis_job_by_id, in no particular
+    order; ids without a row are simply absent.  Callers must pass valid
+    UUIDs — one malformed id makes Postgres reject the whole query.
+    """
+    if not job_ids:
+        return []
+    return await _fetch_rows(
+        _jobs_table().select(_STATUS_COLUMNS).in_("id", sorted(set(job_ids)))
+    )
+
+
+async def get_analysis_job_results(job_ids: list[str]) -> dict[str, Any]:
+    """Fetch the results of succeeded jobs in one query, keyed by lower-case id.
+
+    Jobs that are missing or not succeeded are absent from the mapping.
+    """
+    if not job_ids:
+        return {}
+    rows = await _fetch_rows(
+        _jobs_table()
+        .select("id, results")
+        .in_("id", sorted(set(job_ids)))
+        .eq("status", "succeeded")
+    )
+    return {str(row["id"]).lower(): row.get("results") for row in rows}
+
+
+async def get_analysis_job_by_request_id(request_id: str) -> dict[str, Any] | None:
+    """Fetch the job created for a client requestId, or None.
+
+    Returns the id, status, document and poll token fields so /start can
+    answer a retried submission with the job it already created (and reject
+    a requestId reused for a different document).
+    """
+    return await _fetch_one(
+        _jobs_table()
+        .select(
+            "id, status, bucket, path, sha256, "
+            "poll_status_token, poll_status_token_expires_at"
+        )
+        .eq("request_id", request_id)
+    )
+
+
+async def find_reusable_analysis_job(
+    *, sha256: str, pipeline_version: str
+) -> dict[str, Any] | None:
+    """Return the latest succeeded job for the same document and pipeline.
+
+    The row carries the stored result columns (``results`` and the worker's
+    ``result_json``) so a new job can share them without re-running analysis.
+    """
+    return await _fetch_one(
+        _jobs_table()
+        .select("id, results, result_json")
+        .eq("status", "succeeded")
+        .eq("sha256", sha256)
+        .eq("pipeline_version", pipeline_version)
+        .order("completed_at", desc=True)
+    )
+
+
+async def refresh_poll_token(*, job_id: str, poll_token: str, expires_at: str) -> None:
+    """Issue a new poll token for an existing job (its previous one expired)."""
+    table = _jobs_table()
+    try:
+        resp = await (
+            table.update(
+                {
+                    "poll_status_token": poll_token,
+                    "poll_status_token_expires_at": expires_at,
+                }
+            )
+            .eq("id", job_id)
+            .execute()
+        )
+        data = getattr(resp, "data", None)
+        if not isinstance(data, list) or not data:
+            raise AnalysisJobsRepoError(
+                code="analysis_job_update_failed",
+                detail="DB update matched no row.",
+            )
+    except AnalysisJobsRepoError:
+        raise
+    except APIError as exc:
+        code = str(exc.code or "").strip()
+        if code in ("401", "403"):
+            raise AnalysisJobsRepoError(
+                code="db_unauthorized",
+                detail=str(exc),
+            ) from exc
+        raise AnalysisJobsRepoError(
+            code="analysis_job_update_failed", detail=str(exc) or None
+        ) from exc
+    except Exception as exc:  # noqa: BLE001
+        raise AnalysisJobsRepoError(
+            code="analysis_job_update_failed", detail=str(exc) or None
+        ) from exc
+
+
+async def request_analysis_job_cancel(job_id: str) -> str | None:
+    """Flag a job as cancelled by the client (request_analysis_job_cancel RPC).
+
+    A queued job is cancelled at once; a running one keeps its status until
+    its worker stops it.  Returns the resulting status ("cancelled" or
+    "running"), or None when the job had already finished.
+    """
+    try:
+        supabase = get_supabase_async_admin_client()
+    except SupabaseClientError as exc:
+        raise AnalysisJobsRepoError(code=exc.code, detail=exc.detail) from exc
+
+    try:
+        resp = await supabase.rpc(
+            "request_analysis_job_cancel", {"p_job_id": job_id}
+        ).execute()
+        data = getattr(resp, "data", None)
+        return str(data) if data else None
+    except APIError as exc:
+        code = str(exc.code or "").strip()
+        if code in ("401", "403"):
+            raise AnalysisJobsRepoError(
+                code="db_unauthorized",
+                detail=str(exc),
+            ) from exc
+        raise AnalysisJobsRepoError(
+            code="analysis_job_cancel_failed", detail=str(exc) or None
+        ) from exc
+    except Exception as exc:  # noqa: BLE001
+        raise AnalysisJobsRepoError(
+            code="analysis_job_cancel_failed", detail=str(exc) or None
+        ) from exc
@@ -3,7 +3,13 @@ from __future__ import annotations
 import hashlib
 from dataclasses import dataclass
 
-from app.services.supabase_storage import compute_object_sha256
+from app.core.config import settings
+from app.services.supabase_storage import (
+    SupabaseStorageError,
+    compute_object_sha256,
+    compute_object_sha256_async,
+    get_object_metadata,
+)
 
 
 @dataclass(frozen=True)
@@ -36,3 +42,47 @@ def verify_supabase_object_sha256(*, bucket: str, path: str, sha256: str) -> Non
             computed_sha256=computed_sha256,
             provided_sha256=provided_sha256,
         )
+
+
+async def verify_supabase_object_sha256_async(
+    *, bucket: str, path: str, sha256: str
+) -> None:
+    computed_sha256 = (await compute_object_sha256_async(bucket, path)).lower()
+    provided_sha256 = sha256.lower()
+
+    if computed_sha256 != provided_sha256:
+        raise IntegrityShaMismatchError(
+            computed_sha256=computed_sha256,
+            provided_sha256=provided_sha256,
+        )
+
+
+async def verify_supabase_object_integrity(
+    *, bucket: str, path: str, sha256: str
+) -> bool:
+    """Check a stored object against the client-provided SHA-256.
+
+    With INTEGRITY_MODE=metadata the size and a checksum recorded in the
+    object's metadata are checked without fetching the body; the worker
+    re-verifies the downloaded bytes before analysis, so that check stays
+    authoritative.  Objects without a recorded checksum (and the default
+    "stream" mode) fall back to hashing the streamed body.
+
+    Returns True when the server hashed the body itself, i.e. the SHA-256
+    is proven rather than taken from client-writable metadata.
+    """
+    if settings.integrity_mode == "metadata":
+        metadata = await get_object_metadata(bucket, path)
+        if metadata.size is not None and metadata.size > settings.max_file_size_bytes:
+            raise SupabaseStorageError(code="file_too_large")
+        if metadata.sha256 is not None:
+            provided_sha256 = sha256.lower()
+            if metadata.sha256 != provided_sha256:
+                raise IntegrityShaMismatchError(
+                    computed_sha256=metadata.sha256,
+                    provided_sha256=provided_sha256,
+                )
+            return False
+
+    await verify_supabase_object_sha256_async(bucket=bucket, path=path, sha256=sha256)
+    return True
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.core.config import settings
+from app.services.analysis_jobs_repo import (
+    AnalysisJobsRepoError,
+    get_analysis_jobs_by_ids,
+)
+
+logger = logging.getLogger("app.status_feed")
+
+FetchRows = Callable[[list[str]], Awaitable[list[dict[str, Any]]]]
+
+
+def _fingerprint(row: dict[str, Any]) -> tuple[Any, ...]:
+    # The poll token is included so a stream notices when it is replaced.
+    return (
+        row.get("status"),
+        row.get("stage"),
+        row.get("completed_at"),
+        row.get("poll_status_token"),
+    )
+
+
+class StatusSubscription:
+    """One client's view of a job: the latest changed row, if not yet read."""
+
+    def __init__(self, job_id: str, row: dict[str, Any]) -> None:
+        self.job_id = job_id
+        self._seen = _fingerprint(row)
+        # Holds at most the newest row: a slow client skips intermediate
+        # states instead of queueing them.
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=1)
+
+    def offer(self, row: dict[str, Any]) -> None:
+        fingerprint = _fingerprint(row)
+        if fingerprint == self._seen:
+            return
+        self._seen = fingerprint
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(row)
+
+    async def next(self, timeout: float) -> dict[str, Any] | None:
+        """Wait for the next changed row; None when ``timeout`` passes first."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except TimeoutError:
+            return None
+
+
+class StatusFeed:
+    """Process-wide change feed for the jobs that clients are streaming.
+
+    A single poller reads every subscribed job in one query per interval and
+    hands each subscription the rows whose status, stage, completion time or
+    poll token changed since it last saw them, so DB load depends on the interval and
+    not on the number of connected clients.  The poller runs only while
+    there are subscriptions.  A failed read is logged and retried on the
+    next tick.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval_seconds: float,
+        fetch_rows: FetchRows = get_analysis_jobs_by_ids,
+    ) -> None:
+        self._interval = interval_seconds
+        self._fetch_rows = fetch_rows
+        self._subscriptions: dict[str, set[StatusSubscription]] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    def subscribe(self, job_id: str, row: dict[str, Any]) -> StatusSubscription:
+        """Watch ``job_id``; ``row`` is the state the client already has."""
+        subscription = StatusSubscription(job_id.lower(), row)
+        self._subscriptions.setdefault(subscription.job_id, set()).add(subscription)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription: StatusSubscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.job_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.job_id]
+
+    async def close(self) -> None:
+        self._subscriptions.clear()
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while self._subscriptions:
+            await asyncio.sleep(self._interval)
+            await self._poll()
+
+    async def _poll(self) -> None:
+        job_ids = list(self._subscriptions)
+        if not job_ids:
+            return
+        try:
+            rows = await self._fetch_rows(job_ids)
+        except AnalysisJobsRepoError as exc:
+            logger.warning("Status feed read failed (code=%s)", exc.code)
+            return
+        for row in rows:
+            for subscription in list(
+                self._subscriptions.get(str(row.get("id")).lower(), ())
+            ):
+                subscription.offer(row)
+
+
+_feed: StatusFeed | None = None
+
+
+def get_status_feed() -> StatusFeed:
+    global _feed
+    if _feed is None:
+        _feed = StatusFeed(
+            interval_seconds=settings.status_stream_poll_interval_seconds
+        )
+    return _feed
+
+
+async def close_status_feed() -> None:
+    global _feed
+    feed, _feed = _feed, None
+    if feed is not None:
+        await feed.close()
@@ -1,18 +1,24 @@
 from __future__ import annotations
 
 import hashlib
+import re
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
-from typing import Final
+from typing import Any, Final
 
 import httpx
-from anyio.to_thread import run_sync
 from storage3.exceptions import StorageApiError
 
 from app.core.config import settings
-from app.core.supabase_client import SupabaseClientError, get_supabase_admin_client
+from app.core.supabase_client import (
+    SupabaseClientError,
+    get_supabase_async_admin_client,
+    get_supabase_clients,
+)
 
 _DEFAULT_TIMEOUT_SECONDS: Final[float] = 30.0
 _CHUNK_SIZE: Final[int] = 64 * 1024
+_SHA256_RE: Final[re.Pattern[str]] = re.compile(r"[a-f0-9]{64}")
 
 
 @dataclass(frozen=True)
@@ -23,12 +29,12 @@ class SupabaseStorageError(Exception):
 
 async def _create_signed_download_url(*, bucket: str, path: str) -> str:
     try:
-        supabase = get_supabase_admin_client()
+        supabase = get_supabase_async_admin_client()
     except SupabaseClientError as exc:
         raise SupabaseStorageError(code=exc.code, detail=exc.detail) from exc
 
-    def _signed_url_sync() -> str:
-        resp = supabase.storage.from_(bucket).create_signed_url(
+    try:
+        resp = await supabase.storage.from_(bucket).create_signed_url(
             path, int(settings.supabase_signed_url_ttl_seconds)
         )
         signed = None
@@ -40,9 +46,6 @@ async def _create_signed_download_url(*, bucket: str, path: str) -> str:
                 detail="Could not generate a signed download URL.",
             )
         return str(signed)
-
-    try:
-        return await run_sync(_signed_url_sync)
     except SupabaseStorageError:
         raise
     except StorageApiError as exc:
@@ -69,59 +72,161 @@ async def _create_signed_download_url(*, bucket: str, path: str) -> str:
         ) from exc
 
 
-async def download_object_bytes(bucket: str, path: str) -> bytes:
+@dataclass(frozen=True)
+class ObjectMetadata:
+    size: int | None
+    sha256: str | None
+
+
+def _parse_object_info(info: dict[str, Any]) -> ObjectMetadata:
+    # Storage API versions differ: system fields are either top-level or under
+    # "metadata"; user metadata (where an uploader can record a checksum) is
+    # under "user_metadata" or "metadata".
+    system = info.get("metadata") if isinstance(info.get("metadata"), dict) else {}
+    size = info.get("size", system.get("size", system.get("contentLength")))
+    try:
+        size = int(size) if size is not None else None
+    except (TypeError, ValueError):
+        size = None
+
+    sha256 = None
+    for key in ("user_metadata", "metadata"):
+        candidate = info.get(key)
+        if isinstance(candidate, dict) and isinstance(candidate.get("sha256"), str):
+            value = candidate["sha256"].strip().lower()
+            if _SHA256_RE.fullmatch(value):
+                sha256 = value
+                break
+    return ObjectMetadata(size=size, sha256=sha256)
+
+
+async def get_object_metadata(bucket: str, path: str) -> ObjectMetadata:
+    """Fetch an object's size and recorded checksum without downloading it."""
+    try:
+        supabase = get_supabase_async_admin_client()
+    except SupabaseClientError as exc:
+        raise SupabaseStorageError(code=exc.code, detail=exc.detail) from exc
+
+    try:
+        info = await supabase.storage.from_(bucket).info(path)
+        if not isinstance(info, dict):
+            raise SupabaseStorageError(
+                code="storage_download_failed",
+                detail="Object info returned an unexpected response.",
+            )
+        return _parse_object_info(info)
+    except SupabaseStorageError:
+        raise
+    except StorageApiError as exc:
+        status = str(exc.status)
+        if status in ("400", "404"):
+            raise SupabaseStorageError(
+                code="storage_not_found", detail=exc.message
+            ) from exc
+        if status in ("401", "403"):
+            raise SupabaseStorageError(
+                code="storage_unauthorized", detail=exc.message
+            ) from exc
+        raise SupabaseStorageError(
+            code="storage_download_failed",
+            detail=f"Object info request failed with status {exc.status}.",
+        ) from exc
+    except httpx.HTTPError as exc:
+        raise SupabaseStorageError(
+            code="storage_download_failed", detail=str(exc) or None
+        ) from exc
+    except Exception as exc:  # noqa: BLE001
+        raise SupabaseStorageError(
+            code="storage_download_failed", detail=str(exc) or None
+        ) from exc
+
+
+async def _aiter_object_chunks(bucket: str, path: str) -> AsyncIterator[bytes]:
+    """Stream an object's body in chunks, enforcing max_file_size_bytes."""
     url = await _create_signed_download_url(bucket=bucket, path=path)
 
     try:
-        async with httpx.AsyncClient(
-            timeout=_DEFAULT_TIMEOUT_SECONDS, follow_redirects=True
-        ) as client:
-            async with client.stream("GET", url) as resp:
-                if resp.status_code == 404:
-                    raise SupabaseStorageError(code="storage_not_found")
-                if resp.status_code in (401, 403):
-                    raise SupabaseStorageError(code="storage_unauthorized")
-                if resp.status_code >= 400:
-                    status_code = resp.status_code
-                    raise SupabaseStorageError(
-                        code="storage_download_failed",
-                        detail=f"Storage request failed with status {status_code}.",
-                    )
-
-                max_bytes = int(settings.max_file_size_bytes)
-                content_length = resp.headers.get("content-length")
-                if content_length is not None:
-                    try:
-                        if int(content_length) > max_bytes:
-                            raise SupabaseStorageError(code="file_too_large")
-                    except ValueError:
-                        pass
-
-                data = bytearray()
-                size = 0
-                async for chunk in resp.aiter_bytes(chunk_size=_CHUNK_SIZE):
-                    if not chunk:
-                        continue
-                    size += len(chunk)
-                    if size > max_bytes:
-                        raise SupabaseStorageError(code="file_too_large")
-                    data.extend(chunk)
+        client = get_supabase_clients().async_http
+    except SupabaseClientError as exc:
+        raise SupabaseStorageError(code=exc.code, detail=exc.detail) from exc
 
-                return bytes(data)
+    try:
+        # Reuse the shared pool; the signed URL points at the same Supabase host.
+        # The response is closed explicitly rather than via client.stream():
+        # contextlib re-assigns __traceback__ on exit, which our frozen error
+        # dataclasses reject.
+        resp = await client.send(
+            client.build_request("GET", url, timeout=_DEFAULT_TIMEOUT_SECONDS),
+            stream=True,
+        )
     except httpx.HTTPError as exc:
         raise SupabaseStorageError(
             code="storage_download_failed", detail=str(exc) or None
         ) from exc
 
+    try:
+        if resp.status_code == 404:
+            raise SupabaseStorageError(code="storage_not_found")
+        if resp.status_code in (401, 403):
+            raise SupabaseStorageError(code="storage_unauthorized")
+        if resp.status_code >= 400:
+            status_code = resp.status_code
+            raise SupabaseStorageError(
+                code="storage_download_failed",
+                detail=f"Storage request failed with status {status_code}.",
+            )
+
+        max_bytes = int(settings.max_file_size_bytes)
+        content_length = resp.headers.get("content-length")
+        if content_length is not None:
+            try:
+                if int(content_length) > max_bytes:
+                    raise SupabaseStorageError(code="file_too_large")
+            except ValueError:
+                pass
+
+        size = 0
+        async for chunk in resp.aiter_bytes(chunk_size=_CHUNK_SIZE):
+            if not chunk:
+                continue
+            size += len(chunk)
+            if size > max_bytes:
+                raise SupabaseStorageError(code="file_too_large")
+            yield chunk
+    except httpx.HTTPError as exc:
+        raise SupabaseStorageError(
+            code="storage_download_failed", detail=str(exc) or None
+        ) from exc
+    finally:
+        await resp.aclose()
+
+
+async def download_object_bytes(bucket: str, path: str) -> bytes:
+    data = bytearray()
+    async for chunk in _aiter_object_chunks(bucket, path):
+        data.extend(chunk)
+    return bytes(data)
+
+
+async def compute_object_sha256_async(bucket: str, path: str) -> str:
+    """Hash an object while streaming it; memory stays at one chunk.
+
+    Async counterpart of compute_object_sha256, for request handlers.
+    """
+    digest = hashlib.sha256()
+    async for chunk in _aiter_object_chunks(bucket, path):
+        digest.update(chunk)
+    return digest.hexdigest()
+
 
 def compute_object_sha256(bucket: str, path: str) -> str:
     try:
-        supabase = get_supabase_admin_client()
+        clients = get_supabase_clients()
     except SupabaseClientError as exc:
         raise SupabaseStorageError(code=exc.code, detail=exc.detail) from exc
 
     try:
-        resp = supabase.storage.from_(bucket).create_signed_url(
+        resp = clients.admin.storage.from_(bucket).create_signed_url(
             path, int(settings.supabase_signed_url_ttl_seconds)
         )
         url = None
@@ -152,42 +257,41 @@ def compute_object_sha256(bucket: str, path: str) -> str:
         ) from exc
 
     try:
-        with httpx.Client(
-            timeout=_DEFAULT_TIMEOUT_SECONDS,
-            follow_redirects=True,
-        ) as client:
-            with client.stream("GET", str(url)) as resp:
-                if resp.status_code == 404:
-                    raise SupabaseStorageError(code="storage_not_found")
-                if resp.status_code in (401, 403):
-                    raise SupabaseStorageError(code="storage_unauthorized")
-                if resp.status_code >= 400:
-                    status_code = resp.status_code
-                    raise SupabaseStorageError(
-                        code="storage_download_failed",
-                        detail=f"Storage request failed with status {status_code}.",
-                    )
-
-                max_bytes = int(settings.max_file_size_bytes)
-                content_length = resp.headers.get("content-length")
-                if content_length is not None:
-                    try:
-                        if int(content_length) > max_bytes:
-                            raise SupabaseStorageError(code="file_too_large")
-                    except ValueError:
-                        pass
-
-                digest = hashlib.sha256()
-                size = 0
-                for chunk in resp.iter_bytes(chunk_size=_CHUNK_SIZE):
-                    if not chunk:
-                        continue
-                    size += len(chunk)
-                    if size > max_bytes:
+        # Reuse the shared pool; the signed URL points at the same Supabase host.
+        with clients.http.stream(
+            "GET", str(url), timeout=_DEFAULT_TIMEOUT_SECONDS
+        ) as resp:
+            if resp.status_code == 404:
+                raise SupabaseStorageError(code="storage_not_found")
+            if resp.status_code in (401, 403):
+                raise SupabaseStorageError(code="storage_unauthorized")
+            if resp.status_code >= 400:
+                status_code = resp.status_code
+                raise SupabaseStorageError(
+                    code="storage_download_failed",
+                    detail=f"Storage request failed with status {status_code}.",
+                )
+
+            max_bytes = int(settings.max_file_size_bytes)
+            content_length = resp.headers.get("content-length")
+            if content_length is not None:
+                try:
+                    if int(content_length) > max_bytes:
                         raise SupabaseStorageError(code="file_too_large")
-                    digest.update(chunk)
+                except ValueError:
+                    pass
+
+            digest = hashlib.sha256()
+            size = 0
+            for chunk in resp.iter_bytes(chunk_size=_CHUNK_SIZE):
+                if not chunk:
+                    continue
+                size += len(chunk)
+                if size > max_bytes:
+                    raise SupabaseStorageError(code="file_too_large")
+                digest.update(chunk)
 
-                return digest.hexdigest()
+            return digest.hexdigest()
     except httpx.HTTPError as exc:
         raise SupabaseStorageError(
             code="storage_download_failed", detail=str(exc) or None
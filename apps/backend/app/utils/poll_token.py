@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import secrets
+import time
+from datetime import UTC, datetime
+from typing import Any
+
+from app.core.config import settings
+from app.utils.datetime_coercion import coerce_utc_datetime
+
+_SIGNED_PREFIX = "v1"
+
+
+def issue_poll_token(job_id: str, expires_at: datetime) -> str:
+    """Create the jobToken for a job that is polled until ``expires_at``.
+
+    With POLL_TOKEN_SECRET set the token is a signed envelope,
+    ``v1.<jobId>.<expiry unix seconds>.<HMAC-SHA256>``, which
+    poll_token_precheck can reject without a DB read.  Otherwise it is an
+    opaque random string.  Either way the token is also stored on the job
+    and checked by poll_token_is_valid, so replacing the stored token
+    revokes it.
+    """
+    if not settings.poll_token_secret:
+        return secrets.token_urlsafe(32)
+    payload = f"{_SIGNED_PREFIX}.{job_id}.{int(expires_at.timestamp())}"
+    return f"{payload}.{_sign(payload)}"
+
+
+def poll_token_precheck(job_id: str, job_token: str) -> bool:
+    """Return False when ``job_token`` can be rejected before any DB read.
+
+    A signed token is rejected when its signature (compared in constant
+    time) is wrong, it names another job, or it has expired.  Unsigned
+    tokens pass through to the stored-token check unless
+    POLL_TOKEN_ACCEPT_UNSIGNED is disabled, and nothing is prechecked
+    without POLL_TOKEN_SECRET.
+    """
+    if not settings.poll_token_secret:
+        return True
+    parts = job_token.split(".")
+    if len(parts) != 4 or parts[0] != _SIGNED_PREFIX:
+        return settings.poll_token_accept_unsigned
+    payload, _, signature = job_token.rpartition(".")
+    if not hmac.compare_digest(_sign(payload).encode(), signature.encode()):
+        return False
+    _, token_job_id, raw_expires_at, _ = parts
+    if token_job_id.lower() != job_id.lower():
+        return False
+    try:
+        return time.time() < int(raw_expires_at)
+    except ValueError:
+        return False
+
+
+def _sign(payload: str) -> str:
+    digest = hmac.new(
+        settings.poll_token_secret.encode(), payload.encode(), hashlib.sha256
+    ).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def poll_token_is_valid(row: dict[str, Any], job_token: str) -> bool:
+    """Check a client's jobToken against a job row's poll token and expiry.
+
+    Fails closed: a missing token, a missing or malformed expiry, and an
+    expired token are all invalid.
+    """
+    stored_token = row.get("poll_status_token")
+    if not stored_token or not secrets.compare_digest(
+        str(stored_token).encode(), job_token.encode()
+    ):
+        return False
+
+    raw_expires_at = row.get("poll_status_token_expires_at")
+    if not raw_expires_at:
+        return False
+    try:
+        expires_at = coerce_utc_datetime(
+            raw_expires_at, field="poll_status_token_expires_at"
+        )
+    except ValueError:
+        return False
+    return datetime.now(UTC) < expires_at
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+
+
+class TTLCache[K, V]:
+    """Small in-process cache whose entries expire ``ttl_seconds`` after set.
+
+    Holds at most ``max_entries``, evicting the least recently used.  Not
+    thread-safe: meant for state owned by the event loop.  A ttl or size of
+    zero disables it (get() always misses).
+    """
+
+    def __init__(self, *, ttl_seconds: float, max_entries: int) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        if self._ttl <= 0 or self._max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
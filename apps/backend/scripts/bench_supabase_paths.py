@@ -0,0 +1,125 @@
+"""Load benchmark: thread-offloaded sync Supabase calls vs the async client path.
+
+Simulates a /status polling burst against a fake PostgREST with a fixed
+per-request latency and reports throughput and latency percentiles for:
+
+- ``run_sync``: the previous implementation — a sync supabase-py call run via
+  anyio.to_thread.run_sync (bounded by anyio's default 40-token limiter);
+- ``async``: app.services.analysis_jobs_repo.get_analysis_job_by_id on the
+  shared async client, entirely on the event loop.
+
+No network or Supabase project is needed.  Usage (from apps/backend):
+
+    uv run python scripts/bench_supabase_paths.py --requests 2000 --concurrency 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import anyio
+import httpx
+from anyio.to_thread import run_sync
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core import supabase_client  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.services.analysis_jobs_repo import get_analysis_job_by_id  # noqa: E402
+
+_ROW = {
+    "id": "00000000-0000-0000-0000-000000000000",
+    "status": "running",
+    "stage": "extract_done",
+    "results": None,
+    "error": None,
+    "created_at": "2026-01-01T00:00:00+00:00",
+    "completed_at": None,
+    "poll_status_token": "token",
+    "poll_status_token_expires_at": "2026-01-01T01:00:00+00:00",
+}
+
+
+def _install_fake_clients(latency: float) -> None:
+    def sync_handler(_request: httpx.Request) -> httpx.Response:
+        time.sleep(latency)
+        return httpx.Response(200, json=[_ROW])
+
+    async def async_handler(_request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json=[_ROW])
+
+    settings.supabase_url = "https://bench.supabase.co"
+    settings.supabase_service_role_key = "bench-service-role-key"
+    clients = supabase_client.get_supabase_clients()
+    clients.http._transport = httpx.MockTransport(sync_handler)
+    clients.async_http._transport = httpx.MockTransport(async_handler)
+
+
+async def _select_via_thread(job_id: str) -> None:
+    supabase = supabase_client.get_supabase_admin_client()
+
+    def _select_sync() -> None:
+        query = supabase.table("analysis_jobs").select("*").eq("id", job_id)
+        query.limit(1).execute()
+
+    await run_sync(_select_sync)
+
+
+async def _run(name: str, call, *, requests: int, concurrency: int) -> None:
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await call(_ROW["id"])
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(
+        f"{name:>9}: {requests / elapsed:8.1f} req/s  "
+        f"p50={p50:7.1f}ms  p99={p99:7.1f}ms"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    _install_fake_clients(args.latency_ms / 1000)
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    print(
+        f"{args.requests} requests, concurrency={args.concurrency}, "
+        f"upstream latency={args.latency_ms}ms, "
+        f"thread limiter={limiter.total_tokens}"
+    )
+    await _run(
+        "run_sync",
+        _select_via_thread,
+        requests=args.requests,
+        concurrency=args.concurrency,
+    )
+    await _run(
+        "async",
+        get_analysis_job_by_id,
+        requests=args.requests,
+        concurrency=args.concurrency,
+    )
+    await supabase_client.close_supabase_clients()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    asyncio.run(main(parser.parse_args()))
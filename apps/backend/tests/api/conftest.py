@@ -0,0 +1,10 @@
+import pytest
+
+from app.api.controllers.analysis import status
+
+
+@pytest.fixture(autouse=True)
+def _clear_terminal_status_cache():
+    # Tests reuse job ids, so a cached response must not leak between them.
+    yield
+    status._terminal_cache.clear()
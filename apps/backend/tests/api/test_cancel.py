@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.main import app
+
+DUMMY_JOB_ID = "aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee"
+VALID_TOKEN = "tok-abc"
+CANCEL_URL = "/api/analysis/cancel"
+_CONTROLLER = "app.api.controllers.analysis.cancel"
+
+
+def _make_row(*, status: str, expires_in: timedelta = timedelta(hours=1)) -> dict:
+    return {
+        "id": DUMMY_JOB_ID,
+        "status": status,
+        "poll_status_token": VALID_TOKEN,
+        "poll_status_token_expires_at": (datetime.now(UTC) + expires_in).isoformat(),
+    }
+
+
+async def _post(job_token: str = VALID_TOKEN) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://testserver"
+    ) as client:
+        return await client.post(
+            CANCEL_URL, json={"jobId": DUMMY_JOB_ID, "jobToken": job_token}
+        )
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("current", "after"), [("queued", "cancelled"), ("running", "running")]
+)
+async def test_cancel_flags_an_unfinished_job(current: str, after: str) -> None:
+    cancel = AsyncMock(return_value=after)
+    with (
+        patch(
+            f"{_CONTROLLER}.get_analysis_job_by_id",
+            new=AsyncMock(return_value=_make_row(status=current)),
+        ),
+        patch(f"{_CONTROLLER}.request_analysis_job_cancel", new=cancel),
+    ):
+        resp = await _post()
+
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "jobId": DUMMY_JOB_ID,
+        "status": after,
+        "cancelRequested": True,
+    }
+    cancel.assert_awaited_once_with(DUMMY_JOB_ID)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("row", "token"),
+    [
+        (_make_row(status="running"), "wrong-token"),
+        (_make_row(status="running", expires_in=timedelta(hours=-1)), VALID_TOKEN),
+    ],
+)
+async def test_cancel_requires_a_valid_poll_token(row: dict, token: str) -> None:
+    cancel = AsyncMock()
+    with (
+        patch(f"{_CONTROLLER}.get_analysis_job_by_id", new=AsyncMock(return_value=row)),
+        patch(f"{_CONTROLLER}.request_analysis_job_cancel", new=cancel),
+    ):
+        resp = await _post(token)
+
+    assert resp.status_code == 401
+    cancel.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_cancel_of_a_finished_job_is_a_conflict() -> None:
+    cancel = AsyncMock()
+    with (
+        patch(
+            f"{_CONTROLLER}.get_analysis_job_by_id",
+            new=AsyncMock(return_value=_make_row(status="succeeded")),
+        ),
+        patch(f"{_CONTROLLER}.request_analysis_job_cancel", new=cancel),
+    ):
+        resp = await _post()
+
+    assert resp.status_code == 409
+    cancel.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_cancel_of_a_cancelled_job_is_idempotent() -> None:
+    cancel = AsyncMock()
+    with (
+        patch(
+            f"{_CONTROLLER}.get_analysis_job_by_id",
+            new=AsyncMock(return_value=_make_row(status="cancelled")),
+        ),
+        patch(f"{_CONTROLLER}.request_analysis_job_cancel", new=cancel),
+    ):
+        resp = await _post()
+
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "cancelled"
+    cancel.assert_not_awaited()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.main import app
+from app.utils.poll_token import issue_poll_token
+
+DUMMY_JOB_ID = "aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee"
+_CONTROLLERS = "app.api.controllers.analysis"
+
+
+@pytest.fixture(autouse=True)
+def _secret(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "poll_token_secret", "test-secret")
+
+
+def _make_row(token: str, expires_at: datetime) -> dict:
+    return {
+        "id": DUMMY_JOB_ID,
+        "status": "running",
+        "stage": "langgraph_running",
+        "poll_status_token": token,
+        "poll_status_token_expires_at": expires_at.isoformat(),
+        "created_at": "2024-01-01T00:00:00+00:00",
+        "completed_at": None,
+        "updated_at": "2024-01-01T00:01:00+00:00",
+        "error": None,
+    }
+
+
+async def _send(method: str, url: str, **kwargs) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://testserver"
+    ) as client:
+        return await client.request(method, url, **kwargs)
+
+
+@pytest.mark.anyio
+async def test_signed_token_is_accepted_and_still_checked_against_the_row() -> None:
+    expires_at = (datetime.now(UTC) + timedelta(hours=1)).replace(microsecond=0)
+    token = issue_poll_token(DUMMY_JOB_ID, expires_at)
+    revoked = issue_poll_token(DUMMY_JOB_ID, expires_at - timedelta(seconds=1))
+    fetch = AsyncMock(return_value=_make_row(token, expires_at))
+    with patch(f"{_CONTROLLERS}.status.get_analysis_job_by_id", new=fetch):
+        ok = await _send(
+            "GET",
+            "/api/analysis/status",
+            params={"jobId": DUMMY_JOB_ID, "jobToken": token},
+        )
+        replaced = await _send(
+            "GET",
+            "/api/analysis/status",
+            params={"jobId": DUMMY_JOB_ID, "jobToken": revoked},
+        )
+
+    assert ok.status_code == 200
+    # Validly signed but no longer the stored token: revoked.
+    assert replaced.status_code == 401
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("method", "url", "module"),
+    [
+        ("GET", "/api/analysis/status", "status"),
+        ("GET", "/api/analysis/status:stream", "status"),
+        ("POST", "/api/analysis/cancel", "cancel"),
+    ],
+)
+async def test_expired_signed_token_is_rejected_without_a_db_read(
+    method: str, url: str, module: str
+) -> None:
+    token = issue_poll_token(DUMMY_JOB_ID, datetime.now(UTC) - timedelta(seconds=1))
+    params = {"jobId": DUMMY_JOB_ID, "jobToken": token}
+    kwargs = {"params": params} if method == "GET" else {"json": params}
+    fetch = AsyncMock()
+    with patch(f"{_CONTROLLERS}.{module}.get_analysis_job_by_id", new=fetch):
+        resp = await _send(method, url, **kwargs)
+
+    assert resp.status_code == 401
+    assert resp.json() == {"error": "Invalid or expired token"}
+    fetch.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_batch_does_not_query_jobs_with_forged_tokens() -> None:
+    forged = f"v1.{DUMMY_JOB_ID}.9999999999.not-a-signature"
+    fetch = AsyncMock(return_value=[])
+    with patch(f"{_CONTROLLERS}.status.get_analysis_jobs_by_ids", new=fetch):
+        resp = await _send(
+            "POST",
+            "/api/analysis/status:batch",
+            json={"jobs": [{"jobId": DUMMY_JOB_ID, "jobToken": forged}]},
+        )
+
+    assert resp.json()["results"][0]["statusCode"] == 401
+    fetch.assert_awaited_once_with([])
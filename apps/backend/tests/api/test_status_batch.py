@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.main import app
+from app.services.analysis_jobs_repo import AnalysisJobsRepoError
+
+JOB_A = "aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee"
+JOB_B = "bbbbbbbb-cccc-dddd-eeee-ffffffffffff"
+JOB_MISSING = "cccccccc-dddd-eeee-ffff-000000000000"
+VALID_TOKEN = "tok-abc"
+BATCH_URL = "/api/analysis/status:batch"
+_FETCH = "app.api.controllers.analysis.status.get_analysis_jobs_by_ids"
+
+
+def _make_row(
+    job_id: str,
+    *,
+    status: str = "running",
+    expires_in: timedelta = timedelta(hours=1),
+) -> dict:
+    return {
+        "id": job_id,
+        "status": status,
+        "poll_status_token": VALID_TOKEN,
+        "poll_status_token_expires_at": (datetime.now(UTC) + expires_in).isoformat(),
+        "created_at": "2024-01-01T00:00:00+00:00",
+        "completed_at": None,
+        "stage": "created",
+        "results": None,
+        "error": None,
+    }
+
+
+async def _post(jobs: list[dict]) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://testserver"
+    ) as client:
+        return await client.post(BATCH_URL, json={"jobs": jobs})
+
+
+@pytest.mark.anyio
+async def test_batch_returns_per_job_results_in_request_order() -> None:
+    rows = [_make_row(JOB_B, status="queued"), _make_row(JOB_A)]
+    with patch(_FETCH, new=AsyncMock(return_value=rows)) as fetch:
+        resp = await _post(
+            [
+                {"jobId": JOB_A, "jobToken": VALID_TOKEN},
+                {"jobId": JOB_B, "jobToken": VALID_TOKEN},
+            ]
+        )
+
+    assert resp.status_code == 200
+    fetch.assert_awaited_once_with([JOB_A, JOB_B])
+    results = resp.json()["results"]
+    assert [r["jobId"] for r in results] == [JOB_A, JOB_B]
+    assert [r["statusCode"] for r in results] == [200, 200]
+    assert results[0]["job"]["status"] == "running"
+    assert results[1]["job"]["status"] == "queued"
+    assert "poll_status_token" not in resp.text
+
+
+@pytest.mark.anyio
+async def test_batch_answers_unknown_and_unauthorized_jobs_alike() -> None:
+    rows = [
+        _make_row(JOB_A),
+        _make_row(JOB_B, expires_in=timedelta(hours=-1)),
+    ]
+    with patch(_FETCH, new=AsyncMock(return_value=rows)) as fetch:
+        resp = await _post(
+            [
+                {"jobId": JOB_A, "jobToken": "wrong"},
+                {"jobId": JOB_B, "jobToken": VALID_TOKEN},
+                {"jobId": JOB_MISSING, "jobToken": VALID_TOKEN},
+                {"jobId": "not-a-uuid", "jobToken": VALID_TOKEN},
+            ]
+        )
+
+    assert resp.status_code == 200
+    # Malformed ids never reach the query.
+    fetch.assert_awaited_once_with([JOB_A, JOB_B, JOB_MISSING])
+    results = resp.json()["results"]
+    assert [r["statusCode"] for r in results] == [401, 401, 404, 404]
+    assert {r["error"] for r in results} == {"Invalid or expired token"}
+    assert all(r["job"] is None for r in results)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("url", ["/api/analysis/status", "/api/analysis/status:stream"])
+async def test_single_polls_answer_malformed_ids_like_the_batch(url: str) -> None:
+    fetch = AsyncMock(side_effect=AnalysisJobsRepoError(code="invalid_uuid"))
+    transport = httpx.ASGITransport(app=app)
+    with patch("app.api.controllers.analysis.status.get_analysis_job_by_id", fetch):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://testserver"
+        ) as client:
+            resp = await client.get(
+                url, params={"jobId": "not-a-uuid", "jobToken": VALID_TOKEN}
+            )
+
+    assert resp.status_code == 404
+    assert resp.json() == {"error": "Invalid or expired token"}
+    fetch.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_batch_reports_a_malformed_row_without_failing_the_others() -> None:
+    bad = _make_row(JOB_B)
+    bad["created_at"] = "not-a-date"
+    with patch(_FETCH, new=AsyncMock(return_value=[_make_row(JOB_A), bad])):
+        resp = await _post(
+            [
+                {"jobId": JOB_A, "jobToken": VALID_TOKEN},
+                {"jobId": JOB_B, "jobToken": VALID_TOKEN},
+            ]
+        )
+
+    assert [r["statusCode"] for r in resp.json()["results"]] == [200, 502]
+
+
+@pytest.mark.anyio
+async def test_batch_returns_502_when_the_query_fails() -> None:
+    error = AnalysisJobsRepoError(code="analysis_job_fetch_failed")
+    with patch(_FETCH, new=AsyncMock(side_effect=error)):
+        resp = await _post([{"jobId": JOB_A, "jobToken": VALID_TOKEN}])
+
+    assert resp.status_code == 502
+    assert resp.json() == {"error": "Service temporarily unavailable"}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("count", [0, 3])
+async def test_batch_rejects_empty_and_oversized_requests(
+    count: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "status_batch_max_jobs", 2)
+    with patch(_FETCH, new=AsyncMock(return_value=[])) as fetch:
+        resp = await _post([{"jobId": JOB_A, "jobToken": VALID_TOKEN}] * count)
+
+    assert resp.status_code == 422
+    fetch.assert_not_awaited()
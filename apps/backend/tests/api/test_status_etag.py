@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.main import app
+
+DUMMY_JOB_ID = "aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee"
+VALID_TOKEN = "tok-abc"
+STATUS_URL = "/api/analysis/status"
+_FETCH = "app.api.controllers.analysis.status.get_analysis_job_by_id"
+_RESULTS = "app.api.controllers.analysis.status.get_analysis_job_results"
+
+
+def _make_row(
+    *,
+    status: str = "running",
+    stage: str = "langgraph_running",
+    updated_at: str = "2024-01-01T00:01:00+00:00",
+) -> dict:
+    return {
+        "id": DUMMY_JOB_ID,
+        "status": status,
+        "stage": stage,
+        "poll_status_token": VALID_TOKEN,
+        "poll_status_token_expires_at": (
+            datetime.now(UTC) + timedelta(hours=1)
+        ).isoformat(),
+        "created_at": "2024-01-01T00:00:00+00:00",
+        "completed_at": (
+            "2024-01-01T00:05:00+00:00" if status == "succeeded" else None
+        ),
+        "updated_at": updated_at,
+        "results": None,
+        "error": None,
+    }
+
+
+async def _get(
+    job_token: str = VALID_TOKEN, if_none_match: str | None = None
+) -> httpx.Response:
+    headers = {"If-None-Match": if_none_match} if if_none_match else {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://testserver"
+    ) as client:
+        return await client.get(
+            STATUS_URL,
+            params={"jobId": DUMMY_JOB_ID, "jobToken": job_token},
+            headers=headers,
+        )
+
+
+@pytest.mark.anyio
+async def test_unchanged_job_answers_304_to_its_etag() -> None:
+    with patch(_FETCH, new=AsyncMock(return_value=_make_row())):
+        first = await _get()
+        etag = first.headers["etag"]
+        second = await _get(if_none_match=etag)
+        weak = await _get(if_none_match=f'"other", W/{etag}')
+
+    assert first.status_code == 200
+    assert first.json()["status"] == "running"
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+    assert weak.status_code == 304
+
+
+@pytest.mark.anyio
+async def test_etag_changes_with_the_job() -> None:
+    with patch(_FETCH, new=AsyncMock(return_value=_make_row())):
+        etag = (await _get()).headers["etag"]
+    moved = _make_row(stage="persisting_result", updated_at="2024-01-01T00:02:00Z")
+    with patch(_FETCH, new=AsyncMock(return_value=moved)):
+        resp = await _get(if_none_match=etag)
+
+    assert resp.status_code == 200
+    assert resp.json()["stage"] == "persisting_result"
+    assert resp.headers["etag"] != etag
+
+
+@pytest.mark.anyio
+async def test_etag_is_not_honoured_without_a_valid_token() -> None:
+    with patch(_FETCH, new=AsyncMock(return_value=_make_row())):
+        etag = (await _get()).headers["etag"]
+        resp = await _get(job_token="wrong", if_none_match=etag)
+
+    assert resp.status_code == 401
+    assert "etag" not in resp.headers
+
+
+def _succeeded_row(token: str = VALID_TOKEN) -> dict:
+    row = _make_row(status="succeeded", stage="done")
+    del row["results"]  # Status reads leave the results column out.
+    return {**row, "poll_status_token": token}
+
+
+@pytest.mark.anyio
+async def test_terminal_status_body_is_served_from_memory() -> None:
+    fetch = AsyncMock(return_value=_succeeded_row())
+    results = AsyncMock(return_value={})
+    with patch(_FETCH, new=fetch), patch(_RESULTS, new=results):
+        first = await _get()
+        again = await _get()
+        revalidated = await _get(if_none_match=first.headers["etag"])
+
+    # Only the results are read once; the status row is read on every poll.
+    assert results.await_count == 1
+    assert fetch.await_count == 3
+    assert again.status_code == 200
+    assert again.content == first.content
+    assert revalidated.status_code == 304
+
+
+@pytest.mark.anyio
+async def test_cached_terminal_status_still_checks_the_token() -> None:
+    fetch = AsyncMock(return_value=_succeeded_row())
+    with patch(_FETCH, new=fetch), patch(_RESULTS, new=AsyncMock(return_value={})):
+        await _get()
+        resp = await _get(job_token="wrong")
+
+    assert fetch.await_count == 2
+    assert resp.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_replacing_the_stored_token_revokes_a_cached_one() -> None:
+    with (
+        patch(_FETCH, new=AsyncMock(return_value=_succeeded_row())),
+        patch(_RESULTS, new=AsyncMock(return_value={})),
+    ):
+        assert (await _get()).status_code == 200
+    with patch(_FETCH, new=AsyncMock(return_value=_succeeded_row("tok-new"))):
+        resp = await _get()
+
+    assert resp.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_running_status_is_not_cached() -> None:
+    fetch = AsyncMock(return_value=_make_row())
+    with patch(_FETCH, new=fetch):
+        await _get()
+        await _get()
+
+    assert fetch.await_count == 2
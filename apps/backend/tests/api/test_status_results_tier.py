@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.main import app
+
+JOB_A = "aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee"
+JOB_B = "bbbbbbbb-cccc-dddd-eeee-ffffffffffff"
+VALID_TOKEN = "tok-abc"
+_CONTROLLER = "app.api.controllers.analysis.status"
+
+
+def _narrow_row(job_id: str = JOB_A, *, status: str = "running") -> dict:
+    """A row as the status select returns it: without results."""
+    return {
+        "id": job_id,
+        "status": status,
+        "stage": "done" if status == "succeeded" else "langgraph_running",
+        "poll_status_token": VALID_TOKEN,
+        "poll_status_token_expires_at": (
+            datetime.now(UTC) + timedelta(hours=1)
+        ).isoformat(),
+        "created_at": "2024-01-01T00:00:00+00:00",
+        "completed_at": (
+            "2024-01-01T00:05:00+00:00" if status == "succeeded" else None
+        ),
+        "updated_at": "2024-01-01T00:05:00+00:00",
+        "error": None,
+    }
+
+
+async def _send(method: str, url: str, **kwargs) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://testserver"
+    ) as client:
+        return await client.request(method, url, **kwargs)
+
+
+@pytest.mark.anyio
+async def test_unfinished_job_poll_does_not_read_results() -> None:
+    results = AsyncMock(return_value={})
+    with (
+        patch(
+            f"{_CONTROLLER}.get_analysis_job_by_id",
+            new=AsyncMock(return_value=_narrow_row()),
+        ),
+        patch(f"{_CONTROLLER}.get_analysis_job_results", new=results),
+    ):
+        resp = await _send(
+            "GET",
+            "/api/analysis/status",
+            params={"jobId": JOB_A, "jobToken": VALID_TOKEN},
+        )
+
+    assert resp.status_code == 200
+    assert resp.json()["result"] is None
+    results.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_succeeded_job_poll_reads_results_after_the_token_check() -> None:
+    results = AsyncMock(return_value={JOB_A: None})
+    with (
+        patch(
+            f"{_CONTROLLER}.get_analysis_job_by_id",
+            new=AsyncMock(return_value=_narrow_row(status="succeeded")),
+        ),
+        patch(f"{_CONTROLLER}.get_analysis_job_results", new=results),
+    ):
+        rejected = await _send(
+            "GET",
+            "/api/analysis/status",
+            params={"jobId": JOB_A, "jobToken": "wrong"},
+        )
+        results.assert_not_awaited()
+        resp = await _send(
+            "GET",
+            "/api/analysis/status",
+            params={"jobId": JOB_A, "jobToken": VALID_TOKEN},
+        )
+
+    assert rejected.status_code == 401
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "succeeded"
+    results.assert_awaited_once_with([JOB_A])
+
+
+@pytest.mark.anyio
+async def test_batch_reads_results_of_verified_succeeded_jobs_in_one_query() -> None:
+    rows = [
+        _narrow_row(JOB_A, status="succeeded"),
+        _narrow_row(JOB_B, status="succeeded"),
+    ]
+    results = AsyncMock(return_value={})
+    with (
+        patch(
+            f"{_CONTROLLER}.get_analysis_jobs_by_ids",
+            new=AsyncMock(return_value=rows),
+        ),
+        patch(f"{_CONTROLLER}.get_analysis_job_results", new=results),
+    ):
+        resp = await _send(
+            "POST",
+            "/api/analysis/status:batch",
+            json={
+                "jobs": [
+                    {"jobId": JOB_A, "jobToken": VALID_TOKEN},
+                    {"jobId": JOB_B, "jobToken": "wrong"},
+                ]
+            },
+        )
+
+    assert [r["statusCode"] for r in resp.json()["results"]] == [200, 401]
+    results.assert_awaited_once_with([JOB_A])
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.main import app
+from app.services.status_feed import StatusFeed
+
+DUMMY_JOB_ID = "aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee"
+VALID_TOKEN = "tok-abc"
+STREAM_URL = "/api/analysis/status:stream"
+_CONTROLLER = "app.api.controllers.analysis.status"
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    # The status feed runs its poller as an asyncio task.
+    return "asyncio"
+
+
+def _make_row(
+    *,
+    status: str = "queued",
+    stage: str = "created",
+    expires_in: timedelta = timedelta(hours=1),
+) -> dict:
+    return {
+        "id": DUMMY_JOB_ID,
+        "status": status,
+        "poll_status_token": VALID_TOKEN,
+        "poll_status_token_expires_at": (datetime.now(UTC) + expires_in).isoformat(),
+        "created_at": "2024-01-01T00:00:00+00:00",
+        "completed_at": (
+            "2024-01-01T00:05:00+00:00" if status == "succeeded" else None
+        ),
+        "stage": stage,
+        "results": None,
+        "error": None,
+    }
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in block.splitlines() if ": " in line
+        )
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+async def _stream(
+    initial: dict, updates: list[dict], job_token: str = VALID_TOKEN
+) -> httpx.Response:
+    """Stream a job whose row takes each value of ``updates`` in turn."""
+    pending = list(updates)
+
+    async def fetch_rows(_job_ids: list[str]) -> list[dict]:
+        return [pending.pop(0)] if pending else []
+
+    feed = StatusFeed(interval_seconds=0.01, fetch_rows=fetch_rows)
+    transport = httpx.ASGITransport(app=app)
+    try:
+        with (
+            patch(
+                f"{_CONTROLLER}.get_analysis_job_by_id",
+                new=AsyncMock(return_value=initial),
+            ),
+            patch(f"{_CONTROLLER}.get_status_feed", return_value=feed),
+        ):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://testserver"
+            ) as client:
+                return await client.get(
+                    STREAM_URL, params={"jobId": DUMMY_JOB_ID, "jobToken": job_token}
+                )
+    finally:
+        await feed.close()
+
+
+@pytest.mark.anyio
+async def test_stream_pushes_each_change_until_the_job_finishes() -> None:
+    resp = await _stream(
+        _make_row(),
+        [
+            _make_row(status="running", stage="langgraph_running"),
+            _make_row(status="running", stage="langgraph_running"),
+            _make_row(status="succeeded", stage="done"),
+        ],
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = _events(resp.text)
+    assert [(name, data["status"], data["stage"]) for name, data in events] == [
+        ("status", "queued", "created"),
+        ("status", "running", "langgraph_running"),
+        ("status", "succeeded", "done"),
+    ]
+    assert "poll_status_token" not in resp.text
+
+
+@pytest.mark.anyio
+async def test_stream_of_a_finished_job_sends_one_event() -> None:
+    resp = await _stream(_make_row(status="succeeded", stage="done"), [])
+
+    assert [name for name, _ in _events(resp.text)] == ["status"]
+
+
+@pytest.mark.anyio
+async def test_stream_ends_with_an_error_event_when_the_token_expires() -> None:
+    resp = await _stream(
+        _make_row(),
+        [_make_row(status="running", expires_in=timedelta(seconds=-1))],
+    )
+
+    assert _events(resp.text)[-1] == (
+        "error",
+        {"statusCode": 401, "error": "Invalid or expired token"},
+    )
+
+
+@pytest.mark.anyio
+async def test_stream_ends_when_the_token_is_replaced() -> None:
+    rotated = {**_make_row(), "poll_status_token": "tok-new"}
+    resp = await _stream(_make_row(), [rotated])
+
+    events = _events(resp.text)
+    assert [name for name, _ in events] == ["status", "error"]
+    assert events[-1][1] == {"statusCode": 401, "error": "Invalid or expired token"}
+
+
+@pytest.mark.anyio
+async def test_stream_rejects_a_wrong_token_before_streaming() -> None:
+    resp = await _stream(_make_row(), [], job_token="wrong")
+
+    assert resp.status_code == 401
+    assert resp.json() == {"error": "Invalid or expired token"}
@@ -0,0 +1,93 @@
+import anyio
+import httpx
+import pytest
+
+from app.core import supabase_client
+from app.core.config import settings
+from app.services.analysis_jobs_repo import (
+    AnalysisJobsRepoError,
+    get_analysis_job_by_id,
+    get_analysis_job_results,
+    get_analysis_jobs_by_ids,
+)
+
+
+@pytest.fixture
+def fake_postgrest(monkeypatch):
+    monkeypatch.setattr(settings, "supabase_url", "https://example.supabase.co")
+    monkeypatch.setattr(settings, "supabase_service_role_key", "service-role-key")
+    requests: list[httpx.Request] = []
+    responses: list[httpx.Response] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return responses.pop(0)
+
+    clients = supabase_client.get_supabase_clients()
+    clients.async_http._transport = httpx.MockTransport(handler)
+    yield requests, responses
+    anyio.run(supabase_client.close_supabase_clients)
+
+
+def test_get_analysis_job_by_id_uses_async_client(fake_postgrest):
+    requests, responses = fake_postgrest
+    responses.append(httpx.Response(200, json=[{"id": "job-1", "status": "queued"}]))
+
+    row = anyio.run(get_analysis_job_by_id, "job-1")
+
+    assert row == {"id": "job-1", "status": "queued"}
+    assert requests[0].url.path == "/rest/v1/analysis_jobs"
+    assert requests[0].url.params["id"] == "eq.job-1"
+    assert "results" not in requests[0].url.params["select"]
+    assert requests[0].headers["authorization"] == "Bearer service-role-key"
+
+
+def test_get_analysis_job_by_id_returns_none_when_missing(fake_postgrest):
+    _, responses = fake_postgrest
+    responses.append(httpx.Response(200, json=[]))
+
+    assert anyio.run(get_analysis_job_by_id, "job-1") is None
+
+
+def test_get_analysis_job_by_id_maps_auth_errors(fake_postgrest):
+    _, responses = fake_postgrest
+    responses.append(
+        httpx.Response(401, json={"code": "401", "message": "JWT invalid"})
+    )
+
+    with pytest.raises(AnalysisJobsRepoError) as exc:
+        anyio.run(get_analysis_job_by_id, "job-1")
+
+    assert exc.value.code == "db_unauthorized"
+
+
+def test_get_analysis_jobs_by_ids_fetches_all_rows_in_one_query(fake_postgrest):
+    requests, responses = fake_postgrest
+    responses.append(httpx.Response(200, json=[{"id": "job-2"}, {"id": "job-1"}]))
+
+    rows = anyio.run(get_analysis_jobs_by_ids, ["job-2", "job-1", "job-2"])
+
+    assert rows == [{"id": "job-2"}, {"id": "job-1"}]
+    assert len(requests) == 1
+    assert requests[0].url.params["id"] == "in.(job-1,job-2)"
+
+
+def test_get_analysis_jobs_by_ids_skips_the_query_without_ids(fake_postgrest):
+    requests, _ = fake_postgrest
+
+    assert anyio.run(get_analysis_jobs_by_ids, []) == []
+    assert requests == []
+
+
+def test_get_analysis_job_results_reads_only_succeeded_jobs(fake_postgrest):
+    requests, responses = fake_postgrest
+    responses.append(
+        httpx.Response(200, json=[{"id": "JOB-1", "results": {"version": 1}}])
+    )
+
+    results = anyio.run(get_analysis_job_results, ["job-2", "JOB-1"])
+
+    assert results == {"job-1": {"version": 1}}
+    assert requests[0].url.params["select"] == "id,results"
+    assert requests[0].url.params["status"] == "eq.succeeded"
+    assert requests[0].url.params["id"] == "in.(JOB-1,job-2)"
@@ -1,13 +1,16 @@
 import hashlib
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
+import anyio
 import pytest
 
 from app.services.integrity import (
     IntegrityShaMismatchError,
     verify_sha256_bytes,
+    verify_supabase_object_integrity,
     verify_supabase_object_sha256,
 )
+from app.services.supabase_storage import ObjectMetadata
 
 CONTENT = b"dummy-content"
 CONTENT_SHA256 = hashlib.sha256(CONTENT).hexdigest()
@@ -34,3 +37,51 @@ def test_verify_supabase_object_sha256_downloads_and_verifies():
             path="uploads/req/file.pdf",
             sha256=CONTENT_SHA256.upper(),
         )
+
+
+@pytest.fixture
+def metadata_mode(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "integrity_mode", "metadata")
+
+
+def test_metadata_mode_verifies_recorded_checksum_without_download(metadata_mode):
+    with patch(
+        "app.services.integrity.get_object_metadata",
+        new=AsyncMock(return_value=ObjectMetadata(size=13, sha256=CONTENT_SHA256)),
+    ), patch(
+        "app.services.integrity.compute_object_sha256_async", new=AsyncMock()
+    ) as streamed:
+        hashed = anyio.run(_verify_integrity, CONTENT_SHA256.upper())
+
+    streamed.assert_not_awaited()
+    assert hashed is False
+
+
+def test_metadata_mode_rejects_recorded_checksum_mismatch(metadata_mode):
+    with patch(
+        "app.services.integrity.get_object_metadata",
+        new=AsyncMock(return_value=ObjectMetadata(size=13, sha256="b" * 64)),
+    ), pytest.raises(IntegrityShaMismatchError):
+        anyio.run(_verify_integrity, CONTENT_SHA256)
+
+
+def test_metadata_mode_falls_back_to_streaming_hash(metadata_mode):
+    with patch(
+        "app.services.integrity.get_object_metadata",
+        new=AsyncMock(return_value=ObjectMetadata(size=13, sha256=None)),
+    ), patch(
+        "app.services.integrity.compute_object_sha256_async",
+        new=AsyncMock(return_value=CONTENT_SHA256),
+    ) as streamed:
+        hashed = anyio.run(_verify_integrity, CONTENT_SHA256)
+
+    streamed.assert_awaited_once_with("uploads", "uploads/req/file.pdf")
+    assert hashed is True
+
+
+async def _verify_integrity(sha256):
+    return await verify_supabase_object_integrity(
+        bucket="uploads", path="uploads/req/file.pdf", sha256=sha256
+    )
@@ -0,0 +1,53 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.utils.poll_token import issue_poll_token, poll_token_precheck
+
+JOB_ID = "aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee"
+OTHER_JOB_ID = "bbbbbbbb-cccc-dddd-eeee-ffffffffffff"
+
+
+@pytest.fixture
+def secret(monkeypatch):
+    monkeypatch.setattr(settings, "poll_token_secret", "test-secret")
+
+
+def _in(seconds: float) -> datetime:
+    return datetime.now(UTC) + timedelta(seconds=seconds)
+
+
+def test_without_a_secret_tokens_are_opaque_and_not_prechecked():
+    token = issue_poll_token(JOB_ID, _in(3600))
+
+    assert JOB_ID not in token
+    assert poll_token_precheck(JOB_ID, "anything")
+
+
+def test_signed_token_passes_the_precheck_for_its_job(secret):
+    token = issue_poll_token(JOB_ID, _in(3600))
+
+    assert token.startswith(f"v1.{JOB_ID}.")
+    assert poll_token_precheck(JOB_ID, token)
+    assert poll_token_precheck(JOB_ID.upper(), token)
+
+
+def test_precheck_rejects_other_jobs_expiry_and_tampering(secret, monkeypatch):
+    token = issue_poll_token(JOB_ID, _in(3600))
+    payload, _, signature = token.rpartition(".")
+    prefix, job_id, expires_at = payload.split(".")
+
+    assert not poll_token_precheck(OTHER_JOB_ID, token)
+    assert not poll_token_precheck(JOB_ID, issue_poll_token(JOB_ID, _in(-1)))
+    extended = f"{prefix}.{job_id}.{int(expires_at) + 3600}.{signature}"
+    assert not poll_token_precheck(JOB_ID, extended)
+    monkeypatch.setattr(settings, "poll_token_secret", "rotated-secret")
+    assert not poll_token_precheck(JOB_ID, token)
+
+
+def test_unsigned_tokens_pass_unless_disabled(secret, monkeypatch):
+    assert poll_token_precheck(JOB_ID, "legacy-random-token")
+
+    monkeypatch.setattr(settings, "poll_token_accept_unsigned", False)
+    assert not poll_token_precheck(JOB_ID, "legacy-random-token")
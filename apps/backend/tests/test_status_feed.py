@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.analysis_jobs_repo import AnalysisJobsRepoError
+from app.services.status_feed import StatusFeed
+
+JOB_A = "aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee"
+JOB_B = "bbbbbbbb-cccc-dddd-eeee-ffffffffffff"
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    # The status feed runs its poller as an asyncio task.
+    return "asyncio"
+
+
+def _row(job_id: str, status: str = "queued", stage: str = "created") -> dict:
+    return {"id": job_id, "status": status, "stage": stage, "completed_at": None}
+
+
+class _FakeDb:
+    def __init__(self, *rows: dict) -> None:
+        self.rows = {row["id"]: row for row in rows}
+        self.calls: list[list[str]] = []
+        self.fail = False
+
+    async def fetch_rows(self, job_ids: list[str]) -> list[dict]:
+        self.calls.append(sorted(job_ids))
+        if self.fail:
+            raise AnalysisJobsRepoError(code="analysis_job_fetch_failed")
+        return [self.rows[job_id] for job_id in job_ids if job_id in self.rows]
+
+
+@pytest.mark.anyio
+async def test_feed_reads_all_subscribed_jobs_in_one_query() -> None:
+    db = _FakeDb(_row(JOB_A), _row(JOB_B))
+    feed = StatusFeed(interval_seconds=0.01, fetch_rows=db.fetch_rows)
+    subs = [
+        feed.subscribe(JOB_A, _row(JOB_A)),
+        feed.subscribe(JOB_A, _row(JOB_A)),
+        feed.subscribe(JOB_B, _row(JOB_B)),
+    ]
+
+    db.rows[JOB_A] = _row(JOB_A, status="running", stage="langgraph_running")
+    changed = await subs[0].next(timeout=1)
+    try:
+        assert changed is not None and changed["status"] == "running"
+        assert (await subs[1].next(timeout=1)) == changed
+        # Unchanged jobs are not delivered.
+        assert await subs[2].next(timeout=0.05) is None
+        assert all(call == sorted([JOB_A, JOB_B]) for call in db.calls)
+    finally:
+        await feed.close()
+
+
+@pytest.mark.anyio
+async def test_feed_keeps_only_the_newest_row_for_a_slow_subscriber() -> None:
+    db = _FakeDb(_row(JOB_A))
+    feed = StatusFeed(interval_seconds=60, fetch_rows=db.fetch_rows)
+    sub = feed.subscribe(JOB_A, _row(JOB_A))
+    try:
+        sub.offer(_row(JOB_A, status="running"))
+        sub.offer(_row(JOB_A, status="succeeded", stage="done"))
+
+        assert (await sub.next(timeout=1))["status"] == "succeeded"
+        assert await sub.next(timeout=0.01) is None
+    finally:
+        await feed.close()
+
+
+@pytest.mark.anyio
+async def test_feed_survives_read_failures_and_stops_when_idle() -> None:
+    db = _FakeDb(_row(JOB_A))
+    db.fail = True
+    feed = StatusFeed(interval_seconds=0.01, fetch_rows=db.fetch_rows)
+    sub = feed.subscribe(JOB_A, _row(JOB_A))
+
+    await asyncio.sleep(0.05)
+    db.fail = False
+    db.rows[JOB_A] = _row(JOB_A, status="failed")
+    assert (await sub.next(timeout=1))["status"] == "failed"
+
+    feed.unsubscribe(sub)
+    await asyncio.sleep(0.05)
+    calls = len(db.calls)
+    await asyncio.sleep(0.05)
+    assert len(db.calls) == calls
+    await feed.close()
@@ -0,0 +1,49 @@
+import anyio
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import supabase_client
+from app.core.config import settings
+from app.core.supabase_client import (
+    SupabaseClientError,
+    close_supabase_clients,
+    get_supabase_admin_client,
+    get_supabase_async_admin_client,
+)
+from app.main import create_app
+
+
+@pytest.fixture
+def configured(monkeypatch):
+    monkeypatch.setattr(settings, "supabase_url", "https://example.supabase.co")
+    monkeypatch.setattr(settings, "supabase_service_role_key", "service-role-key")
+    yield
+    anyio.run(close_supabase_clients)
+
+
+def test_admin_clients_are_shared_between_calls(configured):
+    first = get_supabase_admin_client()
+    first_async = get_supabase_async_admin_client()
+
+    assert get_supabase_admin_client() is first
+    assert get_supabase_async_admin_client() is first_async
+
+
+def test_misconfigured_client_raises(monkeypatch):
+    monkeypatch.setattr(settings, "supabase_url", "")
+
+    with pytest.raises(SupabaseClientError) as exc:
+        get_supabase_admin_client()
+
+    assert exc.value.code == "server_misconfigured"
+
+
+def test_lifespan_creates_and_closes_clients(configured):
+    with TestClient(create_app()):
+        clients = supabase_client._clients
+        assert clients is not None
+        assert clients.pool_stats()["async_connections"] == 0
+
+    assert supabase_client._clients is None
+    assert clients.http.is_closed
+    assert clients.async_http.is_closed
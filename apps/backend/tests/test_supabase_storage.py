@@ -0,0 +1,47 @@
+import hashlib
+
+import anyio
+import httpx
+import pytest
+
+from app.core import supabase_client
+from app.core.config import settings
+from app.services.supabase_storage import (
+    SupabaseStorageError,
+    compute_object_sha256_async,
+)
+
+CONTENT = b"%PDF-1.7 " + b"x" * 200_000
+
+
+@pytest.fixture
+def fake_storage(monkeypatch):
+    monkeypatch.setattr(settings, "supabase_url", "https://example.supabase.co")
+    monkeypatch.setattr(settings, "supabase_service_role_key", "service-role-key")
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            return httpx.Response(
+                200, json={"signedURL": "/object/sign/uploads/file.pdf?token=t"}
+            )
+        return httpx.Response(200, content=CONTENT)
+
+    clients = supabase_client.get_supabase_clients()
+    clients.async_http._transport = httpx.MockTransport(handler)
+    yield
+    anyio.run(supabase_client.close_supabase_clients)
+
+
+def test_compute_object_sha256_async_streams_the_object(fake_storage):
+    digest = anyio.run(compute_object_sha256_async, "uploads", "file.pdf")
+
+    assert digest == hashlib.sha256(CONTENT).hexdigest()
+
+
+def test_compute_object_sha256_async_enforces_size_limit(fake_storage, monkeypatch):
+    monkeypatch.setattr(settings, "max_file_size_bytes", 1024)
+
+    with pytest.raises(SupabaseStorageError) as exc:
+        anyio.run(compute_object_sha256_async, "uploads", "file.pdf")
+
+    assert exc.value.code == "file_too_large"
@@ -0,0 +1,34 @@
+from app.utils import ttl_cache
+from app.utils.ttl_cache import TTLCache
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=10, max_entries=4)
+
+    cache.set("a", 1)
+    now[0] += 9
+    assert cache.get("a") == 1
+    now[0] += 1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_zero_ttl_disables_the_cache():
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=0, max_entries=2)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
@@ -5,7 +5,9 @@ from unittest.mock import AsyncMock, patch
 import httpx
 import pytest
 
+from app.core.config import settings
 from app.main import app
+from app.utils.poll_token import poll_token_precheck
 
 DUMMY_CONTENT = b"dummy"
 DUMMY_SHA256 = hashlib.sha256(DUMMY_CONTENT).hexdigest()
@@ -34,6 +36,13 @@ VALID_PAYLOAD = {
 
 URL = "/api/analysis/start"
 
+# The document fields of a job row created from VALID_PAYLOAD.
+SUBMITTED_DOCUMENT = {
+    "bucket": VALID_PAYLOAD["storage"]["bucket"],
+    "path": VALID_PAYLOAD["storage"]["path"],
+    "sha256": DUMMY_SHA256,
+}
+
 
 def _payload(**overrides):
     """Return a deep copy of VALID_PAYLOAD with nested overrides applied."""
@@ -47,6 +56,19 @@ def _payload(**overrides):
     return data
 
 
+@pytest.fixture(autouse=True)
+def no_existing_jobs():
+    """Default: no job for this requestId and no reusable result."""
+    with patch(
+        "app.api.controllers.analysis.start.get_analysis_job_by_request_id",
+        new=AsyncMock(return_value=None),
+    ), patch(
+        "app.api.controllers.analysis.start.find_reusable_analysis_job",
+        new=AsyncMock(return_value=None),
+    ):
+        yield
+
+
 async def _post(payload: dict):
     transport = httpx.ASGITransport(app=app)
     async with httpx.AsyncClient(
@@ -58,8 +80,8 @@ async def _post(payload: dict):
 @pytest.mark.anyio
 async def test_happy_path():
     with patch(
-        "app.api.controllers.analysis.start.download_object_bytes",
-        new=AsyncMock(return_value=DUMMY_CONTENT),
+        "app.services.integrity.compute_object_sha256_async",
+        new=AsyncMock(return_value=DUMMY_SHA256),
     ), patch(
         "app.api.controllers.analysis.start.create_analysis_job",
         new=AsyncMock(return_value={"id": DUMMY_JOB_ID}),
@@ -72,11 +94,188 @@ async def test_happy_path():
     assert body["status"] == "queued"
 
 
+
+@pytest.mark.anyio
+async def test_signed_poll_token_is_bound_to_the_new_job_id(monkeypatch):
+    monkeypatch.setattr(settings, "poll_token_secret", "test-secret")
+    create = AsyncMock(side_effect=lambda row: {"id": row["id"]})
+    with patch(
+        "app.services.integrity.compute_object_sha256_async",
+        new=AsyncMock(return_value=DUMMY_SHA256),
+    ), patch(
+        "app.api.controllers.analysis.start.create_analysis_job", new=create
+    ):
+        resp = await _post(VALID_PAYLOAD)
+
+    assert resp.status_code == 200
+    body = resp.json()
+    row = create.await_args.args[0]
+    assert body["jobId"] == row["id"]
+    assert body["jobToken"] == row["poll_status_token"]
+    assert poll_token_precheck(row["id"], body["jobToken"])
+    assert not poll_token_precheck(DUMMY_JOB_ID, body["jobToken"])
+
+@pytest.mark.anyio
+async def test_reuses_result_of_previous_identical_analysis():
+    previous = {
+        "id": "0b0c9c4e-5a1f-4a55-9d55-3f5b0b7e8a11",
+        "results": {"version": 1},
+        "result_json": {"references": []},
+    }
+    create = AsyncMock(return_value={"id": DUMMY_JOB_ID})
+    with patch(
+        "app.services.integrity.compute_object_sha256_async",
+        new=AsyncMock(return_value=DUMMY_SHA256),
+    ), patch(
+        "app.api.controllers.analysis.start.find_reusable_analysis_job",
+        new=AsyncMock(return_value=previous),
+    ), patch(
+        "app.api.controllers.analysis.start.create_analysis_job", new=create
+    ):
+        resp = await _post(VALID_PAYLOAD)
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["jobId"] == DUMMY_JOB_ID
+    assert body["status"] == "succeeded"
+    row = create.await_args.args[0]
+    assert row["status"] == "succeeded"
+    assert row["stage"] == "done"
+    assert row["results"] == previous["results"]
+    assert row["result_json"] == previous["result_json"]
+    assert row["reused_from_job_id"] == previous["id"]
+    assert row["request_id"] == VALID_PAYLOAD["requestId"]
+    assert row["poll_status_token"] == body["jobToken"]
+
+
+
+@pytest.mark.anyio
+async def test_metadata_checksum_does_not_select_a_reused_result(monkeypatch):
+    from app.services.supabase_storage import ObjectMetadata
+
+    monkeypatch.setattr(settings, "integrity_mode", "metadata")
+    find = AsyncMock(return_value={"id": "0b0c9c4e-5a1f-4a55-9d55-3f5b0b7e8a11"})
+    create = AsyncMock(return_value={"id": DUMMY_JOB_ID})
+    with patch(
+        "app.services.integrity.get_object_metadata",
+        new=AsyncMock(return_value=ObjectMetadata(size=5, sha256=DUMMY_SHA256)),
+    ), patch(
+        "app.api.controllers.analysis.start.find_reusable_analysis_job", new=find
+    ), patch(
+        "app.api.controllers.analysis.start.create_analysis_job", new=create
+    ):
+        resp = await _post(VALID_PAYLOAD)
+
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "queued"
+    find.assert_not_awaited()
+    assert create.await_args.args[0]["status"] == "queued"
+
+@pytest.mark.anyio
+async def test_retried_request_id_returns_existing_job():
+    existing = {
+        "id": DUMMY_JOB_ID,
+        **SUBMITTED_DOCUMENT,
+        "status": "running",
+        "poll_status_token": "existing-token",
+        "poll_status_token_expires_at": "2999-01-01T00:00:00Z",
+    }
+    create = AsyncMock()
+    integrity = AsyncMock()
+    with patch(
+        "app.api.controllers.analysis.start.get_analysis_job_by_request_id",
+        new=AsyncMock(return_value=existing),
+    ), patch(
+        "app.services.integrity.compute_object_sha256_async", new=integrity
+    ), patch(
+        "app.api.controllers.analysis.start.create_analysis_job", new=create
+    ):
+        resp = await _post(VALID_PAYLOAD)
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["jobId"] == DUMMY_JOB_ID
+    assert body["status"] == "running"
+    assert body["jobToken"] == "existing-token"
+    create.assert_not_awaited()
+    integrity.assert_not_awaited()
+
+
+
+@pytest.mark.anyio
+async def test_request_id_replayed_for_another_document_is_rejected():
+    existing = {
+        "id": DUMMY_JOB_ID,
+        **SUBMITTED_DOCUMENT,
+        "sha256": "b" * 64,
+        "status": "succeeded",
+        "poll_status_token": "existing-token",
+        "poll_status_token_expires_at": "2999-01-01T00:00:00Z",
+    }
+    with patch(
+        "app.api.controllers.analysis.start.get_analysis_job_by_request_id",
+        new=AsyncMock(return_value=existing),
+    ):
+        resp = await _post(VALID_PAYLOAD)
+        other_path = VALID_PAYLOAD["storage"]["path"].replace("dummy", "other")
+        moved = await _post(
+            _payload(**{"storage.path": other_path, "document.fileName": "other.pdf"})
+        )
+
+    for rejected in (resp, moved):
+        assert rejected.status_code == 409
+        assert rejected.json()["code"] == "analysis_request_conflict"
+        assert "existing-token" not in rejected.text
+
+@pytest.mark.anyio
+async def test_retried_request_id_with_expired_token_gets_a_new_one():
+    existing = {
+        "id": DUMMY_JOB_ID,
+        **SUBMITTED_DOCUMENT,
+        "status": "succeeded",
+        "poll_status_token": "old-token",
+        "poll_status_token_expires_at": "2000-01-01T00:00:00Z",
+    }
+    refresh = AsyncMock()
+    with patch(
+        "app.api.controllers.analysis.start.get_analysis_job_by_request_id",
+        new=AsyncMock(return_value=existing),
+    ), patch("app.api.controllers.analysis.start.refresh_poll_token", new=refresh):
+        resp = await _post(VALID_PAYLOAD)
+
+    body = resp.json()
+    assert body["jobToken"] != "old-token"
+    assert refresh.await_args.kwargs["poll_token"] == body["jobToken"]
+
+
+@pytest.mark.anyio
+async def test_failed_token_refresh_returns_update_problem():
+    from app.services.analysis_jobs_repo import AnalysisJobsRepoError
+
+    existing = {
+        "id": DUMMY_JOB_ID,
+        **SUBMITTED_DOCUMENT,
+        "status": "succeeded",
+        "poll_status_token": "old-token",
+        "poll_status_token_expires_at": "2000-01-01T00:00:00Z",
+    }
+    refresh = AsyncMock(
+        side_effect=AnalysisJobsRepoError(code="analysis_job_update_failed")
+    )
+    with patch(
+        "app.api.controllers.analysis.start.get_analysis_job_by_request_id",
+        new=AsyncMock(return_value=existing),
+    ), patch("app.api.controllers.analysis.start.refresh_poll_token", new=refresh):
+        resp = await _post(VALID_PAYLOAD)
+
+    assert resp.status_code == 502
+    assert resp.json()["code"] == "analysis_job_update_failed"
+
 @pytest.mark.anyio
 async def test_sha_mismatch_returns_problem_json():
     with patch(
-        "app.api.controllers.analysis.start.download_object_bytes",
-        new=AsyncMock(return_value=DUMMY_CONTENT),
+        "app.services.integrity.compute_object_sha256_async",
+        new=AsyncMock(return_value=DUMMY_SHA256),
     ):
         resp = await _post(_payload(**{"integrity.sha256": "a" * 64}))
     assert resp.status_code == 409
@@ -90,7 +289,7 @@ async def test_storage_not_found_returns_problem_json():
     from app.services.supabase_storage import SupabaseStorageError
 
     with patch(
-        "app.api.controllers.analysis.start.download_object_bytes",
+        "app.services.integrity.compute_object_sha256_async",
         new=AsyncMock(side_effect=SupabaseStorageError(code="storage_not_found")),
     ):
         resp = await _post(VALID_PAYLOAD)
@@ -5,6 +5,10 @@
  * params, forwards the request to the backend, and preserves the backend
  * HTTP status code. Never exposes the backend URL or raw token values in
  * error responses or logs.
+ *
+ * Conditional requests pass through: the browser's If-None-Match is sent
+ * upstream, and the backend's ETag / Cache-Control and bodiless 304 are
+ * returned as-is, so unchanged polls are answered from the browser cache.
  */
 
 import { NextRequest, NextResponse } from "next/server";
@@ -64,11 +68,15 @@ export async function GET(request: NextRequest): Promise<Response> {
   const controller = new AbortController();
   const timeoutId = setTimeout(() => controller.abort(), UPSTREAM_TIMEOUT_MS);
 
+  const ifNoneMatch = request.headers.get("if-none-match");
+
   let backendResponse: Response;
   try {
     backendResponse = await fetch(upstreamUrl, {
       method: "GET",
+      headers: ifNoneMatch ? { "If-None-Match": ifNoneMatch } : undefined,
       signal: controller.signal,
+      cache: "no-store",
     });
   } catch (error) {
     clearTimeout(timeoutId);
@@ -89,6 +97,19 @@ export async function GET(request: NextRequest): Promise<Response> {
 
   clearTimeout(timeoutId);
 
+  const cacheHeaders = new Headers();
+  for (const name of ["ETag", "Cache-Control"]) {
+    const value = backendResponse.headers.get(name);
+    if (value) cacheHeaders.set(name, value);
+  }
+
+  if (backendResponse.status === HTTP_STATUS.NOT_MODIFIED) {
+    return new Response(null, {
+      status: HTTP_STATUS.NOT_MODIFIED,
+      headers: cacheHeaders,
+    });
+  }
+
   // --- Transparently forward backend response ---
   // Clone before reading so the original stream is available for text fallback.
   const cloned = backendResponse.clone();
@@ -106,5 +127,8 @@ export async function GET(request: NextRequest): Promise<Response> {
     });
   }
 
-  return NextResponse.json(body, { status: backendResponse.status });
+  return NextResponse.json(body, {
+    status: backendResponse.status,
+    headers: cacheHeaders,
+  });
 }
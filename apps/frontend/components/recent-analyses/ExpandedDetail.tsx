@@ -99,6 +99,16 @@ export function ExpandedDetail({ job, panelId }: ExpandedDetailProps) {
         </div>
       );
 
+    case "cancelled":
+      return (
+        <div id={panelId} role="region" className={cn(panelBase, "space-y-1")}>
+          <p className="text-muted font-medium">Analysis cancelled</p>
+          {job.completedAt !== null && (
+            <p className="text-xs text-muted">Cancelled {formatRelativeTime(job.completedAt)}</p>
+          )}
+        </div>
+      );
+
     case "expired":
       return (
         <div id={panelId} role="region" className={cn(panelBase, "space-y-1")}>
@@ -91,6 +91,30 @@ export function StatusBadge({ status }: StatusBadgeProps) {
           Failed
         </span>
       );
+    case "cancelled":
+      return (
+        <span
+          aria-label="cancelled"
+          className={cn(base, "bg-surface text-muted border border-border")}
+        >
+          <svg
+            xmlns="http://www.w3.org/2000/svg"
+            width="12"
+            height="12"
+            viewBox="0 0 24 24"
+            fill="none"
+            stroke="currentColor"
+            strokeWidth="2"
+            strokeLinecap="round"
+            strokeLinejoin="round"
+            aria-hidden="true"
+          >
+            <circle cx="12" cy="12" r="10" />
+            <line x1="4.93" y1="4.93" x2="19.07" y2="19.07" />
+          </svg>
+          Cancelled
+        </span>
+      );
     case "expired":
       return (
         <span
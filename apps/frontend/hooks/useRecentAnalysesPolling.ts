@@ -8,7 +8,7 @@
  * polling interval (every 4 s) against the /api/jobs/status proxy route.
  *
  * Transient failures (network errors, 502) are silently retried on the next
- * interval. Terminal statuses (succeeded, failed, expired) stop polling
+ * interval. Terminal statuses (succeeded, failed, cancelled, expired) stop polling
  * automatically. On unmount every active interval is cleared.
  */
 
@@ -30,6 +30,7 @@ const POLL_INTERVAL_MS = 4_000;
 const TERMINAL_STATUSES: ReadonlySet<JobStatus> = new Set([
   "succeeded",
   "failed",
+  "cancelled",
   "expired",
 ]);
 
@@ -245,6 +246,7 @@ const VALID_JOB_STATUSES: ReadonlySet<string> = new Set([
   "running",
   "succeeded",
   "failed",
+  "cancelled",
   "expired",
 ]);
 
@@ -37,6 +37,7 @@ export const UPLOAD_PATHS = {
 } as const;
 
 export const HTTP_STATUS = {
+  NOT_MODIFIED: 304,
   BAD_REQUEST: 400,
   UNAUTHORIZED: 401,
   NOT_FOUND: 404,
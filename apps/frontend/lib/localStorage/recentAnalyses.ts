@@ -10,7 +10,7 @@ import type { ResultsV1 } from "@/lib/schemas/resultsV1";
  * surfacing that error to the user.
  */
 
-export type JobStatus = "queued" | "running" | "succeeded" | "failed" | "expired";
+export type JobStatus = "queued" | "running" | "succeeded" | "failed" | "cancelled" | "expired";
 
 export interface StoredJob {
   jobId: string;
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+from biblio_checker_worker.core import metrics
+from biblio_checker_worker.core.config import settings
+
+logger = logging.getLogger("biblio_checker_worker.cache")
+
+_SHA256_RE = re.compile(r"[a-f0-9]{64}")
+SPOOL_PREFIX = ".tmp-"
+# A spool file this old was left behind by a crashed write; live spools only
+# last as long as their job.
+_STALE_SPOOL_SECONDS = 24 * 60 * 60
+
+
+class BlobCache:
+    """Content-addressed disk cache of verified source documents.
+
+    Blobs are stored as ``<root>/<sha[:2]>/<sha>``.  Only bytes whose SHA-256
+    has already been verified are inserted, so a hit is trusted without
+    re-hashing: the key is the content's hash.
+
+    Blobs are inserted by adopt(), which publishes a verified file spooled
+    into the cache root with os.replace, so readers (including other worker
+    processes sharing the directory) never see a partial blob.  After each
+    insert the least recently used blobs (by mtime, refreshed on every hit)
+    are evicted until the total fits ``max_bytes``, and spool files left in
+    the root by crashed writes are removed once they are a day old.
+
+    The cache is best-effort: filesystem errors are logged and treated as a
+    miss, never as a job failure.
+    """
+
+    def __init__(self, *, root: Path, max_bytes: int) -> None:
+        self._root = root
+        self._max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+
+    def path_for(self, sha256: str) -> Path:
+        sha256 = sha256.lower()
+        if not _SHA256_RE.fullmatch(sha256):
+            raise ValueError("sha256 must be 64 hex characters")
+        return self._root / sha256[:2] / sha256
+
+    def get(self, sha256: str) -> Path | None:
+        """Return the cached blob's path, or None on a miss."""
+        try:
+            path = self.path_for(sha256)
+            os.utime(path)  # Mark as recently used for LRU eviction.
+        except (FileNotFoundError, ValueError):
+            metrics.inc_counter("blob_cache_misses")
+            return None
+        except OSError as exc:
+            logger.warning("Blob cache lookup failed for %s: %s", sha256, exc)
+            metrics.inc_counter("blob_cache_misses")
+            return None
+        metrics.inc_counter("blob_cache_hits")
+        return path
+
+    @property
+    def root(self) -> Path:
+        """Cache directory; spool files placed here can be adopted cheaply."""
+        return self._root
+
+    def adopt(self, sha256: str, src: Path) -> Path | None:
+        """Move the verified file ``src`` into the cache under ``sha256``.
+
+        ``src`` must be on the cache's filesystem (e.g. created in ``root``)
+        so the move is a rename.  Returns the blob's path, or None when the
+        file was not cached; ``src`` is then left where it is.
+        """
+        try:
+            size = src.stat().st_size
+            if size > self._max_bytes:
+                return None
+            path = self.path_for(sha256)
+        except (OSError, ValueError):
+            return None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(src, "rb") as fh:
+                os.fsync(fh.fileno())
+            os.replace(src, path)
+        except OSError as exc:
+            logger.warning("Blob cache write failed for %s: %s", sha256, exc)
+            return None
+        self._evict(keep=path)
+        return path
+
+    def sweep_stale_spools(self) -> None:
+        """Remove spool files older than _STALE_SPOOL_SECONDS from the root."""
+        cutoff = time.time() - _STALE_SPOOL_SECONDS
+        removed = 0
+        try:
+            for path in self._root.glob(f"{SPOOL_PREFIX}*"):
+                try:
+                    if path.stat().st_mtime < cutoff:
+                        path.unlink()
+                        removed += 1
+                except FileNotFoundError:
+                    continue
+        except OSError as exc:
+            logger.warning("Blob cache spool sweep failed: %s", exc)
+        if removed:
+            logger.info("Removed %d stale spool files from the blob cache.", removed)
+
+    def _evict(self, *, keep: Path) -> None:
+        self.sweep_stale_spools()
+        with self._lock:
+            blobs: list[tuple[float, int, Path]] = []
+            for path in self._root.glob("??/*"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                blobs.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in blobs)
+            metrics.set_gauge("blob_cache_bytes", total)
+            if total <= self._max_bytes:
+                return
+            for _, size, path in sorted(blobs, key=lambda blob: blob[0]):
+                if total <= self._max_bytes:
+                    break
+                if path == keep:
+                    continue
+                path.unlink(missing_ok=True)
+                total -= size
+                metrics.inc_counter("blob_cache_evictions")
+            metrics.set_gauge("blob_cache_bytes", total)
+
+
+_cache: BlobCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_blob_cache() -> BlobCache | None:
+    """Return the process-wide cache, or None when BLOB_CACHE_DIR is unset.
+
+    Also None when the directory cannot be created: the cache is optional,
+    so jobs then run without it (creation is retried on the next call).
+    """
+    global _cache
+    if not (settings.blob_cache_dir or "").strip():
+        return None
+    with _cache_lock:
+        if _cache is None:
+            root = Path(settings.blob_cache_dir).expanduser()
+            try:
+                root.mkdir(parents=True, exist_ok=True)
+            except OSError as exc:
+                logger.warning("Blob cache disabled: cannot create %s: %s", root, exc)
+                return None
+            _cache = BlobCache(root=root, max_bytes=settings.blob_cache_max_bytes)
+            _cache.sweep_stale_spools()
+        return _cache
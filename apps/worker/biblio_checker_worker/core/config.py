@@ -18,11 +18,63 @@ class Settings(BaseSettings):
     supabase_url: str = ""
     supabase_service_role_key: str = ""
     supabase_table: str = "analysis_jobs"
+    # Per-process HTTP pool shared by every job thread's Supabase calls.
+    supabase_http_max_connections: int = Field(default=20, ge=1)
+    supabase_http_max_keepalive_connections: int = Field(default=10, ge=0)
+    supabase_http_keepalive_expiry_seconds: float = Field(default=30, ge=0)
+    supabase_http_timeout_seconds: float = Field(default=30, gt=0)
+    supabase_http2: bool = True
+    # Optional direct (session-mode) Postgres DSN used to LISTEN for new jobs.
+    database_url: str = ""
 
     poll_interval_seconds: int = 5
+    # Ceiling for the idle backoff; the interval resets to 0 once jobs appear.
+    poll_max_interval_seconds: int = Field(default=60, ge=1)
+    # On SIGTERM, how long in-flight jobs may run before they are requeued.
+    shutdown_grace_seconds: float = Field(default=25, ge=0)
+    # Worker processes forked by the supervisor (--processes overrides).
+    worker_processes: int = Field(default=1, ge=1, le=64)
+    # Seconds the supervisor waits for children to exit after SIGTERM.
+    supervisor_shutdown_timeout_seconds: float = Field(default=60, gt=0)
+    # Number of jobs processed concurrently by one worker process.
+    max_inflight_jobs: int = Field(default=1, ge=1, le=64)
 
-    job_lease_seconds: int = Field(default=300, ge=1, le=3600)
+    # Leases are renewed by a heartbeat while a job runs, so they can be short:
+    # a crashed worker's job becomes reclaimable within one lease.
+    job_lease_seconds: int = Field(default=30, ge=1, le=3600)
+    # Heartbeat period; defaults to a third of the lease when unset.
+    job_heartbeat_seconds: float | None = Field(default=None, gt=0)
     job_token_bytes: int = 32
 
+    # Wall-clock budget of one attempt, counted from the claim, and the budget
+    # of each stage within it.  Overruns fail the attempt with a transient
+    # StageError (job_deadline_exceeded / stage_timeout).
+    job_deadline_seconds: float = Field(default=900, gt=0)
+    extract_timeout_seconds: float = Field(default=120, gt=0)
+    langgraph_timeout_seconds: float = Field(default=600, gt=0)
+    persist_timeout_seconds: float = Field(default=30, gt=0)
+
+    # Requeued jobs become claimable again after an exponential backoff with
+    # jitter: base * 2^(attempt-1), capped at the max (which also caps a
+    # stage's suggested retry-after).  The requeue_analysis_job RPC rejects
+    # delays over a day, so the max cannot exceed it.
+    retry_backoff_base_seconds: float = Field(default=5, ge=0)
+    retry_backoff_max_seconds: float = Field(default=300, ge=0, le=86400)
+
+    # Version of the analysis pipeline; must match the backend's.  Checkpoints
+    # saved by another version are ignored, so bump it when outputs change.
+    pipeline_version: str = "1"
+
+    # Disk cache of verified source documents keyed by sha256; empty disables.
+    blob_cache_dir: str = ""
+    # Byte budget for the cache; least recently used blobs are evicted first.
+    blob_cache_max_bytes: int = Field(default=1024 * 1024 * 1024, ge=0)
+
+    @property
+    def job_heartbeat_interval_seconds(self) -> float:
+        if self.job_heartbeat_seconds is not None:
+            return self.job_heartbeat_seconds
+        return self.job_lease_seconds / 3
+
 
 settings = Settings()
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import threading
+
+_lock = threading.Lock()
+_gauges: dict[str, float] = {}
+_counters: dict[str, float] = {}
+
+
+def set_gauge(name: str, value: float) -> None:
+    """Record the current value of a point-in-time measurement."""
+    with _lock:
+        _gauges[name] = float(value)
+
+
+def inc_counter(name: str, amount: float = 1.0) -> None:
+    """Add ``amount`` to a monotonically increasing counter."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0.0) + float(amount)
+
+
+def snapshot() -> dict[str, float]:
+    """Return a copy of every gauge and counter recorded in this process."""
+    with _lock:
+        return {**_counters, **_gauges}
@@ -17,11 +17,23 @@ class StageError(Exception):
 
     When ``transient`` is True the error is retryable and the job may be
     re-queued.  When False the job should fail permanently.
+
+    ``retry_after`` optionally suggests how many seconds to wait before the
+    retry (e.g. from an upstream Retry-After header); the requeue delay is
+    never shorter than it.
     """
 
     code: str
     detail: str | None = None
     transient: bool = True
+    retry_after: float | None = None
+
+
+@dataclass(frozen=True)
+class JobCancelledError(Exception):
+    """Raised when the client cancelled the job; it ends with status cancelled."""
+
+    detail: str | None = None
 
 
 @dataclass(frozen=True)
@@ -21,6 +21,7 @@ class AnalysisJob:
     job_token_expires_at: str | None = None
     created_at: str | None = None
     updated_at: str | None = None
+    cancel_requested: bool = False
 
     # The set of field names accepted by from_row(); extra dict keys are ignored.
     _FIELDS: ClassVar[frozenset[str]] = frozenset(
@@ -38,17 +39,19 @@ class AnalysisJob:
             "job_token_expires_at",
             "created_at",
             "updated_at",
+            "cancel_requested",
         }
     )
 
     @classmethod
-    def from_row(cls, row: dict) -> "AnalysisJob":
+    def from_row(cls, row: dict) -> AnalysisJob:
         """Construct an AnalysisJob from a raw Supabase response dict.
 
         Extra keys not present in the model are silently ignored.  Missing
         optional keys (job_token, job_token_expires_at, created_at, updated_at)
-        fall back to None.  Missing required keys raise KeyError so that the
-        calling repository layer can surface the error.
+        fall back to None (cancel_requested to False).  Missing required keys
+        raise KeyError so that the calling repository layer can surface the
+        error.
         """
         filtered = {k: v for k, v in row.items() if k in cls._FIELDS}
         return cls(
@@ -65,6 +68,7 @@ class AnalysisJob:
             job_token_expires_at=filtered.get("job_token_expires_at"),
             created_at=filtered.get("created_at"),
             updated_at=filtered.get("updated_at"),
+            cancel_requested=bool(filtered.get("cancel_requested") or False),
         )
 
     def __repr__(self) -> str:
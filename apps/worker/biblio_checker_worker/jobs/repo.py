@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from collections.abc import Callable
+from datetime import UTC, datetime
 
 from postgrest.exceptions import APIError
 from supabase import Client
@@ -16,7 +17,7 @@ _ERROR_DETAIL_MAX_LEN = 200
 
 def _now_iso() -> str:
     """Return the current UTC time as an ISO 8601 string."""
-    return datetime.now(timezone.utc).isoformat()
+    return datetime.now(UTC).isoformat()
 
 
 def _sanitize_detail(detail: str | None) -> str | None:
@@ -26,26 +27,34 @@ def _sanitize_detail(detail: str | None) -> str | None:
     return detail[:_ERROR_DETAIL_MAX_LEN]
 
 
-def claim_one_job(
+def claim_jobs(
     supabase: Client,
     *,
-    token: str,
+    token_factory: Callable[[], str],
     lease_seconds: int,
-) -> AnalysisJob | None:
-    """Attempt to atomically claim one queued job via the claim_analysis_job RPC.
+    limit: int,
+) -> list[AnalysisJob]:
+    """Atomically claim up to ``limit`` queued jobs via the claim_analysis_jobs RPC.
 
-    Returns an AnalysisJob if a job was claimed, or None when the queue is empty.
-    Raises JobRepoError on any DB or client error.
+    ``token_factory`` is called once per slot; every claimed job is leased
+    with its own token.  Returns the claimed jobs in FIFO order (an empty list
+    when the queue is empty).  Raises JobRepoError on any DB or client error.
     """
+    if limit < 1:
+        return []
+    tokens = [token_factory() for _ in range(limit)]
     try:
         resp = supabase.rpc(
-            "claim_analysis_job",
-            {"p_token": token, "p_lease_secs": lease_seconds},
+            "claim_analysis_jobs",
+            {"p_tokens": tokens, "p_lease_secs": lease_seconds},
         ).execute()
         data = getattr(resp, "data", None)
-        if not isinstance(data, list) or not data:
-            return None
-        return AnalysisJob.from_row(data[0])
+        if not isinstance(data, list):
+            return []
+        jobs = [AnalysisJob.from_row(row) for row in data]
+        # UPDATE ... RETURNING gives no ordering guarantee; restore FIFO.
+        jobs.sort(key=lambda job: job.created_at or "")
+        return jobs
     except JobRepoError:
         raise
     except APIError as exc:
@@ -57,6 +66,49 @@ def claim_one_job(
         raise JobRepoError(code="claim_failed", detail=str(exc) or None) from exc
 
 
+def renew_lease(
+    supabase: Client,
+    *,
+    job_id: str,
+    token: str,
+    lease_seconds: int,
+) -> bool:
+    """Extend the lease of a running job by ``lease_seconds`` from now.
+
+    Uses the renew_analysis_job_lease RPC so the expiry is computed with the
+    database clock.  The token guard makes renewal a no-op for a worker that
+    no longer holds the lease.
+
+    Returns the job's cancel_requested flag, so the heartbeat doubles as the
+    cancellation check.
+
+    Raises JobRepoError(code="lease_lost") when no running row matches the
+    token, or JobRepoError(code="lease_renew_failed") on any DB error.
+    """
+    try:
+        resp = supabase.rpc(
+            "renew_analysis_job_lease",
+            {"p_job_id": job_id, "p_token": token, "p_lease_secs": lease_seconds},
+        ).execute()
+        data = getattr(resp, "data", None)
+        if not data:
+            raise JobRepoError(
+                code="lease_lost",
+                detail="No matching row — lease expired or token mismatch",
+            )
+        row = data[0] if isinstance(data, list) else data
+        return isinstance(row, dict) and row.get("cancel_requested") is True
+    except JobRepoError:
+        raise
+    except APIError as exc:
+        code = str(exc.code or "").strip()
+        if code in ("401", "403"):
+            raise JobRepoError(code="db_unauthorized", detail=str(exc)) from exc
+        raise JobRepoError(code="lease_renew_failed", detail=str(exc) or None) from exc
+    except Exception as exc:  # noqa: BLE001
+        raise JobRepoError(code="lease_renew_failed", detail=str(exc) or None) from exc
+
+
 def update_stage(
     supabase: Client,
     *,
@@ -93,13 +145,9 @@ def update_stage(
         code = str(exc.code or "").strip()
         if code in ("401", "403"):
             raise JobRepoError(code="db_unauthorized", detail=str(exc)) from exc
-        raise JobRepoError(
-            code="stage_update_failed", detail=str(exc) or None
-        ) from exc
+        raise JobRepoError(code="stage_update_failed", detail=str(exc) or None) from exc
     except Exception as exc:  # noqa: BLE001
-        raise JobRepoError(
-            code="stage_update_failed", detail=str(exc) or None
-        ) from exc
+        raise JobRepoError(code="stage_update_failed", detail=str(exc) or None) from exc
 
 
 def mark_succeeded(
@@ -154,6 +202,56 @@ def mark_succeeded(
         ) from exc
 
 
+def mark_cancelled(
+    supabase: Client,
+    *,
+    job_id: str,
+    token: str,
+) -> None:
+    """Finish a job the client cancelled (status=cancelled) and release its lease.
+
+    The stage is preserved, like a permanent failure, to show how far the
+    job got.  Raises JobRepoError when zero rows are updated or on any DB
+    error.
+    """
+    now = _now_iso()
+    try:
+        resp = (
+            supabase.table("analysis_jobs")
+            .update(
+                {
+                    "status": "cancelled",
+                    "job_token": None,
+                    "job_token_expires_at": None,
+                    "updated_at": now,
+                    "completed_at": now,
+                }
+            )
+            .eq("id", job_id)
+            .eq("job_token", token)
+            .execute()
+        )
+        data = getattr(resp, "data", None)
+        if not isinstance(data, list) or not data:
+            raise JobRepoError(
+                code="mark_cancelled_failed",
+                detail="No matching row — possible lease expiry or token mismatch",
+            )
+    except JobRepoError:
+        raise
+    except APIError as exc:
+        code = str(exc.code or "").strip()
+        if code in ("401", "403"):
+            raise JobRepoError(code="db_unauthorized", detail=str(exc)) from exc
+        raise JobRepoError(
+            code="mark_cancelled_failed", detail=str(exc) or None
+        ) from exc
+    except Exception as exc:  # noqa: BLE001
+        raise JobRepoError(
+            code="mark_cancelled_failed", detail=str(exc) or None
+        ) from exc
+
+
 def mark_failed(
     supabase: Client,
     *,
@@ -162,13 +260,24 @@ def mark_failed(
     error_detail: str | None,
     requeue: bool,
     token: str,
+    attempts: int | None = None,
+    retry_delay_seconds: float | None = None,
 ) -> None:
     """Mark a job as failed, optionally re-queuing it for a retry.
 
     When requeue=True the job is reset to (status=queued, stage=created) so
-    that another worker can claim it on the next poll cycle.  The lease token
+    that another worker can claim it on a later poll cycle.  The lease token
     is cleared in both cases.
 
+    A requeue goes through the requeue_analysis_job RPC.  Its
+    ``retry_delay_seconds`` sets visible_at = now() + delay on the database
+    clock, which keeps the claim RPCs from handing the job out again before
+    the delay has elapsed.  Without it the job is claimable immediately.
+
+    When ``attempts`` is given (requeue only) the attempts counter is reset
+    to that value.  Graceful shutdown uses this to hand back an attempt the
+    worker never got to finish, so a job on its last attempt stays claimable.
+
     When requeue=False the stage is preserved to aid post-mortem debugging
     (per Step 01 transition T8).
 
@@ -177,44 +286,122 @@ def mark_failed(
 
     Raises JobRepoError when zero rows are updated or on any DB error.
     """
-    now = _now_iso()
     safe_detail = _sanitize_detail(error_detail)
 
-    if requeue:
-        payload: dict = {
-            "status": "queued",
-            "stage": "created",
-            "error_code": error_code,
-            "error_detail": safe_detail,
-            "job_token": None,
-            "job_token_expires_at": None,
-            "updated_at": now,
-        }
-    else:
-        # Do NOT include "stage" — preserve current stage for debugging.
-        payload = {
-            "status": "failed",
-            "error_code": error_code,
-            "error_detail": safe_detail,
-            "job_token": None,
-            "job_token_expires_at": None,
-            "updated_at": now,
-            "completed_at": now,
-        }
+    try:
+        if requeue:
+            resp = supabase.rpc(
+                "requeue_analysis_job",
+                {
+                    "p_job_id": job_id,
+                    "p_token": token,
+                    "p_error_code": error_code,
+                    "p_error_detail": safe_detail,
+                    "p_retry_delay_secs": max(0.0, retry_delay_seconds or 0.0),
+                    "p_attempts": attempts,
+                },
+            ).execute()
+        else:
+            now = _now_iso()
+            # Do NOT include "stage" — preserve current stage for debugging.
+            resp = (
+                supabase.table("analysis_jobs")
+                .update(
+                    {
+                        "status": "failed",
+                        "error_code": error_code,
+                        "error_detail": safe_detail,
+                        "job_token": None,
+                        "job_token_expires_at": None,
+                        "updated_at": now,
+                        "completed_at": now,
+                    }
+                )
+                .eq("id", job_id)
+                .eq("job_token", token)
+                .execute()
+            )
+        data = getattr(resp, "data", None)
+        if not data:
+            raise JobRepoError(
+                code="mark_failed_failed",
+                detail="No matching row — possible lease expiry or token mismatch",
+            )
+    except JobRepoError:
+        raise
+    except APIError as exc:
+        code = str(exc.code or "").strip()
+        if code in ("401", "403"):
+            raise JobRepoError(code="db_unauthorized", detail=str(exc)) from exc
+        raise JobRepoError(code="mark_failed_failed", detail=str(exc) or None) from exc
+    except Exception as exc:  # noqa: BLE001
+        raise JobRepoError(code="mark_failed_failed", detail=str(exc) or None) from exc
+
 
+def fetch_checkpoints(supabase: Client, *, job_id: str) -> list[dict]:
+    """Return every stored stage checkpoint of a job (possibly stale).
+
+    Each row carries stage, sha256, pipeline_version and payload; callers
+    decide which are still valid.  Raises JobRepoError on any DB error.
+    """
     try:
         resp = (
-            supabase.table("analysis_jobs")
-            .update(payload)
-            .eq("id", job_id)
-            .eq("job_token", token)
+            supabase.table("analysis_job_checkpoints")
+            .select("stage, sha256, pipeline_version, payload")
+            .eq("job_id", job_id)
             .execute()
         )
         data = getattr(resp, "data", None)
-        if not isinstance(data, list) or not data:
+        if not isinstance(data, list):
+            return []
+        return [row for row in data if isinstance(row, dict)]
+    except APIError as exc:
+        code = str(exc.code or "").strip()
+        if code in ("401", "403"):
+            raise JobRepoError(code="db_unauthorized", detail=str(exc)) from exc
+        raise JobRepoError(
+            code="checkpoint_fetch_failed", detail=str(exc) or None
+        ) from exc
+    except Exception as exc:  # noqa: BLE001
+        raise JobRepoError(
+            code="checkpoint_fetch_failed", detail=str(exc) or None
+        ) from exc
+
+
+def save_checkpoint(
+    supabase: Client,
+    *,
+    job_id: str,
+    token: str,
+    stage: str,
+    sha256: str,
+    pipeline_version: str,
+    payload: dict,
+) -> None:
+    """Store (or replace) the output of ``stage`` for a running job.
+
+    Uses the save_analysis_job_checkpoint RPC, which applies the same token
+    guard as update_stage.
+
+    Raises JobRepoError(code="lease_lost") when no running row matches the
+    token, or JobRepoError(code="checkpoint_save_failed") on any DB error.
+    """
+    try:
+        resp = supabase.rpc(
+            "save_analysis_job_checkpoint",
+            {
+                "p_job_id": job_id,
+                "p_token": token,
+                "p_stage": stage,
+                "p_sha256": sha256,
+                "p_pipeline_version": pipeline_version,
+                "p_payload": payload,
+            },
+        ).execute()
+        if not getattr(resp, "data", None):
             raise JobRepoError(
-                code="mark_failed_failed",
-                detail="No matching row — possible lease expiry or token mismatch",
+                code="lease_lost",
+                detail="No matching row — lease expired or token mismatch",
             )
     except JobRepoError:
         raise
@@ -223,9 +410,9 @@ def mark_failed(
         if code in ("401", "403"):
             raise JobRepoError(code="db_unauthorized", detail=str(exc)) from exc
         raise JobRepoError(
-            code="mark_failed_failed", detail=str(exc) or None
+            code="checkpoint_save_failed", detail=str(exc) or None
         ) from exc
     except Exception as exc:  # noqa: BLE001
         raise JobRepoError(
-            code="mark_failed_failed", detail=str(exc) or None
+            code="checkpoint_save_failed", detail=str(exc) or None
         ) from exc
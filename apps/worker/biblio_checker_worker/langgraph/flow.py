@@ -1,17 +1,48 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from biblio_checker_worker.jobs.models import AnalysisJob
 
+if TYPE_CHECKING:
+    from biblio_checker_worker.pipeline.checkpoints import CheckpointStore
+    from biblio_checker_worker.pipeline.deadline import Deadline
+
 logger = logging.getLogger("biblio_checker_worker.langgraph")
 
 
-def start_analysis_flow(*, job: AnalysisJob, file_bytes: bytes) -> dict:
+def start_analysis_flow(
+    *,
+    job: AnalysisJob,
+    file_view: memoryview,
+    file_path: Path | None,
+    checkpoints: CheckpointStore,
+    deadline: Deadline,
+    check_cancelled: Callable[[], None],
+) -> dict:
     """Stub for the LangGraph analysis flow.
 
-    Accepts the claimed job and the raw file bytes produced by the extract
-    stage.  Returns a result dict that the persist stage writes to the
+    Accepts the claimed job and the document produced by the extract stage:
+    a read-only memoryview over its memory-mapped content, and its path for
+    extractors that work on files.  Neither outlives this call — the view is
+    released once the flow returns, so copy anything that must be kept.
+
+    Long-running steps should save their intermediate outputs (extracted
+    text, parsed references, finished lookups) with ``checkpoints.save`` and
+    look for them with ``checkpoints.get`` first, so a retried job only
+    redoes the remaining work.
+
+    ``deadline`` is the stage's time budget: call ``deadline.check()`` between
+    steps, run async graphs with pipeline.deadline.run_async and external
+    tools with run_subprocess, so an overrun cancels or kills the work.
+
+    ``check_cancelled`` raises JobCancelledError once the client has
+    cancelled the job; call it in the reference verification loop (it only
+    reads an in-memory flag) so cancelled analyses stop early.
+    Returns a result dict that the persist stage writes to the
     database.
 
     This is a stub implementation that logs the invocation and returns an
@@ -20,6 +51,6 @@ def start_analysis_flow(*, job: AnalysisJob, file_bytes: bytes) -> dict:
     logger.info(
         "LangGraph flow stub invoked (job_id=%s, file_bytes=%d).",
         job.id,
-        len(file_bytes),
+        file_view.nbytes,
     )
     return {}
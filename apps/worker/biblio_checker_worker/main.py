@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import argparse
 import logging
 import time
 
 from biblio_checker_worker.core.config import settings
 from biblio_checker_worker.polling.runner import run_forever
+from biblio_checker_worker.supervisor.prefork import PreforkSupervisor
 
 
 def _configure_logging() -> None:
@@ -16,17 +18,48 @@ def _configure_logging() -> None:
     )
 
 
-def main() -> None:
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="biblio_checker_worker")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=settings.worker_processes,
+        help=(
+            "Number of worker processes to fork (default: WORKER_PROCESSES or 1). "
+            "With more than one, a supervisor restarts crashed children."
+        ),
+    )
+    args = parser.parse_args(argv)
+    if args.processes < 1:
+        parser.error("--processes must be >= 1")
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
     _configure_logging()
     logger = logging.getLogger("biblio_checker_worker")
 
     logger.info(
-        "Worker starting (env=%s, table=%s, poll_interval=%ss)",
+        "Worker starting (env=%s, table=%s, poll_interval=%ss, max_inflight=%d, "
+        "processes=%d)",
         settings.environment,
         settings.supabase_table,
         settings.poll_interval_seconds,
+        settings.max_inflight_jobs,
+        args.processes,
     )
 
+    if args.processes > 1:
+        PreforkSupervisor(
+            processes=args.processes,
+            target=run_forever,
+            shutdown_timeout_seconds=settings.supervisor_shutdown_timeout_seconds,
+        ).run()
+        return
+
+    # SIGTERM triggers a graceful drain inside run_forever, which then returns
+    # (or exits the process if released jobs are still running).
     try:
         run_forever()
     except KeyboardInterrupt:
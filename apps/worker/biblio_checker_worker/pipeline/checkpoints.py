@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import logging
+
+from supabase import Client
+
+from biblio_checker_worker.jobs import repo
+from biblio_checker_worker.jobs.errors import JobRepoError
+
+logger = logging.getLogger("biblio_checker_worker.pipeline")
+
+
+class CheckpointStore:
+    """Persisted stage outputs of one job, so a requeued attempt can resume.
+
+    Checkpoints are keyed by job id and name, and are only valid for the
+    content hash and pipeline version they were produced from: anything
+    else loaded from the database is ignored.  load() reads them once at the
+    start of an attempt; save() writes through with the lease token guard.
+
+    Checkpoints are an optimization, so failures to read or write them are
+    logged and otherwise ignored — the work is simply redone.  A lost lease
+    surfaces through the heartbeat, as for any other write.
+    """
+
+    def __init__(
+        self,
+        *,
+        supabase: Client,
+        job_id: str,
+        token: str,
+        sha256: str,
+        pipeline_version: str,
+    ) -> None:
+        self._supabase = supabase
+        self._job_id = job_id
+        self._token = token
+        self._sha256 = sha256.lower()
+        self._pipeline_version = pipeline_version
+        self._payloads: dict[str, dict] = {}
+
+    def load(self) -> None:
+        try:
+            rows = repo.fetch_checkpoints(self._supabase, job_id=self._job_id)
+        except JobRepoError as exc:
+            logger.warning(
+                "Job id=%s checkpoints unavailable (code=%s); starting over",
+                self._job_id,
+                exc.code,
+            )
+            return
+        for row in rows:
+            payload = row.get("payload")
+            if (
+                str(row.get("sha256") or "").lower() == self._sha256
+                and row.get("pipeline_version") == self._pipeline_version
+                and isinstance(payload, dict)
+            ):
+                self._payloads[str(row.get("stage"))] = payload
+
+    def get(self, name: str) -> dict | None:
+        """Return the valid checkpoint stored under ``name``, if any."""
+        return self._payloads.get(name)
+
+    def save(self, name: str, payload: dict) -> None:
+        """Store ``payload`` under ``name`` for later attempts of this job."""
+        self._payloads[name] = payload
+        try:
+            repo.save_checkpoint(
+                self._supabase,
+                job_id=self._job_id,
+                token=self._token,
+                stage=name,
+                sha256=self._sha256,
+                pipeline_version=self._pipeline_version,
+                payload=payload,
+            )
+        except JobRepoError as exc:
+            logger.warning(
+                "Job id=%s could not save checkpoint %s (code=%s)",
+                self._job_id,
+                name,
+                exc.code,
+            )
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass, field
+from pathlib import Path
 
+from biblio_checker_worker.jobs.errors import JobCancelledError
 from biblio_checker_worker.jobs.models import AnalysisJob
+from biblio_checker_worker.pipeline.checkpoints import CheckpointStore
+from biblio_checker_worker.pipeline.deadline import Deadline
+from biblio_checker_worker.pipeline.document import SpooledDocument
+from biblio_checker_worker.pipeline.reporter import StageReporter
 
 
 @dataclass
@@ -10,12 +17,46 @@ class JobContext:
     """Mutable context object threaded through each pipeline stage.
 
     Stages read from and write to this object to pass intermediate results
-    (downloaded bytes, extracted text, LangGraph output) to downstream stages
-    without coupling the stage functions to each other directly.
+    (the downloaded document, extracted text, LangGraph output) to downstream
+    stages without coupling the stage functions to each other directly.
+
+    Stage transitions go through ``reporter`` so they do not block the stage.
+    Stage outputs worth keeping across retries go to ``checkpoints``.
+    ``deadline`` is the current stage's deadline (its timeout, bounded by the
+    job deadline); the runner replaces it before each stage.
+    ``cancel_requested`` is set by the lease heartbeat when the client cancels
+    the job; long loops call raise_if_cancelled() between iterations.
+
+    The document stays on disk: ``file_view`` is a read-only memoryview over
+    it and ``file_path`` its location.  The last stage that reads it calls
+    release_document(); the runner releases it too, should a stage fail first.
     """
 
     job: AnalysisJob
     token: str
-    file_bytes: bytes = b""
+    reporter: StageReporter
+    checkpoints: CheckpointStore
+    deadline: Deadline
+    document: SpooledDocument | None = None
     extracted_text: str = ""
     result_json: dict = field(default_factory=dict)
+    cancel_requested: threading.Event = field(default_factory=threading.Event)
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancel_requested.is_set():
+            raise JobCancelledError(detail="Cancelled by the client.")
+
+    @property
+    def file_view(self) -> memoryview:
+        if self.document is None:
+            raise ValueError("no document is attached to this job")
+        return self.document.view
+
+    @property
+    def file_path(self) -> Path | None:
+        return self.document.path if self.document is not None else None
+
+    def release_document(self) -> None:
+        document, self.document = self.document, None
+        if document is not None:
+            document.close()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import time
+from collections.abc import Awaitable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from biblio_checker_worker.jobs.errors import StageError
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """A point on the monotonic clock by which some work must be finished.
+
+    The job deadline starts when the job is claimed; each stage runs under
+    ``job_deadline.within(stage_timeout)``, whichever expires first, and the
+    error raised on expiry names the limit that was hit.
+
+    Threads cannot be interrupted, so enforcement is cooperative: stages call
+    check() between units of work and bound blocking calls by remaining().
+    Async work goes through run_async (expiry cancels the coroutine) and
+    subprocess work through run_subprocess (expiry kills the process).
+    """
+
+    expires_at: float
+    code: str = "job_deadline_exceeded"
+    detail: str | None = None
+
+    @classmethod
+    def after(
+        cls,
+        seconds: float,
+        *,
+        code: str = "job_deadline_exceeded",
+        detail: str | None = None,
+    ) -> Deadline:
+        return cls(time.monotonic() + seconds, code=code, detail=detail)
+
+    def within(
+        self, seconds: float, *, code: str, detail: str | None = None
+    ) -> Deadline:
+        """Return a deadline ``seconds`` from now, or this one if it is sooner."""
+        candidate = Deadline.after(seconds, code=code, detail=detail)
+        return self if self.expires_at <= candidate.expires_at else candidate
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def overdue(self) -> float:
+        """Seconds elapsed since expiry (0 while the deadline is ahead)."""
+        return max(0.0, time.monotonic() - self.expires_at)
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def error(self) -> StageError:
+        return StageError(code=self.code, detail=self.detail, transient=True)
+
+    def check(self) -> None:
+        """Raise the deadline's StageError once it has expired."""
+        if self.expired():
+            raise self.error()
+
+
+def run_async[T](awaitable: Awaitable[T], *, deadline: Deadline) -> T:
+    """Run ``awaitable`` on a fresh event loop, cancelling it at the deadline.
+
+    On expiry the coroutine gets CancelledError at its current await (so its
+    finally blocks and async context managers clean up) and the deadline's
+    StageError is raised.
+    """
+
+    async def _bounded() -> T:
+        return await asyncio.wait_for(awaitable, timeout=deadline.remaining())
+
+    try:
+        return asyncio.run(_bounded())
+    except TimeoutError as exc:
+        raise deadline.error() from exc
+
+
+def run_subprocess(
+    args: Sequence[str], *, deadline: Deadline, **kwargs: Any
+) -> subprocess.CompletedProcess:
+    """Run a command like subprocess.run, killing it at the deadline."""
+    try:
+        return subprocess.run(args, timeout=deadline.remaining(), **kwargs)
+    except subprocess.TimeoutExpired as exc:
+        raise deadline.error() from exc
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import logging
+import mmap
+from pathlib import Path
+
+logger = logging.getLogger("biblio_checker_worker.pipeline")
+
+
+class SpooledDocument:
+    """Read-only, memory-mapped view of a job's source document on disk.
+
+    The document lives in a file (a download spool or a blob cache entry) and
+    is exposed as a memoryview over a read-only mmap, so consumers read it
+    without copying and resident memory is made of reclaimable page cache
+    rather than per-job heap.
+
+    ``owned`` documents are spool files that belong to the job: close()
+    unlinks them.  Cache entries are not owned and stay on disk.
+    """
+
+    def __init__(self, path: Path, *, owned: bool) -> None:
+        self._path = path
+        self._owned = owned
+        self._file = open(path, "rb")
+        try:
+            self._size = self._file.seek(0, 2)
+            # An empty file cannot be mapped; expose an empty view instead.
+            self._mmap = (
+                mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                if self._size
+                else None
+            )
+        except BaseException:
+            self._file.close()
+            raise
+        self._view = memoryview(self._mmap if self._mmap is not None else b"")
+        self._closed = False
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def view(self) -> memoryview:
+        if self._closed:
+            raise ValueError("document has been released")
+        return self._view
+
+    def close(self) -> None:
+        """Unmap the document and remove the spool file if it is owned."""
+        if self._closed:
+            return
+        self._closed = True
+        self._view.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A consumer still holds a slice of the view; the mapping is
+                # freed with it.  The file can still be unlinked below.
+                logger.warning(
+                    "Document %s released while still referenced", self._path
+                )
+        self._file.close()
+        if self._owned:
+            self._path.unlink(missing_ok=True)
+
+    def __enter__(self) -> SpooledDocument:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
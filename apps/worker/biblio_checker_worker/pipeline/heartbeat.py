@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import logging
+import threading
+
+from supabase import Client
+
+from biblio_checker_worker.core import metrics
+from biblio_checker_worker.jobs import repo
+from biblio_checker_worker.jobs.errors import JobRepoError
+from biblio_checker_worker.pipeline.deadline import Deadline
+
+logger = logging.getLogger("biblio_checker_worker.pipeline.heartbeat")
+
+
+class LeaseHeartbeat:
+    """Renew a job's lease in the background while the pipeline runs.
+
+    Used as a context manager around the stage loop.  Every
+    ``interval_seconds`` the lease is pushed ``lease_seconds`` into the
+    future.  A transient renewal error is logged and retried on the next
+    tick (the interval is a fraction of the lease, so several ticks fit
+    before expiry).  When the token guard matches no row the lease has been
+    lost to another worker: ``lost`` is set and renewal stops.
+
+    With a ``deadline``, renewal also stops once the job has overrun it by
+    a full lease: the pipeline is stuck in a stage that does not check its
+    deadline, so the lease is left to expire and the job can be reclaimed
+    (``lost`` is set, as the job will no longer be ours).
+
+    Each renewal also reports whether the client asked to cancel the job;
+    ``cancel_requested`` is set once it has, and renewal carries on so the
+    runner keeps the lease until it records the cancellation.
+    """
+
+    def __init__(
+        self,
+        *,
+        supabase: Client,
+        job_id: str,
+        token: str,
+        lease_seconds: int,
+        interval_seconds: float,
+        deadline: Deadline | None = None,
+    ) -> None:
+        self._supabase = supabase
+        self._job_id = job_id
+        self._token = token
+        self._lease_seconds = lease_seconds
+        self._interval = max(0.1, float(interval_seconds))
+        self._deadline = deadline
+        self._stop = threading.Event()
+        self.lost = threading.Event()
+        self.cancel_requested = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"lease-heartbeat-{job_id}", daemon=True
+        )
+
+    def __enter__(self) -> LeaseHeartbeat:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            if (
+                self._deadline is not None
+                and self._deadline.overdue() > self._lease_seconds
+            ):
+                logger.error(
+                    "Job id=%s is stuck past its deadline; releasing its lease",
+                    self._job_id,
+                )
+                metrics.inc_counter("jobs_stuck_past_deadline")
+                self.lost.set()
+                return
+            try:
+                cancel_requested = repo.renew_lease(
+                    self._supabase,
+                    job_id=self._job_id,
+                    token=self._token,
+                    lease_seconds=self._lease_seconds,
+                )
+            except JobRepoError as exc:
+                if exc.code == "lease_lost":
+                    logger.error("Job id=%s lost its lease", self._job_id)
+                    self.lost.set()
+                    return
+                logger.warning(
+                    "Job id=%s lease renewal failed (code=%s); retrying",
+                    self._job_id,
+                    exc.code,
+                )
+                continue
+            if cancel_requested is True and not self.cancel_requested.is_set():
+                logger.info("Job id=%s cancellation requested", self._job_id)
+                self.cancel_requested.set()
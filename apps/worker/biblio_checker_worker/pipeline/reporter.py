@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import logging
+import threading
+
+from supabase import Client
+
+from biblio_checker_worker.jobs import repo
+from biblio_checker_worker.jobs.enums import JobStage
+from biblio_checker_worker.jobs.errors import JobRepoError
+
+logger = logging.getLogger("biblio_checker_worker.pipeline.reporter")
+
+
+class StageReporter:
+    """Write-behind publisher for a job's stage transitions.
+
+    Stages call report() and continue immediately; a background thread
+    writes the stage with repo.update_stage (token-guarded).  Transitions
+    reported while a write is in flight collapse into the latest one, so a
+    burst of stage changes costs a single round trip.
+
+    The first failed write is kept in ``error`` and the reporter stops.  The
+    pipeline runner calls raise_if_failed() at every stage boundary, so a lost
+    lease or DB error surfaces to it exactly as a synchronous update would.
+
+    Final success/failure writes are not reported here: they stay synchronous
+    in the runner/persist stage, after close() has stopped this reporter.
+    """
+
+    def __init__(self, *, supabase: Client, job_id: str, token: str) -> None:
+        self._supabase = supabase
+        self._job_id = job_id
+        self._token = token
+        self._cond = threading.Condition()
+        self._pending: JobStage | None = None
+        self._closing = False
+        self._flush_on_close = True
+        self.error: JobRepoError | None = None
+        self._thread = threading.Thread(
+            target=self._run, name=f"stage-reporter-{job_id}", daemon=True
+        )
+
+    def __enter__(self) -> StageReporter:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close(flush=True)
+
+    def report(self, stage: JobStage) -> None:
+        """Queue ``stage`` for writing; never blocks on the database."""
+        with self._cond:
+            if self._closing:
+                return
+            self._pending = stage
+            self._cond.notify()
+
+    def close(self, *, flush: bool) -> None:
+        """Stop the reporter and wait for any in-flight write to finish.
+
+        With ``flush=True`` a queued transition is written first (useful on
+        failure, where the stage is kept for post-mortem debugging).  With
+        ``flush=False`` it is dropped because a final write supersedes it.
+        Safe to call more than once.
+        """
+        with self._cond:
+            if not self._closing:
+                self._closing = True
+                self._flush_on_close = flush
+            self._cond.notify()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def raise_if_failed(self) -> None:
+        if self.error is not None:
+            raise self.error
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closing:
+                    self._cond.wait()
+                if self._closing and not (self._flush_on_close and self._pending):
+                    return
+                stage, self._pending = self._pending, None
+
+            try:
+                repo.update_stage(
+                    self._supabase,
+                    job_id=self._job_id,
+                    stage=stage,
+                    token=self._token,
+                )
+            except JobRepoError as exc:
+                logger.warning(
+                    "Job id=%s stage update to %s failed (code=%s)",
+                    self._job_id,
+                    stage.value,
+                    exc.code,
+                )
+                self.error = exc
+                return
@@ -1,31 +1,101 @@
 from __future__ import annotations
 
 import logging
+import random
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from concurrent.futures import wait as wait_futures
 
 from supabase import Client
 
+from biblio_checker_worker.core.config import settings
 from biblio_checker_worker.jobs import repo
-from biblio_checker_worker.jobs.errors import JobRepoError, StageError, TerminalJobError
+from biblio_checker_worker.jobs.errors import (
+    JobCancelledError,
+    JobRepoError,
+    StageError,
+    TerminalJobError,
+)
 from biblio_checker_worker.jobs.models import AnalysisJob
+from biblio_checker_worker.pipeline.checkpoints import CheckpointStore
 from biblio_checker_worker.pipeline.context import JobContext
+from biblio_checker_worker.pipeline.deadline import Deadline
+from biblio_checker_worker.pipeline.heartbeat import LeaseHeartbeat
+from biblio_checker_worker.pipeline.reporter import StageReporter
 from biblio_checker_worker.pipeline.stages.extract import extract_stage
 from biblio_checker_worker.pipeline.stages.persist import persist_stage
-from biblio_checker_worker.pipeline.stages.run_langgraph import run_langgraph_stage
+from biblio_checker_worker.pipeline.stages.run_langgraph import (
+    restore_langgraph_checkpoint,
+    run_langgraph_stage,
+)
 
 logger = logging.getLogger("biblio_checker_worker.pipeline")
 
 # Ordered list of pipeline stage callables.  Each must accept (*, supabase, ctx).
 _STAGES = [extract_stage, run_langgraph_stage, persist_stage]
 
+# Checkpointed stages mapped to the hook that restores their output into the
+# context (returning False when no valid checkpoint exists).  An attempt
+# resumes after the last stage that restores.
+_RESTORERS = {run_langgraph_stage: restore_langgraph_checkpoint}
 
-def process_job(supabase: Client, job: AnalysisJob) -> None:
+# How often a waiting follower re-checks its lease and cancellation.
+_FOLLOWER_POLL_SECONDS = 1.0
+
+
+def start_job_deadline() -> Deadline:
+    """Start the deadline of a freshly claimed job (job_deadline_seconds)."""
+    seconds = settings.job_deadline_seconds
+    return Deadline.after(
+        seconds,
+        code="job_deadline_exceeded",
+        detail=f"Job exceeded its {seconds:g}s deadline",
+    )
+
+
+def process_job(
+    supabase: Client,
+    job: AnalysisJob,
+    *,
+    cancel: threading.Event | None = None,
+    deadline: Deadline | None = None,
+) -> dict | None:
     """Execute the full analysis pipeline for a single claimed job.
 
     Iterates through the ordered stage list, passing a shared JobContext.
+    A LeaseHeartbeat renews the job's lease for as long as the stages run;
+    if the lease is lost the job is abandoned at the next stage boundary.
+    Intermediate stage transitions are written behind by a StageReporter;
+    only the final success/failure write is synchronous.
+    Stage outputs are checkpointed, so a retried attempt skips every stage
+    up to the last one whose checkpoint is still valid.
     All error handling and final repo state transitions are consolidated here
     so individual stages only need to raise the appropriate error type.
 
+    ``cancel`` is set by the polling loop when it has already released the
+    job (graceful shutdown).  The runner then stops at the next stage
+    boundary and skips the failure write, since the job is no longer ours.
+
+    ``deadline`` bounds the whole attempt (the polling loop starts it at
+    claim time; it defaults to job_deadline_seconds from now).  Each stage
+    runs under its own timeout within it, exposed as ctx.deadline; an
+    overrun surfaces as a transient StageError (stage_timeout or
+    job_deadline_exceeded).  A stage stuck past the deadline without
+    checking it stops the heartbeat one lease later, so the job is
+    reclaimed elsewhere instead of holding its lease indefinitely.
+
+    A client cancellation (cancel_requested, reported by the heartbeat) is
+    honored at the next stage boundary or ctx.raise_if_cancelled() call: the
+    job ends with status cancelled instead of running on.  A job claimed
+    with the flag already set is finalized without running any stage.
+
+    Returns the persisted result_json when the job succeeded, None otherwise
+    (the polling loop hands it to followers of the same document).
+
     Error handling contract:
+    - JobCancelledError -> mark_cancelled (also replaces the failure write of
+                           any error raised after a cancellation request).
     - TerminalJobError  -> mark_failed(requeue=False) unconditionally.
     - StageError        -> requeue only when transient=True AND attempts remain.
     - Unexpected        -> requeue when attempts remain; error_detail is a
@@ -33,6 +103,7 @@ def process_job(supabase: Client, job: AnalysisJob) -> None:
                            the DB to prevent information disclosure).
     - JobRepoError from mark_failed itself -> log CRITICAL, do not re-raise
                            (the lease will expire and another worker can retry).
+    Requeued jobs are hidden from claims for a backoff delay (_retry_delay).
     """
     logger.info(
         "Processing job id=%s attempt=%d/%d",
@@ -47,12 +118,67 @@ def process_job(supabase: Client, job: AnalysisJob) -> None:
             detail="Job was dispatched without a token.",
         )
     token = job.job_token
+    if deadline is None:
+        deadline = start_job_deadline()
+    if job.cancel_requested:
+        # Cancelled while waiting for a retry: nothing left to run.
+        _safe_mark_cancelled(supabase=supabase, job=job, token=token, cancel=cancel)
+        return None
 
-    ctx = JobContext(job=job, token=token)
+    reporter = StageReporter(supabase=supabase, job_id=job.id, token=token)
+    checkpoints = CheckpointStore(
+        supabase=supabase,
+        job_id=job.id,
+        token=token,
+        sha256=job.sha256,
+        pipeline_version=settings.pipeline_version,
+    )
+    heartbeat = LeaseHeartbeat(
+        supabase=supabase,
+        job_id=job.id,
+        token=token,
+        lease_seconds=settings.job_lease_seconds,
+        interval_seconds=settings.job_heartbeat_interval_seconds,
+        deadline=deadline,
+    )
+    ctx = JobContext(
+        job=job,
+        token=token,
+        reporter=reporter,
+        checkpoints=checkpoints,
+        deadline=deadline,
+        cancel_requested=heartbeat.cancel_requested,
+    )
 
     try:
-        for stage in _STAGES:
-            stage(supabase=supabase, ctx=ctx)
+        with heartbeat, reporter:
+            checkpoints.load()
+            start = _resume_index(ctx)
+            if start:
+                logger.info(
+                    "Job id=%s resuming at %s from checkpoints",
+                    job.id,
+                    _STAGES[start].__name__,
+                )
+            for stage in _STAGES[start:]:
+                if heartbeat.lost.is_set():
+                    # Another worker may own the job now; any write would
+                    # fail the token guard, so abandon quietly.
+                    logger.error("Job id=%s abandoned after losing its lease", job.id)
+                    return
+                if cancel is not None and cancel.is_set():
+                    logger.warning("Job id=%s released by the worker; stopping", job.id)
+                    return
+                # Surface a failed write-behind stage update (e.g. lost lease)
+                # exactly as a synchronous update_stage failure would.
+                reporter.raise_if_failed()
+                ctx.raise_if_cancelled()
+                deadline.check()
+                ctx.deadline = _stage_deadline(stage, deadline)
+                stage(supabase=supabase, ctx=ctx)
+    except JobCancelledError:
+        _safe_mark_cancelled(supabase=supabase, job=job, token=token, cancel=cancel)
+        return
     except TerminalJobError as exc:
         _safe_mark_failed(
             supabase=supabase,
@@ -61,9 +187,14 @@ def process_job(supabase: Client, job: AnalysisJob) -> None:
             error_code=exc.code,
             error_detail=exc.detail,
             requeue=False,
+            cancel=cancel,
         )
         return
     except StageError as exc:
+        if ctx.cancel_requested.is_set():
+            # Nobody is waiting for a retry of this job any more.
+            _safe_mark_cancelled(supabase=supabase, job=job, token=token, cancel=cancel)
+            return
         requeue = exc.transient and job.attempts < job.max_attempts
         _safe_mark_failed(
             supabase=supabase,
@@ -72,6 +203,8 @@ def process_job(supabase: Client, job: AnalysisJob) -> None:
             error_code=exc.code,
             error_detail=exc.detail,
             requeue=requeue,
+            cancel=cancel,
+            retry_after=exc.retry_after,
         )
         return
     except Exception:
@@ -82,6 +215,9 @@ def process_job(supabase: Client, job: AnalysisJob) -> None:
             job.id,
             exc_info=True,
         )
+        if ctx.cancel_requested.is_set():
+            _safe_mark_cancelled(supabase=supabase, job=job, token=token, cancel=cancel)
+            return
         requeue = job.attempts < job.max_attempts
         _safe_mark_failed(
             supabase=supabase,
@@ -90,10 +226,157 @@ def process_job(supabase: Client, job: AnalysisJob) -> None:
             error_code="unexpected_worker_error",
             error_detail="An unexpected internal error occurred.",
             requeue=requeue,
+            cancel=cancel,
         )
         return
+    finally:
+        # No-op when a stage already released it; covers early failures.
+        ctx.release_document()
 
     logger.info("Job id=%s succeeded", job.id)
+    return ctx.result_json
+
+
+def _stage_deadline(stage: Callable[..., None], job_deadline: Deadline) -> Deadline:
+    """Return the deadline ``stage`` runs under: its timeout or the job's."""
+    timeout = {
+        extract_stage: settings.extract_timeout_seconds,
+        run_langgraph_stage: settings.langgraph_timeout_seconds,
+        persist_stage: settings.persist_timeout_seconds,
+    }.get(stage)
+    if timeout is None:
+        return job_deadline
+    name = getattr(stage, "__name__", "stage")
+    return job_deadline.within(
+        timeout,
+        code="stage_timeout",
+        detail=f"Stage {name} exceeded its {timeout:g}s timeout",
+    )
+
+
+def _resume_index(ctx: JobContext) -> int:
+    """Return the index of the first stage this attempt still has to run."""
+    for index in range(len(_STAGES) - 1, -1, -1):
+        restore = _RESTORERS.get(_STAGES[index])
+        if restore is not None and restore(ctx):
+            return index + 1
+    return 0
+
+
+def process_follower(
+    supabase: Client,
+    job: AnalysisJob,
+    *,
+    leader: Future[dict | None],
+    cancel: threading.Event | None = None,
+    deadline: Deadline | None = None,
+) -> dict | None:
+    """Finish a job whose document (same sha256) is being analyzed by ``leader``.
+
+    The follower keeps its own lease alive while it waits.  When the leader
+    succeeds its result_json is written to this job as-is; when the leader
+    fails or is abandoned the follower runs the full pipeline itself under a
+    fresh job deadline (the wait does not eat into its budget), so its own
+    failures and requeues follow the process_job error contract.
+
+    ``deadline`` bounds the wait and the heartbeat just as it bounds a job:
+    a follower still waiting when it expires is failed (and requeued while
+    attempts remain) with the deadline's error.
+    """
+    if job.job_token is None:
+        raise TerminalJobError(
+            code="missing_job_token",
+            detail="Job was dispatched without a token.",
+        )
+    token = job.job_token
+    if deadline is None:
+        deadline = start_job_deadline()
+    if job.cancel_requested:
+        _safe_mark_cancelled(supabase=supabase, job=job, token=token, cancel=cancel)
+        return None
+    logger.info("Job id=%s waiting on an in-flight duplicate", job.id)
+
+    heartbeat = LeaseHeartbeat(
+        supabase=supabase,
+        job_id=job.id,
+        token=token,
+        lease_seconds=settings.job_lease_seconds,
+        interval_seconds=settings.job_heartbeat_interval_seconds,
+        deadline=deadline,
+    )
+    with heartbeat:
+        while not leader.done():
+            if heartbeat.lost.is_set():
+                logger.error("Job id=%s abandoned after losing its lease", job.id)
+                return None
+            if cancel is not None and cancel.is_set():
+                logger.warning("Job id=%s released by the worker; stopping", job.id)
+                return None
+            if heartbeat.cancel_requested.is_set():
+                _safe_mark_cancelled(
+                    supabase=supabase, job=job, token=token, cancel=cancel
+                )
+                return None
+            if deadline.expired():
+                _safe_mark_failed(
+                    supabase=supabase,
+                    job=job,
+                    token=token,
+                    error_code=deadline.code,
+                    error_detail=deadline.detail,
+                    requeue=job.attempts < job.max_attempts,
+                    cancel=cancel,
+                )
+                return None
+            wait_futures(
+                [leader], timeout=min(_FOLLOWER_POLL_SECONDS, deadline.remaining())
+            )
+
+    result = None if leader.exception() is not None else leader.result()
+    if result is None:
+        logger.info("Job id=%s: duplicate did not succeed; processing itself", job.id)
+        return process_job(supabase, job, cancel=cancel, deadline=start_job_deadline())
+
+    try:
+        repo.mark_succeeded(supabase, job_id=job.id, result_json=result, token=token)
+    except JobRepoError as exc:
+        logger.error(
+            "Job id=%s could not store the shared result (code=%s)", job.id, exc.code
+        )
+        _safe_mark_failed(
+            supabase=supabase,
+            job=job,
+            token=token,
+            error_code="unexpected_worker_error",
+            error_detail="An unexpected internal error occurred.",
+            requeue=job.attempts < job.max_attempts,
+            cancel=cancel,
+        )
+        return None
+
+    logger.info("Job id=%s succeeded with a shared result", job.id)
+    return result
+
+
+def _safe_mark_cancelled(
+    *,
+    supabase: Client,
+    job: AnalysisJob,
+    token: str,
+    cancel: threading.Event | None = None,
+) -> None:
+    """Record a client cancellation; like _safe_mark_failed, never raises."""
+    if cancel is not None and cancel.is_set():
+        return
+    logger.info("Job id=%s cancelled by the client", job.id)
+    try:
+        repo.mark_cancelled(supabase, job_id=job.id, token=token)
+    except JobRepoError as exc:
+        logger.critical(
+            "Job id=%s mark_cancelled raised (code=%s) — lease will expire",
+            job.id,
+            exc.code,
+        )
 
 
 def _safe_mark_failed(
@@ -104,20 +387,34 @@ def _safe_mark_failed(
     error_code: str,
     error_detail: str | None,
     requeue: bool,
+    cancel: threading.Event | None = None,
+    retry_after: float | None = None,
 ) -> None:
     """Call repo.mark_failed and absorb any JobRepoError that it raises.
 
     If mark_failed itself fails there is nothing more the worker can do —
     the lease will expire and the job will become available again naturally.
     The failure is logged at CRITICAL so that on-call engineers are alerted.
+
+    Nothing is written when ``cancel`` is set: the job was already released
+    and its token cleared, so the write could only fail.
     """
+    if cancel is not None and cancel.is_set():
+        logger.warning(
+            "Job id=%s failed after being released (code=%s); not recording",
+            job.id,
+            error_code,
+        )
+        return
+    retry_delay = _retry_delay(job.attempts, retry_after) if requeue else None
     if requeue:
         logger.warning(
-            "Job id=%s requeued (code=%s, attempt=%d/%d)",
+            "Job id=%s requeued (code=%s, attempt=%d/%d, retry in %.1fs)",
             job.id,
             error_code,
             job.attempts,
             job.max_attempts,
+            retry_delay,
         )
     else:
         logger.error(
@@ -134,6 +431,7 @@ def _safe_mark_failed(
             error_detail=error_detail,
             requeue=requeue,
             token=token,
+            retry_delay_seconds=retry_delay,
         )
     except JobRepoError as exc:
         logger.critical(
@@ -142,3 +440,19 @@ def _safe_mark_failed(
             exc.code,
         )
         # Do not re-raise: let the lease expire naturally.
+
+
+def _retry_delay(attempts: int, retry_after: float | None) -> float:
+    """Return how long a requeued job stays hidden from claims, in seconds.
+
+    Exponential backoff on the attempt number with "equal jitter": half the
+    step is fixed, half random, so retries of jobs that failed together
+    (e.g. during a storage outage) spread out instead of arriving in waves.
+    A stage's suggested ``retry_after`` raises the delay, up to the cap.
+    """
+    cap = settings.retry_backoff_max_seconds
+    step = min(cap, settings.retry_backoff_base_seconds * 2 ** max(0, attempts - 1))
+    delay = step / 2 + random.uniform(0, step / 2)
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, cap))
+    return delay
@@ -1,35 +1,127 @@
 from __future__ import annotations
 
 import hashlib
+import os
+import tempfile
+from pathlib import Path
 
+import httpx
 from supabase import Client
 
-from biblio_checker_worker.jobs import repo
+from biblio_checker_worker.cache.blob_cache import (
+    SPOOL_PREFIX,
+    BlobCache,
+    get_blob_cache,
+)
+from biblio_checker_worker.core.config import settings
 from biblio_checker_worker.jobs.enums import JobStage
 from biblio_checker_worker.jobs.errors import StageError, TerminalJobError
 from biblio_checker_worker.pipeline.context import JobContext
+from biblio_checker_worker.pipeline.document import SpooledDocument
+from biblio_checker_worker.supabase.client import get_supabase_clients
+
+# Signed download URLs are used immediately, so they can be short-lived.
+_SIGNED_URL_TTL_SECONDS = 60
+_CHUNK_SIZE = 64 * 1024
 
 
 def extract_stage(*, supabase: Client, ctx: JobContext) -> None:
     """Download the source file, verify its SHA-256 checksum, and populate ctx.
 
     Steps:
-    1. Download the file from Supabase Storage.
-    2. Verify the SHA-256 digest against the value recorded on the job.
-    3. Populate ctx.file_bytes with the downloaded content.
-    4. Advance the job stage to EXTRACT_DONE via the repo layer.
+    1. Look the document up in the local blob cache (when enabled); a hit
+       is already verified and skips steps 2-3.
+    2. Stream the file from Supabase Storage into a spool file, hashing it
+       as it is written (memory stays at one chunk whatever the file size).
+    3. Verify the SHA-256 digest against the value recorded on the job and
+       move the verified spool into the cache.
+    4. Attach the file to ctx as a memory-mapped document (ctx.file_view).
+    5. Report the EXTRACT_DONE stage (written behind by ctx.reporter).
 
     Raises:
-        StageError (transient=True): Storage download failure.
+        StageError (transient=True): Storage download failure, or the stage
+            ran out of time (stage_timeout / job_deadline_exceeded).
         TerminalJobError: SHA-256 digest mismatch — the file is corrupted or
             was replaced; retrying would produce the same result.
-        JobRepoError: Propagated from repo.update_stage; handled by the runner.
     """
-    # Step 1: Download file from storage.
+    expected = ctx.job.sha256.lower()
+    cache = get_blob_cache()
+
+    # Step 1: Cache lookup (blobs are keyed by their verified hash).
+    document = _open_cached(cache, expected) if cache is not None else None
+
+    if document is None:
+        # Step 2: Stream the file to disk.  Spooling inside the cache root
+        # lets a verified file be adopted by rename instead of copied.
+        spool_dir = cache.root if cache is not None else None
+        spool, actual = _spool_download(supabase, ctx, spool_dir=spool_dir)
+
+        # Step 3: SHA-256 integrity check.
+        if actual != expected:
+            spool.unlink(missing_ok=True)
+            raise TerminalJobError(
+                code="integrity_sha_mismatch",
+                detail=f"expected={expected} actual={actual}",
+            )
+        cached = cache.adopt(expected, spool) if cache is not None else None
+        try:
+            if cached is not None:
+                document = SpooledDocument(cached, owned=False)
+            else:
+                document = SpooledDocument(spool, owned=True)
+        except OSError as exc:
+            spool.unlink(missing_ok=True)
+            raise StageError(
+                code="storage_download_failed",
+                detail=str(exc) or None,
+                transient=True,
+            ) from exc
+
+    # Step 4: Populate context.
+    ctx.document = document
+
+    # Step 5: Advance stage (write failures surface at the next stage boundary).
+    ctx.reporter.report(JobStage.EXTRACT_DONE)
+
+
+def _open_cached(cache: BlobCache, sha256: str) -> SpooledDocument | None:
+    path = cache.get(sha256)
+    if path is None:
+        return None
     try:
-        file_bytes: bytes = supabase.storage.from_(ctx.job.bucket).download(
-            ctx.job.path
+        return SpooledDocument(path, owned=False)
+    except OSError:
+        # Evicted between lookup and open: fall back to downloading.
+        return None
+
+
+def _spool_download(
+    supabase: Client, ctx: JobContext, *, spool_dir: Path | None
+) -> tuple[Path, str]:
+    """Stream the job's object into a new spool file; returns (path, sha256).
+
+    The object is fetched through a signed URL on the shared HTTP pool, so
+    the body is never buffered whole the way storage download() does.  The
+    request timeout is bounded by ctx.deadline, which is also checked after
+    every chunk.
+    """
+    try:
+        signed = supabase.storage.from_(ctx.job.bucket).create_signed_url(
+            ctx.job.path, _SIGNED_URL_TTL_SECONDS
+        )
+        url = signed.get("signedURL") or signed.get("signedUrl")
+        if not url:
+            raise ValueError("Could not generate a signed download URL.")
+        client = get_supabase_clients().http
+        ctx.deadline.check()
+        timeout = min(settings.supabase_http_timeout_seconds, ctx.deadline.remaining())
+        # Closed explicitly rather than via client.stream(): contextlib
+        # re-assigns __traceback__ on exit, which frozen StageError rejects.
+        resp = client.send(
+            client.build_request("GET", str(url), timeout=timeout), stream=True
         )
+    except StageError:
+        raise
     except Exception as exc:  # noqa: BLE001
         raise StageError(
             code="storage_download_failed",
@@ -37,22 +129,40 @@ def extract_stage(*, supabase: Client, ctx: JobContext) -> None:
             transient=True,
         ) from exc
 
-    # Step 2: SHA-256 integrity check.
-    actual = hashlib.sha256(file_bytes).hexdigest()
-    expected = ctx.job.sha256.lower()
-    if actual != expected:
-        raise TerminalJobError(
-            code="integrity_sha_mismatch",
-            detail=f"expected={expected} actual={actual}",
-        )
+    spool: Path | None = None
+    digest = hashlib.sha256()
+    try:
+        fd, spool_name = tempfile.mkstemp(dir=spool_dir, prefix=SPOOL_PREFIX)
+        spool = Path(spool_name)
+        with os.fdopen(fd, "wb") as fh:
+            resp.raise_for_status()
+            for chunk in resp.iter_bytes(_CHUNK_SIZE):
+                digest.update(chunk)
+                fh.write(chunk)
+                ctx.deadline.check()
+                ctx.raise_if_cancelled()
+    except BaseException as exc:
+        if spool is not None:
+            spool.unlink(missing_ok=True)
+        if isinstance(exc, (httpx.HTTPError, OSError)):
+            raise StageError(
+                code="storage_download_failed",
+                detail=str(exc) or None,
+                transient=True,
+                retry_after=_retry_after(exc),
+            ) from exc
+        raise
+    finally:
+        resp.close()
+    return spool, digest.hexdigest()
 
-    # Step 3: Populate context.
-    ctx.file_bytes = file_bytes
 
-    # Step 4: Advance stage (JobRepoError propagates to the runner).
-    repo.update_stage(
-        supabase,
-        job_id=ctx.job.id,
-        stage=JobStage.EXTRACT_DONE,
-        token=ctx.token,
-    )
+def _retry_after(exc: BaseException) -> float | None:
+    """Seconds from the Retry-After header of a failed response, if any."""
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return None
+    try:
+        return max(0.0, float(exc.response.headers.get("retry-after", "")))
+    except ValueError:
+        # Absent, or an HTTP date: fall back to the regular backoff.
+        return None
@@ -3,33 +3,37 @@ from __future__ import annotations
 from supabase import Client
 
 from biblio_checker_worker.jobs import repo
-from biblio_checker_worker.jobs.enums import JobStage
+from biblio_checker_worker.jobs.errors import JobRepoError
 from biblio_checker_worker.pipeline.context import JobContext
+from biblio_checker_worker.pipeline.stages.run_langgraph import CHECKPOINT
 
 
 def persist_stage(*, supabase: Client, ctx: JobContext) -> None:
     """Write the analysis result to the database and mark the job succeeded.
 
     Steps:
-    1. Advance stage to PERSISTING_RESULT.
+    1. Stop the stage reporter so no queued stage update can land after the
+       final write, and surface any write it failed.
     2. Call repo.mark_succeeded with the accumulated result_json.
 
-    Any JobRepoError raised by either repo call propagates directly to the
-    pipeline runner, which treats it as an unexpected error and handles
-    requeue/failure logic accordingly.
+    PERSISTING_RESULT is not written separately: the final write sets
+    stage=done in the same round trip.  Any JobRepoError propagates directly
+    to the pipeline runner, which treats it as an unexpected error and handles
+    requeue/failure logic accordingly.  Before it does, the result is
+    checkpointed so the retry resumes here instead of running the flow again.
     """
-    # Step 1: Advance stage (JobRepoError propagates to runner).
-    repo.update_stage(
-        supabase,
-        job_id=ctx.job.id,
-        stage=JobStage.PERSISTING_RESULT,
-        token=ctx.token,
-    )
+    try:
+        # Step 1: Drain the write-behind reporter.
+        ctx.reporter.close(flush=False)
+        ctx.reporter.raise_if_failed()
 
-    # Step 2: Finalise job (JobRepoError propagates to runner).
-    repo.mark_succeeded(
-        supabase,
-        job_id=ctx.job.id,
-        result_json=ctx.result_json,
-        token=ctx.token,
-    )
+        # Step 2: Finalise job.
+        repo.mark_succeeded(
+            supabase,
+            job_id=ctx.job.id,
+            result_json=ctx.result_json,
+            token=ctx.token,
+        )
+    except JobRepoError:
+        ctx.checkpoints.save(CHECKPOINT, {"result_json": ctx.result_json})
+        raise
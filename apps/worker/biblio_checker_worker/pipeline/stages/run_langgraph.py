@@ -2,12 +2,15 @@ from __future__ import annotations
 
 from supabase import Client
 
-from biblio_checker_worker.jobs import repo
 from biblio_checker_worker.jobs.enums import JobStage
-from biblio_checker_worker.jobs.errors import StageError
+from biblio_checker_worker.jobs.errors import JobCancelledError, StageError
 from biblio_checker_worker.langgraph.flow import start_analysis_flow
 from biblio_checker_worker.pipeline.context import JobContext
 
+# Checkpoint holding the flow result; a retry that finds it skips the flow.
+# persist_stage writes it only when the final write fails.
+CHECKPOINT = "langgraph_result"
+
 
 def run_langgraph_stage(*, supabase: Client, ctx: JobContext) -> None:
     """Invoke the LangGraph analysis flow and capture its result.
@@ -15,38 +18,52 @@ def run_langgraph_stage(*, supabase: Client, ctx: JobContext) -> None:
     Steps:
     1. Advance stage to LANGGRAPH_RUNNING.
     2. Call start_analysis_flow; wrap any exception as a transient StageError.
+       The flow is the document's last consumer, so it is released afterwards.
     3. Advance stage to VERIFYING_REFERENCES.
-    4. Persist the flow result onto ctx.result_json.
+    4. Store the flow result on ctx.result_json.  It is checkpointed only if
+       the final write fails (see persist_stage), keeping the success path
+       free of an extra round trip.
 
     Raises:
         StageError (transient=True): The LangGraph flow raised an exception.
-        JobRepoError: Propagated from repo.update_stage; handled by the runner.
     """
     # Step 1: Mark stage as running.
-    repo.update_stage(
-        supabase,
-        job_id=ctx.job.id,
-        stage=JobStage.LANGGRAPH_RUNNING,
-        token=ctx.token,
-    )
+    ctx.reporter.report(JobStage.LANGGRAPH_RUNNING)
 
     # Step 2: Execute the flow.
     try:
-        result = start_analysis_flow(job=ctx.job, file_bytes=ctx.file_bytes)
+        result = start_analysis_flow(
+            job=ctx.job,
+            file_view=ctx.file_view,
+            file_path=ctx.file_path,
+            checkpoints=ctx.checkpoints,
+            deadline=ctx.deadline,
+            check_cancelled=ctx.raise_if_cancelled,
+        )
+    except (StageError, JobCancelledError):
+        # Deadline overruns and cancellations raised by the flow keep their
+        # meaning.
+        raise
     except Exception as exc:  # noqa: BLE001
         raise StageError(
             code="langgraph_flow_failed",
             detail=str(exc) or None,
             transient=True,
         ) from exc
+    finally:
+        ctx.release_document()
 
     # Step 3: Advance stage to verifying.
-    repo.update_stage(
-        supabase,
-        job_id=ctx.job.id,
-        stage=JobStage.VERIFYING_REFERENCES,
-        token=ctx.token,
-    )
+    ctx.reporter.report(JobStage.VERIFYING_REFERENCES)
 
     # Step 4: Store result on context.
     ctx.result_json = result
+
+
+def restore_langgraph_checkpoint(ctx: JobContext) -> bool:
+    """Load a checkpointed flow result into ctx; False when there is none."""
+    payload = ctx.checkpoints.get(CHECKPOINT)
+    if payload is None or not isinstance(payload.get("result_json"), dict):
+        return False
+    ctx.result_json = payload["result_json"]
+    return True
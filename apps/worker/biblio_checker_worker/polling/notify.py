@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable, Iterator
+from typing import Any, Protocol
+
+logger = logging.getLogger("biblio_checker_worker.polling.notify")
+
+# Channel published by the analysis_jobs_notify_queued trigger.
+NOTIFY_CHANNEL = "analysis_jobs_queued"
+
+# How long a single notifies() wait blocks before the stop flag is re-checked.
+_LISTEN_TIMEOUT_SECONDS = 1.0
+
+
+class NotifyConnection(Protocol):
+    """The subset of a psycopg 3 connection used by the listener.
+
+    Tests can supply an in-process stand-in implementing these methods
+    instead of a real Postgres connection.
+    """
+
+    def execute(self, query: str) -> Any: ...
+
+    def notifies(self, *, timeout: float) -> Iterator[Any]: ...
+
+    def close(self) -> None: ...
+
+
+def _psycopg_connect(dsn: str) -> NotifyConnection:
+    import psycopg
+
+    return psycopg.connect(dsn, autocommit=True)
+
+
+class JobNotificationListener:
+    """Background thread that sets ``wakeup`` whenever a job is enqueued.
+
+    The listener holds a dedicated session-level Postgres connection (LISTEN
+    does not work through a transaction-mode pooler) and reconnects after
+    ``reconnect_seconds`` on any error.  It is purely an accelerator: the
+    polling loop keeps its own timer, so a dropped connection only costs
+    latency, never correctness.
+    """
+
+    def __init__(
+        self,
+        *,
+        dsn: str,
+        wakeup: threading.Event,
+        connect: Callable[[str], NotifyConnection] = _psycopg_connect,
+        reconnect_seconds: float = 5.0,
+    ) -> None:
+        self._dsn = dsn
+        self._wakeup = wakeup
+        self._connect = connect
+        self._reconnect_seconds = reconnect_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="job-notify", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        self._thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception as exc:  # noqa: BLE001
+                # SECURITY: the DSN carries credentials; log the type only.
+                logger.warning(
+                    "Job notification listener disconnected (%s); retrying in %ss",
+                    type(exc).__name__,
+                    self._reconnect_seconds,
+                )
+                self._stop.wait(self._reconnect_seconds)
+
+    def _listen(self) -> None:
+        conn = self._connect(self._dsn)
+        try:
+            conn.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            logger.info("Listening for job notifications on '%s'.", NOTIFY_CHANNEL)
+            # Anything enqueued while we were disconnected is picked up here.
+            self._wakeup.set()
+            while not self._stop.is_set():
+                for _notify in conn.notifies(timeout=_LISTEN_TIMEOUT_SECONDS):
+                    self._wakeup.set()
+        finally:
+            conn.close()
+
+
+def start_notification_listener(
+    *, dsn: str, wakeup: threading.Event
+) -> JobNotificationListener | None:
+    """Start a listener for ``dsn``, or return None when it cannot run.
+
+    Returns None when no DSN is configured or the optional ``psycopg``
+    dependency is not installed; the worker then relies on polling alone.
+    """
+    if not (dsn or "").strip():
+        return None
+    try:
+        import psycopg  # noqa: F401
+    except ImportError:
+        logger.warning(
+            "DATABASE_URL is set but psycopg is not installed; "
+            "job notifications are disabled (install the 'notify' extra)."
+        )
+        return None
+    listener = JobNotificationListener(dsn=dsn, wakeup=wakeup)
+    listener.start()
+    return listener
@@ -1,47 +1,322 @@
 from __future__ import annotations
 
 import logging
+import os
 import secrets
+import signal
+import threading
 import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from dataclasses import dataclass, field
 
 from supabase import Client
 
+from biblio_checker_worker.core import metrics
 from biblio_checker_worker.core.config import settings
 from biblio_checker_worker.jobs import repo
 from biblio_checker_worker.jobs.errors import JobRepoError
-from biblio_checker_worker.pipeline.runner import process_job
+from biblio_checker_worker.jobs.models import AnalysisJob
+from biblio_checker_worker.pipeline.runner import (
+    process_follower,
+    process_job,
+    start_job_deadline,
+)
+from biblio_checker_worker.polling.notify import start_notification_listener
+from biblio_checker_worker.polling.scheduler import PollScheduler
 from biblio_checker_worker.supabase.client import (
     SupabaseClientError,
     get_supabase_admin_client,
+    publish_pool_metrics,
 )
 
 logger = logging.getLogger("biblio_checker_worker.polling")
 
+INFLIGHT_GAUGE = "worker_inflight_jobs"
+# Longest the loop blocks before it ticks and checks for a signalled drain.
+_WAIT_SLICE_SECONDS = 1.0
+
+
+def _claim_batch(*, supabase: Client, limit: int) -> list[AnalysisJob]:
+    """Claim up to ``limit`` queued jobs in a single round trip.
 
-def poll_once(*, supabase: Client) -> None:
-    token = secrets.token_urlsafe(settings.job_token_bytes)
+    Claim errors are logged and reported as an empty batch so that a
+    transient DB failure never crashes the polling loop.
+    """
     try:
-        job = repo.claim_one_job(
-            supabase, token=token, lease_seconds=settings.job_lease_seconds
+        jobs = repo.claim_jobs(
+            supabase,
+            token_factory=lambda: secrets.token_urlsafe(settings.job_token_bytes),
+            lease_seconds=settings.job_lease_seconds,
+            limit=limit,
         )
     except JobRepoError as exc:
-        logger.error("Failed to claim job (code=%s): %s", exc.code, exc.detail)
-        return
-    if job is None:
+        logger.error("Failed to claim jobs (code=%s): %s", exc.code, exc.detail)
+        return []
+    if not jobs:
         logger.debug("No jobs available.")
+    for job in jobs:
+        logger.info(
+            "Claimed job id=%s attempt=%d/%d", job.id, job.attempts, job.max_attempts
+        )
+    return jobs
+
+
+def _release_for_shutdown(*, supabase: Client, job: AnalysisJob) -> None:
+    """Requeue a job this worker is abandoning and hand back its attempt."""
+    if job.job_token is None:
         return
-    logger.info("Claimed job id=%s attempt=%d/%d", job.id, job.attempts, job.max_attempts)
-    process_job(supabase=supabase, job=job)
+    try:
+        repo.mark_failed(
+            supabase,
+            job_id=job.id,
+            error_code="worker_shutdown",
+            error_detail="The worker shut down before the job finished.",
+            requeue=True,
+            token=job.job_token,
+            attempts=job.attempts - 1,
+        )
+    except JobRepoError as exc:
+        # Typically the job finished (or lost its lease) while we were
+        # draining; otherwise the lease expiry is the fallback.
+        logger.warning(
+            "Job id=%s could not be requeued on shutdown (code=%s)",
+            job.id,
+            exc.code,
+        )
+        return
+    logger.warning("Job id=%s requeued on shutdown", job.id)
+
+
+@dataclass
+class _InflightJob:
+    job: AnalysisJob
+    cancel: threading.Event = field(default_factory=threading.Event)
+
+
+class PollingLoop:
+    """Claim/process loop that keeps up to ``max_inflight`` jobs running.
+
+    Jobs are executed on a thread pool.  Most of a job's wall time is spent
+    waiting on network I/O, so several jobs can share one worker process.
+    Whenever slots free up the loop is woken and fills all of them with a
+    single batch claim.  The wait between claim attempts comes from a
+    PollScheduler: zero while jobs keep turning up, exponential backoff while
+    the queue is empty.  Setting ``wakeup`` (a finishing job, or a job
+    notification from the database) ends the wait early.
+
+    ``request_drain()`` stops claiming, gives in-flight jobs
+    ``drain_grace_seconds`` to finish, and explicitly requeues whatever is
+    still running so another worker can pick it up immediately instead of
+    waiting for the lease to expire.  ``signal_drain()`` does the same from a
+    signal handler: it only sets a flag, which the loop notices within
+    _WAIT_SLICE_SECONDS.  Jobs still running after the drain are reported by
+    ``stragglers``.
+
+    Claimed jobs for a document (sha256) that is already being analyzed in
+    this process are not analyzed again: they run process_follower, which
+    keeps their lease alive and copies the leader's result when it succeeds.
 
+    ``on_tick`` is called from the loop itself, on every iteration and at
+    least every _WAIT_SLICE_SECONDS while it waits, so a caller watching it
+    notices a loop that is stuck even though its process is alive.
 
-def run_forever() -> None:
+    The sync supabase ``Client`` is shared between threads: request builders
+    are created per call and the underlying httpx client is thread-safe.
+    """
+
+    def __init__(
+        self,
+        *,
+        supabase: Client,
+        max_inflight: int,
+        scheduler: PollScheduler | None = None,
+        wakeup: threading.Event | None = None,
+        drain_grace_seconds: float | None = None,
+        on_tick: Callable[[], None] | None = None,
+    ) -> None:
+        self._supabase = supabase
+        self._max_inflight = max(1, int(max_inflight))
+        self._scheduler = scheduler or PollScheduler(
+            base_seconds=max(1, int(settings.poll_interval_seconds)),
+            max_seconds=settings.poll_max_interval_seconds,
+        )
+        self._inflight: dict[Future[dict | None], _InflightJob] = {}
+        # sha256 -> future of the job currently analyzing that document.
+        self._leaders: dict[str, Future[dict | None]] = {}
+        self.wakeup = wakeup or threading.Event()
+        self._drain_grace = (
+            settings.shutdown_grace_seconds
+            if drain_grace_seconds is None
+            else drain_grace_seconds
+        )
+        self._draining = threading.Event()
+        # Set from a signal handler, where taking the Event's lock could
+        # deadlock against the interrupted main thread.
+        self._drain_signalled = False
+        self._on_tick = on_tick
+
+    @property
+    def free_slots(self) -> int:
+        return self._max_inflight - len(self._inflight)
+
+    @property
+    def stragglers(self) -> int:
+        """Released jobs whose threads are still running after the drain."""
+        return sum(1 for future in self._inflight if not future.done())
+
+    def request_drain(self) -> None:
+        """Stop claiming new jobs and make run() drain and return."""
+        self._draining.set()
+        self.wakeup.set()
+
+    def signal_drain(self) -> None:
+        """Async-signal-safe request_drain(): only sets a flag."""
+        self._drain_signalled = True
+
+    def _drain_requested(self) -> bool:
+        return self._drain_signalled or self._draining.is_set()
+
+    def run(self) -> None:
+        pool = ThreadPoolExecutor(
+            max_workers=self._max_inflight, thread_name_prefix="job"
+        )
+        try:
+            while not self._drain_requested():
+                self._tick()
+                self._reap()
+                if self.free_slots <= 0:
+                    # Every slot is busy: nothing to poll for until one frees up.
+                    self._wait(timeout=None)
+                    continue
+                claimed = self._fill_slots(pool)
+                delay = self._scheduler.next_delay(found_jobs=claimed > 0)
+                if self.free_slots <= 0:
+                    self._wait(timeout=None)
+                elif delay > 0:
+                    self._wait(timeout=delay)
+            self._drain()
+        finally:
+            # Does not wait here, but the executor's atexit hook still joins
+            # every pool thread at interpreter exit, so run_forever hard-exits
+            # when stragglers remain after the drain.
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _drain(self) -> None:
+        if self._inflight:
+            logger.info(
+                "Draining %d in-flight jobs (grace=%ss).",
+                len(self._inflight),
+                self._drain_grace,
+            )
+            wait_futures(list(self._inflight), timeout=self._drain_grace)
+        self._reap()
+        for entry in list(self._inflight.values()):
+            entry.cancel.set()
+            _release_for_shutdown(supabase=self._supabase, job=entry.job)
+        logger.info("Polling loop drained.")
+
+    def _fill_slots(self, pool: ThreadPoolExecutor) -> int:
+        if self.free_slots <= 0:
+            return 0
+        jobs = _claim_batch(supabase=self._supabase, limit=self.free_slots)
+        for job in jobs:
+            entry = _InflightJob(job=job)
+            # The attempt's time budget starts at the claim, not when a pool
+            # thread picks the job up.
+            deadline = start_job_deadline()
+            leader = self._leaders.get(job.sha256.lower())
+            if leader is not None and not leader.done():
+                future = pool.submit(
+                    process_follower,
+                    supabase=self._supabase,
+                    job=job,
+                    leader=leader,
+                    cancel=entry.cancel,
+                    deadline=deadline,
+                )
+            else:
+                future = pool.submit(
+                    process_job,
+                    supabase=self._supabase,
+                    job=job,
+                    cancel=entry.cancel,
+                    deadline=deadline,
+                )
+                self._leaders[job.sha256.lower()] = future
+            self._inflight[future] = entry
+            future.add_done_callback(lambda _f: self.wakeup.set())
+        metrics.set_gauge(INFLIGHT_GAUGE, len(self._inflight))
+        return len(jobs)
+
+    def _reap(self) -> None:
+        for future in [f for f in self._inflight if f.done()]:
+            job = self._inflight.pop(future).job
+            if self._leaders.get(job.sha256.lower()) is future:
+                del self._leaders[job.sha256.lower()]
+            exc = future.exception()
+            if exc is not None:
+                # process_job handles stage errors itself; anything reaching
+                # here escaped its contract and must not kill the loop.
+                logger.error(
+                    "Job id=%s escaped the pipeline runner",
+                    job.id,
+                    exc_info=exc,
+                )
+        metrics.set_gauge(INFLIGHT_GAUGE, len(self._inflight))
+        publish_pool_metrics()
+
+    def _tick(self) -> None:
+        if self._on_tick is not None:
+            self._on_tick()
+
+    def _wait(self, *, timeout: float | None) -> None:
+        """Wait for ``wakeup`` or ``timeout`` in slices, ticking in between."""
+        until = None if timeout is None else time.monotonic() + timeout
+        while not self._drain_requested():
+            slice_seconds = _WAIT_SLICE_SECONDS
+            if until is not None:
+                slice_seconds = min(slice_seconds, until - time.monotonic())
+                if slice_seconds <= 0:
+                    break
+            if self.wakeup.wait(timeout=slice_seconds):
+                break
+            self._tick()
+        self.wakeup.clear()
+
+
+def run_forever(*, on_tick: Callable[[], None] | None = None) -> None:
     logger = logging.getLogger("biblio_checker_worker.polling")
     try:
         supabase = get_supabase_admin_client()
     except SupabaseClientError as exc:
         raise RuntimeError(f"Supabase misconfigured: {exc.code}") from exc
 
-    logger.info("Polling loop started.")
-    while True:
-        poll_once(supabase=supabase)
-        time.sleep(max(1, int(settings.poll_interval_seconds)))
+    max_inflight = max(1, int(settings.max_inflight_jobs))
+    loop = PollingLoop(supabase=supabase, max_inflight=max_inflight, on_tick=on_tick)
+    listener = start_notification_listener(
+        dsn=settings.database_url, wakeup=loop.wakeup
+    )
+    logger.info(
+        "Polling loop started (max_inflight_jobs=%d, notifications=%s).",
+        max_inflight,
+        "on" if listener is not None else "off",
+    )
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda _signum, _frame: loop.signal_drain())
+    try:
+        loop.run()
+    finally:
+        if listener is not None:
+            listener.stop(timeout=5)
+    if loop.stragglers:
+        # They were requeued in the drain; exiting normally would join their
+        # threads and hold the process past the grace period.
+        logger.warning(
+            "Polling loop stopped; exiting with %d released jobs still running.",
+            loop.stragglers,
+        )
+        logging.shutdown()
+        os._exit(0)
+    logger.info("Polling loop stopped.")
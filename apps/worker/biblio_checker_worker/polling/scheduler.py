@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+
+from biblio_checker_worker.core import metrics
+
+POLL_INTERVAL_GAUGE = "worker_poll_interval_seconds"
+
+
+class PollScheduler:
+    """Decide how long the polling loop waits before its next claim attempt.
+
+    While claims keep returning jobs the loop re-polls immediately so a
+    backlog drains without added latency.  Each consecutive empty poll
+    doubles the interval, starting at ``base_seconds`` and capped at
+    ``max_seconds``; the actual delay is drawn uniformly from the upper half
+    of that interval so idle workers do not poll the database in lockstep.
+
+    The delay last returned is published as the ``worker_poll_interval_seconds``
+    gauge.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_seconds: float,
+        max_seconds: float,
+        rand: Callable[[], float] = random.random,
+    ) -> None:
+        self._base = max(0.0, float(base_seconds))
+        self._max = max(self._base, float(max_seconds))
+        self._rand = rand
+        self._idle_polls = 0
+        self.current_interval = 0.0
+
+    def next_delay(self, *, found_jobs: bool) -> float:
+        """Record the outcome of a poll and return the seconds to wait."""
+        if found_jobs:
+            self._idle_polls = 0
+            delay = 0.0
+        else:
+            ceiling = min(self._max, self._base * (2**self._idle_polls))
+            if ceiling < self._max:
+                self._idle_polls += 1
+            delay = ceiling / 2 + self._rand() * ceiling / 2
+        self.current_interval = delay
+        metrics.set_gauge(POLL_INTERVAL_GAUGE, delay)
+        return delay
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import os
+import threading
 from dataclasses import dataclass
 
+import httpx
 from supabase import Client, create_client
+from supabase.lib.client_options import SyncClientOptions
 
+from biblio_checker_worker.core import metrics
 from biblio_checker_worker.core.config import settings
 
 
@@ -13,10 +18,80 @@ class SupabaseClientError(Exception):
     detail: str | None = None
 
 
-def get_supabase_admin_client() -> Client:
-    if not (settings.supabase_url or "").strip() or not (
-        settings.supabase_service_role_key or ""
-    ).strip():
+class SupabaseClients:
+    """Supabase admin client and the HTTP pool it runs on, one per process.
+
+    Every job thread in the process shares the same keep-alive, HTTP/2-capable
+    connections.  Connection pools must not cross a fork, so the cache is keyed
+    by pid and a forked child builds its own on first use.
+    """
+
+    def __init__(self, *, url: str, key: str) -> None:
+        self.pid = os.getpid()
+        self.limits = httpx.Limits(
+            max_connections=settings.supabase_http_max_connections,
+            max_keepalive_connections=settings.supabase_http_max_keepalive_connections,
+            keepalive_expiry=settings.supabase_http_keepalive_expiry_seconds,
+        )
+        self.http = httpx.Client(
+            limits=self.limits,
+            http2=settings.supabase_http2,
+            timeout=settings.supabase_http_timeout_seconds,
+            follow_redirects=True,
+        )
+        self.admin: Client = create_client(
+            url, key, options=SyncClientOptions(httpx_client=self.http)
+        )
+
+    def pool_stats(self) -> dict[str, int]:
+        """Return a snapshot of the connection pool."""
+        pool = getattr(getattr(self.http, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {
+            "connections": len(connections),
+            "idle": idle,
+            "active": len(connections) - idle,
+        }
+
+    def close(self) -> None:
+        self.http.close()
+
+
+_clients: SupabaseClients | None = None
+_clients_lock = threading.Lock()
+
+
+def get_supabase_clients() -> SupabaseClients:
+    global _clients
+    if (
+        not (settings.supabase_url or "").strip()
+        or not (settings.supabase_service_role_key or "").strip()
+    ):
         raise SupabaseClientError(code="worker_misconfigured")
 
-    return create_client(settings.supabase_url, settings.supabase_service_role_key)
+    pid = os.getpid()
+    clients = _clients
+    if clients is not None and clients.pid == pid:
+        return clients
+    with _clients_lock:
+        if _clients is None or _clients.pid != pid:
+            # An inherited pool belongs to the parent; drop it without closing
+            # so the parent's sockets are left alone.
+            _clients = SupabaseClients(
+                url=settings.supabase_url, key=settings.supabase_service_role_key
+            )
+        return _clients
+
+
+def get_supabase_admin_client() -> Client:
+    return get_supabase_clients().admin
+
+
+def publish_pool_metrics() -> None:
+    """Export this process's pool snapshot as supabase_http_pool_* gauges."""
+    clients = _clients
+    if clients is None or clients.pid != os.getpid():
+        return
+    for name, value in clients.pool_stats().items():
+        metrics.set_gauge(f"supabase_http_pool_{name}", value)
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from multiprocessing.process import BaseProcess
+from multiprocessing.sharedctypes import Synchronized
+
+from biblio_checker_worker.core import metrics
+from biblio_checker_worker.polling.runner import INFLIGHT_GAUGE
+
+logger = logging.getLogger("biblio_checker_worker.supervisor")
+
+# A child whose stamp is older than this is considered hung and restarted.
+_CHILD_STALE_AFTER_SECONDS = 60.0
+# Restart backoff for a child slot that keeps crashing.
+_RESTART_BACKOFF_BASE_SECONDS = 1.0
+_RESTART_BACKOFF_MAX_SECONDS = 60.0
+# A child that stayed up this long resets its slot's backoff.
+_STABLE_UPTIME_SECONDS = 60.0
+_HEALTH_LOG_INTERVAL_SECONDS = 30.0
+
+
+@dataclass
+class _ChildSlot:
+    index: int
+    last_seen: Synchronized
+    inflight: Synchronized
+    process: BaseProcess | None = None
+    started_at: float = 0.0
+    restarts: int = 0
+    consecutive_crashes: int = 0
+    next_start_at: float = field(default=0.0)
+
+
+def _child_main(
+    target: Callable[..., None], last_seen: Synchronized, inflight: Synchronized
+) -> None:
+    # Shutdown is coordinated by the supervisor, which forwards SIGTERM; a
+    # terminal Ctrl-C reaches the whole process group, so children ignore it.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    def stamp_health() -> None:
+        last_seen.value = time.time()
+        inflight.value = int(metrics.snapshot().get(INFLIGHT_GAUGE, 0))
+
+    target(on_tick=stamp_health)
+
+
+class PreforkSupervisor:
+    """Fork ``processes`` worker children and keep them running.
+
+    Each child runs ``target(on_tick=...)`` (the claim/process loop) and
+    creates its own Supabase client after the fork.  The loop calls
+    ``on_tick`` from its own iterations, so a child whose loop is stuck stops
+    stamping its health record even though the process is alive.  The
+    supervisor:
+
+    - restarts children that exit or stop reporting health, with a per-slot
+      exponential backoff so a crash loop does not spin;
+    - forwards SIGTERM/SIGINT to every child and waits up to
+      ``shutdown_timeout_seconds`` for them to exit before killing them;
+    - aggregates child health (liveness, in-flight jobs, restarts) into
+      periodic log lines and supervisor metrics.
+    """
+
+    def __init__(
+        self,
+        *,
+        processes: int,
+        target: Callable[..., None],
+        shutdown_timeout_seconds: float,
+    ) -> None:
+        self._ctx = multiprocessing.get_context("fork")
+        self._target = target
+        self._shutdown_timeout = shutdown_timeout_seconds
+        self._stopping = threading.Event()
+        self._slots = [
+            _ChildSlot(
+                index=i,
+                last_seen=self._ctx.Value("d", 0.0),
+                inflight=self._ctx.Value("i", 0),
+            )
+            for i in range(max(1, int(processes)))
+        ]
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        logger.info("Supervisor starting %d worker processes.", len(self._slots))
+
+        next_health_log = time.monotonic()
+        while not self._stopping.is_set():
+            for slot in self._slots:
+                self._check_slot(slot)
+            if time.monotonic() >= next_health_log:
+                self._report_health()
+                next_health_log = time.monotonic() + _HEALTH_LOG_INTERVAL_SECONDS
+            self._stopping.wait(1.0)
+
+        self._shutdown()
+
+    def _request_stop(self, signum: int, _frame: object) -> None:
+        logger.info("Supervisor received signal %d; draining children.", signum)
+        self._stopping.set()
+
+    def _start(self, slot: _ChildSlot) -> None:
+        slot.last_seen.value = time.time()
+        slot.inflight.value = 0
+        process = self._ctx.Process(
+            target=_child_main,
+            args=(self._target, slot.last_seen, slot.inflight),
+            name=f"worker-{slot.index}",
+        )
+        process.start()
+        slot.process = process
+        slot.started_at = time.monotonic()
+        logger.info("Started worker-%d (pid=%s).", slot.index, process.pid)
+
+    def _check_slot(self, slot: _ChildSlot) -> None:
+        now = time.monotonic()
+        process = slot.process
+        if process is None:
+            if now >= slot.next_start_at:
+                self._start(slot)
+            return
+
+        if process.is_alive():
+            if time.time() - slot.last_seen.value > _CHILD_STALE_AFTER_SECONDS:
+                logger.error(
+                    "worker-%d (pid=%s) stopped reporting health; killing it.",
+                    slot.index,
+                    process.pid,
+                )
+                process.kill()
+                process.join(timeout=5)
+                if process.is_alive():
+                    # Not reaped yet; the next check kills it again.
+                    return
+            else:
+                return
+
+        uptime = now - slot.started_at
+        if uptime >= _STABLE_UPTIME_SECONDS:
+            slot.consecutive_crashes = 0
+        slot.consecutive_crashes += 1
+        slot.restarts += 1
+        backoff = min(
+            _RESTART_BACKOFF_MAX_SECONDS,
+            _RESTART_BACKOFF_BASE_SECONDS * 2 ** (slot.consecutive_crashes - 1),
+        )
+        logger.error(
+            "worker-%d (pid=%s) exited with code %s after %.0fs; restarting in %.0fs.",
+            slot.index,
+            process.pid,
+            process.exitcode,
+            uptime,
+            backoff,
+        )
+        try:
+            process.close()
+        except ValueError:
+            logger.warning("worker-%d could not be closed; dropping it.", slot.index)
+        slot.process = None
+        slot.next_start_at = now + backoff
+
+    def _report_health(self) -> None:
+        alive = [s for s in self._slots if s.process and s.process.is_alive()]
+        inflight = sum(s.inflight.value for s in alive)
+        restarts = sum(s.restarts for s in self._slots)
+        metrics.set_gauge("supervisor_children_alive", len(alive))
+        metrics.set_gauge("supervisor_inflight_jobs", inflight)
+        metrics.set_gauge("supervisor_child_restarts", restarts)
+        logger.info(
+            "Supervisor health: %d/%d children alive, %d jobs in flight, %d restarts.",
+            len(alive),
+            len(self._slots),
+            inflight,
+            restarts,
+        )
+
+    def _shutdown(self) -> None:
+        children = [s.process for s in self._slots if s.process is not None]
+        for process in children:
+            if process.is_alive() and process.pid is not None:
+                os.kill(process.pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self._shutdown_timeout
+        for process in children:
+            process.join(timeout=max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.error(
+                    "%s (pid=%s) did not exit in time; killing it.",
+                    process.name,
+                    process.pid,
+                )
+                process.kill()
+                process.join(timeout=5)
+        logger.info("Supervisor stopped.")
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import MagicMock
+
+from biblio_checker_worker.jobs.models import AnalysisJob
+from biblio_checker_worker.pipeline.context import JobContext
+from biblio_checker_worker.pipeline.deadline import Deadline
+
+
+def make_job(**overrides: Any) -> AnalysisJob:
+    """Return a running job claimed with token "tok"; keywords override fields."""
+    fields: dict[str, Any] = {
+        "id": "job-1",
+        "status": "running",
+        "stage": "created",
+        "bucket": "uploads",
+        "path": "uploads/1/file.pdf",
+        "sha256": "a" * 64,
+        "source_type": "pdf",
+        "attempts": 1,
+        "max_attempts": 3,
+        "job_token": "tok",
+    }
+    return AnalysisJob(**{**fields, **overrides})
+
+
+def make_ctx(**overrides: Any) -> JobContext:
+    """Return a JobContext for make_job(**overrides) with mocked collaborators."""
+    job = make_job(**overrides)
+    return JobContext(
+        job=job,
+        token=job.job_token or "tok",
+        reporter=MagicMock(),
+        checkpoints=MagicMock(),
+        deadline=Deadline.after(60),
+    )
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from biblio_checker_worker.cache import blob_cache
+from biblio_checker_worker.cache.blob_cache import BlobCache, get_blob_cache
+from biblio_checker_worker.core.config import settings
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _spool(cache: BlobCache, data: bytes) -> Path:
+    # The extract stage downloads into a spool file in the cache root.
+    fd, name = tempfile.mkstemp(dir=cache.root, prefix=".tmp-")
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(data)
+    return Path(name)
+
+
+def _insert(cache: BlobCache, data: bytes) -> Path | None:
+    return cache.adopt(_sha(data), _spool(cache, data))
+
+
+def test_adopted_spool_is_returned_by_get(tmp_path) -> None:
+    cache = BlobCache(root=tmp_path, max_bytes=1024)
+    data = b"%PDF-1.7 document"
+
+    assert cache.get(_sha(data)) is None
+    _insert(cache, data)
+
+    path = cache.get(_sha(data))
+    assert path is not None
+    assert path.read_bytes() == data
+    assert [p.name for p in tmp_path.iterdir() if p.name.startswith(".tmp-")] == []
+
+
+def test_least_recently_used_blob_is_evicted(tmp_path) -> None:
+    cache = BlobCache(root=tmp_path, max_bytes=250)
+    old, recent, new = b"a" * 100, b"b" * 100, b"c" * 100
+    _insert(cache, old)
+    _insert(cache, recent)
+    os.utime(cache.path_for(_sha(old)), (1, 1))
+    os.utime(cache.path_for(_sha(recent)), (2, 2))
+    assert cache.get(_sha(recent)) is not None  # refreshes its mtime
+
+    _insert(cache, new)
+
+    assert cache.get(_sha(old)) is None
+    assert cache.get(_sha(recent)) is not None
+    assert cache.get(_sha(new)) is not None
+
+
+def test_blob_larger_than_budget_is_not_cached(tmp_path) -> None:
+    cache = BlobCache(root=tmp_path, max_bytes=10)
+    data = b"x" * 11
+    spool = _spool(cache, data)
+
+    assert cache.adopt(_sha(data), spool) is None
+    assert cache.get(_sha(data)) is None
+    # Left for the caller, which still owns it.
+    assert spool.exists()
+
+
+def test_invalid_key_is_a_miss(tmp_path) -> None:
+    cache = BlobCache(root=tmp_path, max_bytes=10)
+
+    assert cache.get("../../etc/passwd") is None
+
+
+def test_stale_spools_are_swept(tmp_path) -> None:
+    cache = BlobCache(root=tmp_path, max_bytes=1024)
+    stale, live = _spool(cache, b"crashed"), _spool(cache, b"in progress")
+    os.utime(stale, (1, 1))
+
+    cache.sweep_stale_spools()
+
+    assert not stale.exists()
+    assert live.exists()
+
+
+def test_unusable_cache_dir_disables_the_cache(tmp_path, monkeypatch) -> None:
+    blocker = tmp_path / "file"
+    blocker.write_bytes(b"")
+    monkeypatch.setattr(blob_cache, "_cache", None)
+    monkeypatch.setattr(settings, "blob_cache_dir", str(blocker / "cache"))
+
+    assert get_blob_cache() is None
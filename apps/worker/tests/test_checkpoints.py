@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from conftest import make_ctx, make_job
+
+from biblio_checker_worker.jobs.errors import JobRepoError
+from biblio_checker_worker.pipeline import runner
+from biblio_checker_worker.pipeline.checkpoints import CheckpointStore
+from biblio_checker_worker.pipeline.stages.persist import persist_stage
+
+_SHA = "a" * 64
+
+
+def _store() -> CheckpointStore:
+    return CheckpointStore(
+        supabase=MagicMock(),
+        job_id="job-1",
+        token="tok",
+        sha256=_SHA.upper(),
+        pipeline_version="2",
+    )
+
+
+def test_only_checkpoints_for_the_same_content_and_version_are_valid() -> None:
+    store = _store()
+    rows = [
+        {"stage": "a", "sha256": _SHA, "pipeline_version": "2", "payload": {"x": 1}},
+        {"stage": "b", "sha256": "b" * 64, "pipeline_version": "2", "payload": {}},
+        {"stage": "c", "sha256": _SHA, "pipeline_version": "1", "payload": {}},
+    ]
+    with patch("biblio_checker_worker.jobs.repo.fetch_checkpoints", return_value=rows):
+        store.load()
+
+    assert store.get("a") == {"x": 1}
+    assert store.get("b") is None
+    assert store.get("c") is None
+
+
+def test_checkpoint_failures_are_not_fatal() -> None:
+    store = _store()
+    error = JobRepoError(code="checkpoint_save_failed")
+    with (
+        patch(
+            "biblio_checker_worker.jobs.repo.fetch_checkpoints",
+            side_effect=JobRepoError(code="checkpoint_fetch_failed"),
+        ),
+        patch("biblio_checker_worker.jobs.repo.save_checkpoint", side_effect=error),
+    ):
+        store.load()
+        store.save("a", {"x": 1})
+
+    assert store.get("a") == {"x": 1}
+
+
+def test_retry_with_a_flow_checkpoint_resumes_at_persist() -> None:
+    rows = [
+        {
+            "stage": "langgraph_result",
+            "sha256": _SHA,
+            "pipeline_version": "1",
+            "payload": {"result_json": {"refs": [1]}},
+        }
+    ]
+    extract, langgraph = MagicMock(), MagicMock()
+    persisted: list[dict] = []
+
+    def persist(*, supabase, ctx) -> None:
+        persisted.append(ctx.result_json)
+
+    stages = [extract, langgraph, persist]
+    with (
+        patch.object(runner, "_STAGES", stages),
+        patch.object(
+            runner,
+            "_RESTORERS",
+            {langgraph: runner.restore_langgraph_checkpoint},
+        ),
+        patch.object(runner.settings, "pipeline_version", "1"),
+        patch("biblio_checker_worker.jobs.repo.fetch_checkpoints", return_value=rows),
+        patch("biblio_checker_worker.jobs.repo.renew_lease"),
+        patch("biblio_checker_worker.jobs.repo.update_stage"),
+    ):
+        result = runner.process_job(SimpleNamespace(), make_job(attempts=2))
+
+    extract.assert_not_called()
+    langgraph.assert_not_called()
+    assert persisted == [{"refs": [1]}]
+    assert result == {"refs": [1]}
+
+
+def test_a_successful_persist_writes_no_checkpoint() -> None:
+    ctx = make_ctx()
+    ctx.result_json = {"refs": [1]}
+    with patch("biblio_checker_worker.jobs.repo.mark_succeeded"):
+        persist_stage(supabase=MagicMock(), ctx=ctx)
+
+    ctx.checkpoints.save.assert_not_called()
+
+
+def test_a_failed_persist_checkpoints_the_flow_result() -> None:
+    ctx = make_ctx()
+    ctx.result_json = {"refs": [1]}
+    error = JobRepoError(code="mark_succeeded_failed")
+    with (
+        patch("biblio_checker_worker.jobs.repo.mark_succeeded", side_effect=error),
+        pytest.raises(JobRepoError),
+    ):
+        persist_stage(supabase=MagicMock(), ctx=ctx)
+
+    ctx.checkpoints.save.assert_called_once_with(
+        "langgraph_result", {"result_json": {"refs": [1]}}
+    )
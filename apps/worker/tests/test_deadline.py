@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+from conftest import make_job
+
+from biblio_checker_worker.jobs.errors import StageError
+from biblio_checker_worker.pipeline import runner
+from biblio_checker_worker.pipeline.deadline import Deadline, run_async, run_subprocess
+from biblio_checker_worker.pipeline.heartbeat import LeaseHeartbeat
+
+
+def test_within_keeps_the_sooner_deadline() -> None:
+    job = Deadline.after(10)
+
+    stage = job.within(1, code="stage_timeout")
+    assert stage.code == "stage_timeout"
+    assert stage.remaining() <= 1
+
+    assert job.within(60, code="stage_timeout") is job
+
+
+def test_run_async_cancels_the_coroutine_at_the_deadline() -> None:
+    cleaned_up = []
+
+    async def hung() -> None:
+        try:
+            await asyncio.sleep(30)
+        finally:
+            cleaned_up.append(True)
+
+    deadline = Deadline.after(0.05, code="stage_timeout", detail="too slow")
+    with pytest.raises(StageError) as exc_info:
+        run_async(hung(), deadline=deadline)
+
+    assert exc_info.value.code == "stage_timeout"
+    assert exc_info.value.transient is True
+    assert cleaned_up == [True]
+
+
+def test_run_subprocess_kills_the_process_at_the_deadline() -> None:
+    started = time.monotonic()
+    with pytest.raises(StageError) as exc_info:
+        run_subprocess(
+            [sys.executable, "-c", "import time; time.sleep(30)"],
+            deadline=Deadline.after(0.2, code="stage_timeout"),
+        )
+
+    assert exc_info.value.code == "stage_timeout"
+    assert time.monotonic() - started < 10
+
+
+def test_stage_overrun_requeues_with_stage_timeout() -> None:
+    def slow_stage(*, supabase, ctx) -> None:
+        while True:
+            ctx.deadline.check()
+            time.sleep(0.01)
+
+    with (
+        patch.object(runner, "_STAGES", [slow_stage]),
+        patch.object(
+            runner,
+            "_stage_deadline",
+            lambda stage, job_deadline: job_deadline.within(0.05, code="stage_timeout"),
+        ),
+        patch("biblio_checker_worker.jobs.repo.fetch_checkpoints", return_value=[]),
+        patch("biblio_checker_worker.jobs.repo.mark_failed") as mark_failed,
+    ):
+        runner.process_job(object(), make_job(), deadline=Deadline.after(60))
+
+    kwargs = mark_failed.call_args.kwargs
+    assert kwargs["error_code"] == "stage_timeout"
+    assert kwargs["requeue"] is True
+
+
+def test_expired_job_deadline_stops_before_the_next_stage() -> None:
+    called = []
+
+    with (
+        patch.object(runner, "_STAGES", [lambda **_kw: called.append(True)]),
+        patch("biblio_checker_worker.jobs.repo.fetch_checkpoints", return_value=[]),
+        patch("biblio_checker_worker.jobs.repo.mark_failed") as mark_failed,
+    ):
+        runner.process_job(object(), make_job(), deadline=Deadline.after(0))
+
+    assert called == []
+    assert mark_failed.call_args.kwargs["error_code"] == "job_deadline_exceeded"
+
+
+def test_heartbeat_gives_up_the_lease_of_a_stuck_job() -> None:
+    heartbeat = LeaseHeartbeat(
+        supabase=object(),
+        job_id="job-1",
+        token="tok",
+        lease_seconds=0,
+        interval_seconds=0.1,
+        deadline=Deadline(time.monotonic() - 1),
+    )
+    with (
+        patch("biblio_checker_worker.jobs.repo.renew_lease") as renew_lease,
+        heartbeat,
+    ):
+        assert heartbeat.lost.wait(timeout=5)
+
+    renew_lease.assert_not_called()
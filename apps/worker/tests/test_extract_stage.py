@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import hashlib
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from conftest import make_ctx
+
+from biblio_checker_worker.cache.blob_cache import BlobCache
+from biblio_checker_worker.jobs.errors import StageError, TerminalJobError
+from biblio_checker_worker.pipeline.context import JobContext
+from biblio_checker_worker.pipeline.stages.extract import extract_stage
+
+_DATA = b"%PDF-1.7 " + b"x" * 200_000
+_SIGNED_URL = "https://example.supabase.co/storage/v1/object/sign/uploads/f.pdf"
+
+
+def _supabase() -> MagicMock:
+    supabase = MagicMock()
+    supabase.storage.from_.return_value.create_signed_url.return_value = {
+        "signedURL": _SIGNED_URL
+    }
+    return supabase
+
+
+def _run(ctx: JobContext, *, status: int = 200, cache: BlobCache | None = None):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(status, content=_DATA)
+
+    http = httpx.Client(transport=httpx.MockTransport(handler))
+    with (
+        patch(
+            "biblio_checker_worker.pipeline.stages.extract.get_supabase_clients",
+            return_value=SimpleNamespace(http=http),
+        ),
+        patch(
+            "biblio_checker_worker.pipeline.stages.extract.get_blob_cache",
+            return_value=cache,
+        ),
+    ):
+        extract_stage(supabase=_supabase(), ctx=ctx)
+    return requests
+
+
+def test_download_is_spooled_and_exposed_as_a_view() -> None:
+    ctx = make_ctx(sha256=hashlib.sha256(_DATA).hexdigest())
+
+    requests = _run(ctx)
+
+    assert [str(r.url) for r in requests] == [_SIGNED_URL]
+    assert ctx.file_view.readonly
+    assert ctx.file_view == _DATA
+    path = ctx.file_path
+    assert path is not None and path.read_bytes() == _DATA
+
+    ctx.release_document()
+    assert not path.exists()
+    with pytest.raises(ValueError):
+        _ = ctx.file_view
+
+
+def test_sha_mismatch_removes_the_spool(tmp_path) -> None:
+    ctx = make_ctx(sha256="0" * 64)
+    cache = BlobCache(root=tmp_path, max_bytes=10 * len(_DATA))
+
+    with pytest.raises(TerminalJobError) as exc_info:
+        _run(ctx, cache=cache)
+
+    assert exc_info.value.code == "integrity_sha_mismatch"
+    assert list(tmp_path.iterdir()) == []
+    assert ctx.document is None
+
+
+def test_download_failure_is_transient(tmp_path) -> None:
+    ctx = make_ctx(sha256=hashlib.sha256(_DATA).hexdigest())
+    cache = BlobCache(root=tmp_path, max_bytes=10 * len(_DATA))
+
+    with pytest.raises(StageError) as exc_info:
+        _run(ctx, status=503, cache=cache)
+
+    assert exc_info.value.code == "storage_download_failed"
+    assert exc_info.value.transient is True
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_verified_spool_is_adopted_by_the_cache_and_reused(tmp_path) -> None:
+    sha256 = hashlib.sha256(_DATA).hexdigest()
+    cache = BlobCache(root=tmp_path, max_bytes=10 * len(_DATA))
+    first = make_ctx(sha256=sha256)
+
+    _run(first, cache=cache)
+
+    assert first.file_path == cache.path_for(sha256)
+    first.release_document()
+    assert cache.path_for(sha256).exists()
+
+    second = make_ctx(sha256=sha256)
+    requests = _run(second, cache=cache)
+
+    assert requests == []
+    assert second.file_view == _DATA
+    second.release_document()
+
+
+def test_retry_after_header_is_passed_on(tmp_path) -> None:
+    ctx = make_ctx(sha256=hashlib.sha256(_DATA).hexdigest())
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503, headers={"Retry-After": "120"})
+
+    http = httpx.Client(transport=httpx.MockTransport(handler))
+    with (
+        patch(
+            "biblio_checker_worker.pipeline.stages.extract.get_supabase_clients",
+            return_value=SimpleNamespace(http=http),
+        ),
+        patch(
+            "biblio_checker_worker.pipeline.stages.extract.get_blob_cache",
+            return_value=None,
+        ),
+        pytest.raises(StageError) as exc_info,
+    ):
+        extract_stage(supabase=_supabase(), ctx=ctx)
+
+    assert exc_info.value.retry_after == 120.0
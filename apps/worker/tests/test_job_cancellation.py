@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from unittest.mock import MagicMock, patch
+
+from conftest import make_job
+
+from biblio_checker_worker.jobs import repo
+from biblio_checker_worker.jobs.models import AnalysisJob
+from biblio_checker_worker.pipeline import runner
+from biblio_checker_worker.pipeline.heartbeat import LeaseHeartbeat
+
+
+def test_renew_lease_reports_the_cancel_flag() -> None:
+    supabase = MagicMock()
+    execute = supabase.rpc.return_value.execute
+    execute.return_value.data = [
+        {"job_token_expires_at": "2026-03-16T00:00:30+00:00", "cancel_requested": True}
+    ]
+
+    assert repo.renew_lease(supabase, job_id="job-1", token="tok", lease_seconds=30)
+
+    execute.return_value.data[0]["cancel_requested"] = False
+    assert not repo.renew_lease(supabase, job_id="job-1", token="tok", lease_seconds=30)
+
+
+def test_heartbeat_flags_a_cancellation() -> None:
+    heartbeat = LeaseHeartbeat(
+        supabase=object(),
+        job_id="job-1",
+        token="tok",
+        lease_seconds=30,
+        interval_seconds=0.1,
+    )
+    with (
+        patch("biblio_checker_worker.jobs.repo.renew_lease", return_value=True),
+        heartbeat,
+    ):
+        assert heartbeat.cancel_requested.wait(timeout=2)
+
+    assert not heartbeat.lost.is_set()
+
+
+def test_cancellation_stops_the_job_at_the_next_stage() -> None:
+    ran = []
+
+    def first(*, supabase, ctx) -> None:
+        ran.append("first")
+        ctx.cancel_requested.set()  # as the heartbeat would
+
+    def second(*, supabase, ctx) -> None:
+        ran.append("second")
+
+    with (
+        patch.object(runner, "_STAGES", [first, second]),
+        patch("biblio_checker_worker.jobs.repo.fetch_checkpoints", return_value=[]),
+        patch("biblio_checker_worker.jobs.repo.mark_cancelled") as mark_cancelled,
+        patch("biblio_checker_worker.jobs.repo.mark_failed") as mark_failed,
+    ):
+        result = runner.process_job(object(), make_job())
+
+    assert result is None
+    assert ran == ["first"]
+    mark_cancelled.assert_called_once()
+    assert mark_cancelled.call_args.kwargs == {"job_id": "job-1", "token": "tok"}
+    mark_failed.assert_not_called()
+
+
+def test_job_claimed_with_the_flag_set_is_not_run() -> None:
+    stage = MagicMock()
+
+    with (
+        patch.object(runner, "_STAGES", [stage]),
+        patch("biblio_checker_worker.jobs.repo.mark_cancelled") as mark_cancelled,
+    ):
+        runner.process_job(object(), replace(make_job(), cancel_requested=True))
+
+    stage.assert_not_called()
+    mark_cancelled.assert_called_once()
+
+
+def test_from_row_reads_the_cancel_flag() -> None:
+    row = {
+        "id": "job-1",
+        "status": "running",
+        "stage": "created",
+        "bucket": "uploads",
+        "path": "p",
+        "sha256": "a" * 64,
+        "source_type": "pdf",
+        "attempts": 1,
+        "max_attempts": 3,
+    }
+
+    assert AnalysisJob.from_row(row).cancel_requested is False
+    assert AnalysisJob.from_row({**row, "cancel_requested": True}).cancel_requested
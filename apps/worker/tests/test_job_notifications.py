@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import queue
+import threading
+
+from biblio_checker_worker.polling.notify import (
+    NOTIFY_CHANNEL,
+    JobNotificationListener,
+    start_notification_listener,
+)
+
+
+class _FakeConnection:
+    """In-process stand-in for a psycopg connection with LISTEN support."""
+
+    def __init__(self, channel: queue.Queue[str]) -> None:
+        self.channel = channel
+        self.executed: list[str] = []
+        self.closed = False
+
+    def execute(self, query: str) -> None:
+        self.executed.append(query)
+
+    def notifies(self, *, timeout: float):
+        try:
+            yield self.channel.get(timeout=timeout)
+        except queue.Empty:
+            return
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_listener_wakes_loop_on_notification() -> None:
+    channel: queue.Queue[str] = queue.Queue()
+    conn = _FakeConnection(channel)
+    wakeup = threading.Event()
+    listener = JobNotificationListener(
+        dsn="postgresql://local", wakeup=wakeup, connect=lambda _dsn: conn
+    )
+
+    listener.start()
+    try:
+        # The listener wakes the loop once on connect to catch up.
+        assert wakeup.wait(timeout=2)
+        wakeup.clear()
+
+        channel.put("job-1")
+        assert wakeup.wait(timeout=2)
+    finally:
+        listener.stop(timeout=5)
+
+    assert conn.executed == [f"LISTEN {NOTIFY_CHANNEL}"]
+    assert conn.closed
+
+
+def test_listener_reconnects_after_connection_failure() -> None:
+    attempts: list[int] = []
+    channel: queue.Queue[str] = queue.Queue()
+
+    def connect(_dsn: str) -> _FakeConnection:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("server closed the connection")
+        return _FakeConnection(channel)
+
+    wakeup = threading.Event()
+    listener = JobNotificationListener(
+        dsn="postgresql://local",
+        wakeup=wakeup,
+        connect=connect,
+        reconnect_seconds=0.01,
+    )
+    listener.start()
+    try:
+        assert wakeup.wait(timeout=2)
+    finally:
+        listener.stop(timeout=5)
+
+    assert len(attempts) >= 2
+
+
+def test_listener_disabled_without_dsn() -> None:
+    assert start_notification_listener(dsn="", wakeup=threading.Event()) is None
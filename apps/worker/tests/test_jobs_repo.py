@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import itertools
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from biblio_checker_worker.jobs import repo
+from biblio_checker_worker.jobs.errors import JobRepoError
+
+
+def _row(job_id: str, token: str, created_at: str) -> dict:
+    return {
+        "id": job_id,
+        "status": "running",
+        "stage": "created",
+        "bucket": "uploads",
+        "path": f"uploads/{job_id}/file.pdf",
+        "sha256": "a" * 64,
+        "source_type": "pdf",
+        "attempts": 1,
+        "max_attempts": 3,
+        "job_token": token,
+        "created_at": created_at,
+    }
+
+
+def _supabase_returning(data: object) -> MagicMock:
+    supabase = MagicMock()
+    supabase.rpc.return_value.execute.return_value = SimpleNamespace(data=data)
+    return supabase
+
+
+def test_claim_jobs_sends_one_token_per_slot_and_returns_fifo() -> None:
+    counter = itertools.count()
+    supabase = _supabase_returning(
+        [
+            _row("b", "tok-1", "2026-03-10T00:00:02+00:00"),
+            _row("a", "tok-0", "2026-03-10T00:00:01+00:00"),
+        ]
+    )
+
+    jobs = repo.claim_jobs(
+        supabase,
+        token_factory=lambda: f"tok-{next(counter)}",
+        lease_seconds=30,
+        limit=3,
+    )
+
+    supabase.rpc.assert_called_once_with(
+        "claim_analysis_jobs",
+        {"p_tokens": ["tok-0", "tok-1", "tok-2"], "p_lease_secs": 30},
+    )
+    assert [job.id for job in jobs] == ["a", "b"]
+    assert [job.job_token for job in jobs] == ["tok-0", "tok-1"]
+
+
+def test_claim_jobs_with_no_free_slots_skips_the_round_trip() -> None:
+    supabase = _supabase_returning([])
+
+    assert (
+        repo.claim_jobs(
+            supabase, token_factory=lambda: "tok", lease_seconds=30, limit=0
+        )
+        == []
+    )
+    supabase.rpc.assert_not_called()
+
+
+def test_claim_jobs_wraps_client_errors() -> None:
+    supabase = MagicMock()
+    supabase.rpc.return_value.execute.side_effect = RuntimeError("boom")
+
+    with pytest.raises(JobRepoError) as exc:
+        repo.claim_jobs(
+            supabase, token_factory=lambda: "tok", lease_seconds=30, limit=2
+        )
+
+    assert exc.value.code == "claim_failed"
+
+
+def _requeue_params(**kwargs) -> dict:
+    supabase = _supabase_returning("job-1")
+    repo.mark_failed(
+        supabase,
+        job_id="job-1",
+        error_code="storage_download_failed",
+        error_detail=None,
+        requeue=True,
+        token="tok",
+        **kwargs,
+    )
+    name, params = supabase.rpc.call_args.args
+    assert name == "requeue_analysis_job"
+    supabase.table.assert_not_called()
+    return params
+
+
+def test_requeue_sends_the_delay_for_the_db_clock() -> None:
+    params = _requeue_params(retry_delay_seconds=30, attempts=0)
+
+    assert params == {
+        "p_job_id": "job-1",
+        "p_token": "tok",
+        "p_error_code": "storage_download_failed",
+        "p_error_detail": None,
+        "p_retry_delay_secs": 30,
+        "p_attempts": 0,
+    }
+
+
+def test_requeue_without_delay_is_claimable_at_once() -> None:
+    params = _requeue_params()
+
+    assert params["p_retry_delay_secs"] == 0
+    assert params["p_attempts"] is None
+
+
+def test_requeue_of_a_lost_lease_raises() -> None:
+    with pytest.raises(JobRepoError) as exc:
+        repo.mark_failed(
+            _supabase_returning(None),
+            job_id="job-1",
+            error_code="storage_download_failed",
+            error_detail=None,
+            requeue=True,
+            token="tok",
+        )
+
+    assert exc.value.code == "mark_failed_failed"
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+from unittest.mock import patch
+
+from biblio_checker_worker.jobs.errors import JobRepoError
+from biblio_checker_worker.pipeline.heartbeat import LeaseHeartbeat
+
+
+def _heartbeat() -> LeaseHeartbeat:
+    return LeaseHeartbeat(
+        supabase=object(),
+        job_id="job-1",
+        token="tok",
+        lease_seconds=30,
+        interval_seconds=0.1,
+    )
+
+
+def test_heartbeat_renews_lease_until_stopped() -> None:
+    renewed = threading.Event()
+    calls: list[dict] = []
+
+    def fake_renew(_supabase, **kwargs):
+        calls.append(kwargs)
+        if len(calls) >= 2:
+            renewed.set()
+
+    with patch("biblio_checker_worker.jobs.repo.renew_lease", fake_renew):
+        with _heartbeat() as heartbeat:
+            assert renewed.wait(timeout=2)
+        count = len(calls)
+        threading.Event().wait(0.3)
+
+    assert len(calls) == count
+    assert calls[0] == {"job_id": "job-1", "token": "tok", "lease_seconds": 30}
+    assert not heartbeat.lost.is_set()
+
+
+def test_heartbeat_flags_lost_lease_and_stops() -> None:
+    calls: list[int] = []
+
+    def fake_renew(_supabase, **_kwargs):
+        calls.append(1)
+        raise JobRepoError(code="lease_lost")
+
+    with patch("biblio_checker_worker.jobs.repo.renew_lease", fake_renew):
+        with _heartbeat() as heartbeat:
+            assert heartbeat.lost.wait(timeout=2)
+            threading.Event().wait(0.3)
+
+    assert len(calls) == 1
+
+
+def test_heartbeat_retries_transient_failures() -> None:
+    calls: list[int] = []
+    done = threading.Event()
+
+    def fake_renew(_supabase, **_kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise JobRepoError(code="lease_renew_failed")
+        done.set()
+
+    with patch("biblio_checker_worker.jobs.repo.renew_lease", fake_renew):
+        with _heartbeat() as heartbeat:
+            assert done.wait(timeout=2)
+
+    assert not heartbeat.lost.is_set()
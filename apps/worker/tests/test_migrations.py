@@ -0,0 +1,166 @@
+"""Run the Supabase migrations against a real Postgres and exercise the RPCs.
+
+Mocked repo tests cannot see constraint violations, so these tests apply
+every migration to a throwaway database.  They are skipped unless
+TEST_DATABASE_URL points at a Postgres server whose user may create
+databases (e.g. ``postgresql://postgres@localhost:54322/postgres`` for
+``supabase start``).
+"""
+
+from __future__ import annotations
+
+import os
+import uuid
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+psycopg = pytest.importorskip("psycopg")
+
+_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "")
+_MIGRATIONS_DIR = Path(__file__).resolve().parents[3] / "supabase" / "migrations"
+
+pytestmark = pytest.mark.skipif(
+    not _DATABASE_URL, reason="TEST_DATABASE_URL is not set"
+)
+
+# analysis_jobs as it existed before the first migration (see
+# spec/worker-framework/01-state-machine-definition), plus the Supabase role
+# the migrations grant to.
+_BASE_SCHEMA = """
+DO $$
+BEGIN
+    CREATE ROLE service_role;
+EXCEPTION WHEN duplicate_object THEN NULL;
+END;
+$$;
+
+CREATE TABLE analysis_jobs (
+    id               uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    status           text NOT NULL DEFAULT 'queued'
+                     CHECK (status IN ('queued', 'running', 'succeeded', 'failed')),
+    stage            text NOT NULL DEFAULT 'created'
+                     CHECK (stage IN ('created', 'extract_done', 'langgraph_running',
+                                      'verifying_references', 'persisting_result',
+                                      'done')),
+    bucket           text NOT NULL,
+    path             text NOT NULL,
+    sha256           text NOT NULL,
+    source_type      text NOT NULL,
+    attempts         int NOT NULL DEFAULT 0,
+    max_attempts     int NOT NULL DEFAULT 3,
+    job_token        text,
+    token_expires_at timestamptz,
+    error_code       text,
+    error_detail     text,
+    result_json      jsonb,
+    results          jsonb,
+    created_at       timestamptz NOT NULL DEFAULT now(),
+    updated_at       timestamptz NOT NULL DEFAULT now()
+);
+"""
+
+
+@pytest.fixture(scope="module")
+def db() -> Iterator[psycopg.Connection]:
+    name = f"biblio_migrations_{uuid.uuid4().hex[:12]}"
+    with psycopg.connect(_DATABASE_URL, autocommit=True) as admin:
+        admin.execute(f'CREATE DATABASE "{name}"')
+        try:
+            conninfo = psycopg.conninfo.make_conninfo(
+                _DATABASE_URL, dbname=name, client_encoding="utf8"
+            )
+            with psycopg.connect(conninfo, autocommit=True) as conn:
+                conn.execute(_BASE_SCHEMA)
+                for migration in sorted(_MIGRATIONS_DIR.glob("*.sql")):
+                    conn.execute(migration.read_text())
+                yield conn
+        finally:
+            admin.execute(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)')
+
+
+def _insert_job(
+    conn: psycopg.Connection, *, status: str, job_token: str | None = None
+) -> str:
+    row = conn.execute(
+        "INSERT INTO analysis_jobs (status, bucket, path, sha256, source_type,"
+        " job_token) VALUES (%s, 'uploads', 'uploads/x/file.pdf', %s, 'pdf', %s)"
+        " RETURNING id",
+        (status, "a" * 64, job_token),
+    ).fetchone()
+    return str(row[0])
+
+
+def _status(conn: psycopg.Connection, job_id: str) -> tuple[str, object]:
+    return conn.execute(
+        "SELECT status, completed_at FROM analysis_jobs WHERE id = %s", (job_id,)
+    ).fetchone()
+
+
+def test_cancel_rpc_cancels_a_queued_job(db) -> None:
+    job_id = _insert_job(db, status="queued")
+
+    [result] = db.execute(
+        "SELECT public.request_analysis_job_cancel(%s)", (job_id,)
+    ).fetchone()
+
+    assert result == "cancelled"
+    status, completed_at = _status(db, job_id)
+    assert status == "cancelled"
+    assert completed_at is not None
+
+
+def test_worker_can_record_a_cancelled_running_job(db) -> None:
+    job_id = _insert_job(db, status="running", job_token="tok")
+
+    [result] = db.execute(
+        "SELECT public.request_analysis_job_cancel(%s)", (job_id,)
+    ).fetchone()
+    assert result == "running"
+    # The write repo.mark_cancelled makes once the worker stops the job.
+    db.execute(
+        "UPDATE analysis_jobs SET status = 'cancelled', job_token = NULL,"
+        " completed_at = now() WHERE id = %s AND job_token = 'tok'",
+        (job_id,),
+    )
+
+    assert _status(db, job_id)[0] == "cancelled"
+
+
+def test_status_constraint_still_rejects_unknown_values(db) -> None:
+    job_id = _insert_job(db, status="queued")
+
+    with pytest.raises(psycopg.errors.CheckViolation):
+        db.execute(
+            "UPDATE analysis_jobs SET status = 'paused' WHERE id = %s", (job_id,)
+        )
+
+
+def test_checkpoints_are_deleted_once_the_job_finishes(db) -> None:
+    job_id = _insert_job(db, status="running", job_token="tok")
+    [saved] = db.execute(
+        "SELECT public.save_analysis_job_checkpoint(%s, 'tok', 'langgraph_result',"
+        " %s, '1', '{}'::jsonb)",
+        (job_id, "a" * 64),
+    ).fetchone()
+    assert saved is True
+
+    def count() -> int:
+        return db.execute(
+            "SELECT count(*) FROM analysis_job_checkpoints WHERE job_id = %s",
+            (job_id,),
+        ).fetchone()[0]
+
+    # A requeue keeps them for the next attempt...
+    db.execute(
+        "SELECT public.requeue_analysis_job(%s, 'tok', 'stage_timeout')", (job_id,)
+    )
+    assert count() == 1
+
+    # ...the final write does not.
+    db.execute(
+        "UPDATE analysis_jobs SET status = 'succeeded', stage = 'done' WHERE id = %s",
+        (job_id,),
+    )
+    assert count() == 0
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from biblio_checker_worker.core import metrics
+from biblio_checker_worker.polling.scheduler import POLL_INTERVAL_GAUGE, PollScheduler
+
+
+def test_repolls_immediately_while_jobs_are_found() -> None:
+    scheduler = PollScheduler(base_seconds=5, max_seconds=60, rand=lambda: 1.0)
+
+    assert scheduler.next_delay(found_jobs=True) == 0.0
+    assert scheduler.next_delay(found_jobs=True) == 0.0
+
+
+def test_idle_backoff_doubles_up_to_the_ceiling() -> None:
+    scheduler = PollScheduler(base_seconds=5, max_seconds=30, rand=lambda: 1.0)
+
+    delays = [scheduler.next_delay(found_jobs=False) for _ in range(5)]
+
+    assert delays == [5.0, 10.0, 20.0, 30.0, 30.0]
+
+
+def test_jitter_stays_within_upper_half_of_interval() -> None:
+    scheduler = PollScheduler(base_seconds=8, max_seconds=8, rand=lambda: 0.0)
+
+    assert scheduler.next_delay(found_jobs=False) == 4.0
+
+
+def test_finding_jobs_resets_backoff_and_publishes_gauge() -> None:
+    scheduler = PollScheduler(base_seconds=5, max_seconds=60, rand=lambda: 1.0)
+    for _ in range(3):
+        scheduler.next_delay(found_jobs=False)
+
+    scheduler.next_delay(found_jobs=True)
+    assert metrics.snapshot()[POLL_INTERVAL_GAUGE] == 0.0
+
+    assert scheduler.next_delay(found_jobs=False) == 5.0
+    assert scheduler.current_interval == 5.0
+    assert metrics.snapshot()[POLL_INTERVAL_GAUGE] == 5.0
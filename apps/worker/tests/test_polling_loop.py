@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import threading
+from unittest.mock import patch
+
+from conftest import make_job
+
+from biblio_checker_worker.polling.runner import PollingLoop
+
+
+def test_loop_keeps_max_inflight_jobs_running() -> None:
+    queue = [make_job(id=f"job-{n}", sha256=f"{n:064x}") for n in range(5)]
+    release = threading.Event()
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+    finished: list[str] = []
+
+    def fake_claim(*, supabase, limit):
+        with lock:
+            batch = queue[:limit]
+            del queue[:limit]
+            return batch
+
+    def fake_process(*, supabase, job, cancel, deadline):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        release.wait(timeout=5)
+        with lock:
+            running -= 1
+            finished.append(job.id)
+
+    loop = PollingLoop(supabase=object(), max_inflight=3)
+    with (
+        patch("biblio_checker_worker.polling.runner._claim_batch", fake_claim),
+        patch("biblio_checker_worker.polling.runner.process_job", fake_process),
+    ):
+        thread = threading.Thread(target=loop.run, daemon=True)
+        thread.start()
+        for _ in range(100):
+            with lock:
+                if running == 3:
+                    break
+            threading.Event().wait(0.01)
+        release.set()
+        for _ in range(200):
+            with lock:
+                if len(finished) == 5:
+                    break
+            threading.Event().wait(0.01)
+        loop.request_drain()
+        thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert peak == 3
+    assert sorted(finished) == [f"job-{n}" for n in range(5)]
+
+
+def test_drain_requeues_jobs_still_running_after_grace() -> None:
+    queue = [make_job()]
+    cancels: list[threading.Event] = []
+    started = threading.Event()
+
+    def fake_claim(*, supabase, limit):
+        batch, queue[:] = queue[:limit], queue[limit:]
+        return batch
+
+    def fake_process(*, supabase, job, cancel, deadline):
+        cancels.append(cancel)
+        started.set()
+        cancel.wait(timeout=5)
+
+    loop = PollingLoop(supabase=object(), max_inflight=2, drain_grace_seconds=0.1)
+    with (
+        patch("biblio_checker_worker.polling.runner._claim_batch", fake_claim),
+        patch("biblio_checker_worker.polling.runner.process_job", fake_process),
+        patch("biblio_checker_worker.jobs.repo.mark_failed") as mark_failed,
+    ):
+        thread = threading.Thread(target=loop.run, daemon=True)
+        thread.start()
+        assert started.wait(timeout=2)
+        loop.request_drain()
+        thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert cancels[0].is_set()
+    mark_failed.assert_called_once()
+    kwargs = mark_failed.call_args.kwargs
+    assert kwargs["job_id"] == "job-1"
+    assert kwargs["requeue"] is True
+    assert kwargs["error_code"] == "worker_shutdown"
+    assert kwargs["attempts"] == 0
+
+
+def test_signalled_drain_stops_the_loop_and_reports_stragglers() -> None:
+    queue = [make_job()]
+    started = threading.Event()
+    finish = threading.Event()
+
+    def fake_claim(*, supabase, limit):
+        batch, queue[:] = queue[:limit], queue[limit:]
+        return batch
+
+    def fake_process(*, supabase, job, cancel, deadline):
+        started.set()
+        # Ignores ``cancel``, like a job stuck inside a stage.
+        finish.wait(timeout=5)
+
+    loop = PollingLoop(supabase=object(), max_inflight=2, drain_grace_seconds=0.1)
+    with (
+        patch("biblio_checker_worker.polling.runner._claim_batch", fake_claim),
+        patch("biblio_checker_worker.polling.runner.process_job", fake_process),
+        patch("biblio_checker_worker.jobs.repo.mark_failed"),
+    ):
+        thread = threading.Thread(target=loop.run, daemon=True)
+        thread.start()
+        assert started.wait(timeout=2)
+        loop.signal_drain()
+        thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert loop.stragglers == 1
+    finish.set()
+
+
+def test_duplicate_documents_follow_the_in_flight_leader() -> None:
+    queue = [
+        make_job(id="job-1"),
+        make_job(id="job-2", sha256="A" * 64),
+        make_job(id="job-3", sha256="b" * 64),
+    ]
+    release = threading.Event()
+    processed: list[str] = []
+    followed: list[tuple[str, object]] = []
+    following = threading.Event()
+    done = threading.Event()
+
+    def fake_claim(*, supabase, limit):
+        batch, queue[:] = queue[:limit], queue[limit:]
+        return batch
+
+    def fake_process(*, supabase, job, cancel, deadline):
+        processed.append(job.id)
+        release.wait(timeout=5)
+        return {"job": job.id}
+
+    def fake_follow(*, supabase, job, leader, cancel, deadline):
+        following.set()
+        followed.append((job.id, leader.result(timeout=5)))
+        done.set()
+
+    loop = PollingLoop(supabase=object(), max_inflight=3)
+    with (
+        patch("biblio_checker_worker.polling.runner._claim_batch", fake_claim),
+        patch("biblio_checker_worker.polling.runner.process_job", fake_process),
+        patch("biblio_checker_worker.polling.runner.process_follower", fake_follow),
+    ):
+        thread = threading.Thread(target=loop.run, daemon=True)
+        thread.start()
+        assert following.wait(timeout=5)
+        release.set()
+        assert done.wait(timeout=5)
+        loop.request_drain()
+        thread.join(timeout=5)
+
+    assert sorted(processed) == ["job-1", "job-3"]
+    assert followed == [("job-2", {"job": "job-1"})]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import os
+import signal
+import threading
+import time
+
+from biblio_checker_worker.supervisor import prefork
+from biblio_checker_worker.supervisor.prefork import PreforkSupervisor
+
+
+def _crash(**_kwargs: object) -> None:
+    os._exit(3)
+
+
+def _sleep_forever(*, on_tick) -> None:
+    while True:
+        on_tick()
+        time.sleep(0.1)
+
+
+def _hang(**_kwargs: object) -> None:
+    # Alive but never stamps its health record, like a wedged loop.
+    while True:
+        time.sleep(0.1)
+
+
+def test_supervisor_restarts_crashed_children(monkeypatch) -> None:
+    monkeypatch.setattr(prefork, "_RESTART_BACKOFF_BASE_SECONDS", 0.0)
+    supervisor = PreforkSupervisor(
+        processes=2, target=_crash, shutdown_timeout_seconds=1
+    )
+
+    for _ in range(50):
+        for slot in supervisor._slots:
+            supervisor._check_slot(slot)
+        if all(slot.restarts >= 2 for slot in supervisor._slots):
+            break
+        time.sleep(0.05)
+
+    assert all(slot.restarts >= 2 for slot in supervisor._slots)
+    supervisor._shutdown()
+
+
+def test_supervisor_forwards_sigterm_to_children(monkeypatch) -> None:
+    monkeypatch.setattr(signal, "signal", lambda *_args: None)
+    supervisor = PreforkSupervisor(
+        processes=2, target=_sleep_forever, shutdown_timeout_seconds=5
+    )
+    thread = threading.Thread(target=supervisor.run)
+    thread.start()
+    for _ in range(50):
+        if all(s.process and s.process.is_alive() for s in supervisor._slots):
+            break
+        time.sleep(0.05)
+    children = [slot.process for slot in supervisor._slots]
+
+    supervisor._request_stop(signal.SIGTERM, None)
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert all(p is not None and p.exitcode == -signal.SIGTERM for p in children)
+
+
+def test_supervisor_replaces_a_child_that_stops_ticking(monkeypatch) -> None:
+    monkeypatch.setattr(prefork, "_RESTART_BACKOFF_BASE_SECONDS", 0.0)
+    monkeypatch.setattr(prefork, "_CHILD_STALE_AFTER_SECONDS", 0.2)
+    supervisor = PreforkSupervisor(
+        processes=1, target=_hang, shutdown_timeout_seconds=1
+    )
+    slot = supervisor._slots[0]
+
+    for _ in range(100):
+        supervisor._check_slot(slot)
+        if slot.restarts >= 1:
+            break
+        time.sleep(0.05)
+
+    assert slot.restarts >= 1
+    supervisor._shutdown()
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from unittest.mock import patch
+
+from conftest import make_job
+
+from biblio_checker_worker.pipeline.deadline import Deadline
+from biblio_checker_worker.pipeline.runner import process_follower
+
+
+def _leader(result: dict | None) -> Future:
+    future: Future = Future()
+    future.set_result(result)
+    return future
+
+
+def test_follower_stores_the_leader_result() -> None:
+    with (
+        patch("biblio_checker_worker.jobs.repo.mark_succeeded") as mark_succeeded,
+        patch("biblio_checker_worker.pipeline.runner.process_job") as process_job,
+    ):
+        result = process_follower(
+            object(),
+            make_job(id="job-2"),
+            leader=_leader({"refs": []}),
+        )
+
+    assert result == {"refs": []}
+    mark_succeeded.assert_called_once()
+    assert mark_succeeded.call_args.kwargs == {
+        "job_id": "job-2",
+        "result_json": {"refs": []},
+        "token": "tok",
+    }
+    process_job.assert_not_called()
+
+
+def test_follower_processes_itself_when_the_leader_did_not_succeed() -> None:
+    with (
+        patch("biblio_checker_worker.jobs.repo.mark_succeeded") as mark_succeeded,
+        patch(
+            "biblio_checker_worker.pipeline.runner.process_job",
+            return_value={"refs": [1]},
+        ) as process_job,
+    ):
+        result = process_follower(
+            object(),
+            make_job(id="job-2"),
+            leader=_leader(None),
+            deadline=Deadline.after(0.5),
+        )
+
+    assert result == {"refs": [1]}
+    mark_succeeded.assert_not_called()
+    process_job.assert_called_once()
+    # The fallback gets a full job budget, not what the wait left over.
+    assert process_job.call_args.kwargs["deadline"].remaining() > 1
+
+
+def test_follower_gives_up_waiting_at_its_deadline() -> None:
+    with (
+        patch("biblio_checker_worker.jobs.repo.mark_failed") as mark_failed,
+        patch("biblio_checker_worker.pipeline.runner.process_job") as process_job,
+    ):
+        result = process_follower(
+            object(),
+            make_job(id="job-2"),
+            leader=Future(),
+            deadline=Deadline.after(0.05),
+        )
+
+    assert result is None
+    process_job.assert_not_called()
+    mark_failed.assert_called_once()
+    assert mark_failed.call_args.kwargs["error_code"] == "job_deadline_exceeded"
+    assert mark_failed.call_args.kwargs["requeue"] is True
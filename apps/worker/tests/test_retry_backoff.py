@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from conftest import make_job
+from pydantic import ValidationError
+
+from biblio_checker_worker.core.config import Settings
+from biblio_checker_worker.jobs.errors import StageError
+from biblio_checker_worker.pipeline import runner
+
+
+def test_delay_grows_with_attempts_and_is_capped() -> None:
+    with (
+        patch.object(runner.settings, "retry_backoff_base_seconds", 10),
+        patch.object(runner.settings, "retry_backoff_max_seconds", 60),
+    ):
+        first = [runner._retry_delay(1, None) for _ in range(50)]
+        third = [runner._retry_delay(3, None) for _ in range(50)]
+        tenth = [runner._retry_delay(10, None) for _ in range(50)]
+
+    assert all(5 <= d <= 10 for d in first)
+    assert all(20 <= d <= 40 for d in third)
+    assert all(30 <= d <= 60 for d in tenth)
+
+
+def test_retry_after_raises_the_delay_up_to_the_cap() -> None:
+    with (
+        patch.object(runner.settings, "retry_backoff_base_seconds", 1),
+        patch.object(runner.settings, "retry_backoff_max_seconds", 60),
+    ):
+        assert runner._retry_delay(1, 45) == 45
+        assert runner._retry_delay(1, 3600) == 60
+
+
+def test_backoff_cap_cannot_exceed_the_requeue_rpc_limit() -> None:
+    with pytest.raises(ValidationError):
+        Settings(retry_backoff_max_seconds=86401)
+
+
+def test_transient_stage_error_requeues_with_a_delay() -> None:
+    def failing_stage(*, supabase, ctx) -> None:
+        raise StageError(code="storage_download_failed", retry_after=30)
+
+    with (
+        patch.object(runner, "_STAGES", [failing_stage]),
+        patch.object(runner.settings, "retry_backoff_base_seconds", 1),
+        patch.object(runner.settings, "retry_backoff_max_seconds", 300),
+        patch("biblio_checker_worker.jobs.repo.fetch_checkpoints", return_value=[]),
+        patch("biblio_checker_worker.jobs.repo.renew_lease"),
+        patch("biblio_checker_worker.jobs.repo.mark_failed") as mark_failed,
+    ):
+        runner.process_job(object(), make_job(attempts=2, max_attempts=5))
+
+    kwargs = mark_failed.call_args.kwargs
+    assert kwargs["requeue"] is True
+    assert kwargs["retry_delay_seconds"] == 30
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from biblio_checker_worker.jobs.enums import JobStage
+from biblio_checker_worker.jobs.errors import JobRepoError
+from biblio_checker_worker.pipeline.reporter import StageReporter
+
+
+def _reporter() -> StageReporter:
+    return StageReporter(supabase=object(), job_id="job-1", token="tok")
+
+
+def test_reporter_coalesces_updates_while_a_write_is_in_flight() -> None:
+    release = threading.Event()
+    started = threading.Event()
+    written: list[JobStage] = []
+
+    def fake_update(_supabase, *, job_id, stage, token):
+        assert (job_id, token) == ("job-1", "tok")
+        written.append(stage)
+        started.set()
+        release.wait(timeout=2)
+
+    with patch("biblio_checker_worker.jobs.repo.update_stage", fake_update):
+        with _reporter() as reporter:
+            reporter.report(JobStage.EXTRACT_DONE)
+            assert started.wait(timeout=2)
+            reporter.report(JobStage.LANGGRAPH_RUNNING)
+            reporter.report(JobStage.VERIFYING_REFERENCES)
+            release.set()
+
+    assert written == [JobStage.EXTRACT_DONE, JobStage.VERIFYING_REFERENCES]
+
+
+def test_close_without_flush_drops_pending_update() -> None:
+    release = threading.Event()
+    started = threading.Event()
+    written: list[JobStage] = []
+
+    def fake_update(_supabase, *, stage, **_kwargs):
+        written.append(stage)
+        started.set()
+        release.wait(timeout=2)
+
+    with patch("biblio_checker_worker.jobs.repo.update_stage", fake_update):
+        with _reporter() as reporter:
+            reporter.report(JobStage.EXTRACT_DONE)
+            assert started.wait(timeout=2)
+            reporter.report(JobStage.VERIFYING_REFERENCES)
+            threading.Timer(0.1, release.set).start()
+            reporter.close(flush=False)
+            reporter.report(JobStage.LANGGRAPH_RUNNING)
+
+    assert written == [JobStage.EXTRACT_DONE]
+
+
+def test_failed_write_surfaces_to_caller() -> None:
+    def fake_update(_supabase, **_kwargs):
+        raise JobRepoError(code="stage_update_failed")
+
+    with patch("biblio_checker_worker.jobs.repo.update_stage", fake_update):
+        with _reporter() as reporter:
+            reporter.report(JobStage.EXTRACT_DONE)
+
+    with pytest.raises(JobRepoError) as excinfo:
+        reporter.raise_if_failed()
+    assert excinfo.value.code == "stage_update_failed"
@@ -0,0 +1,34 @@
+-- =============================================================================
+-- Migration: 20260311000000_notify_on_queued_analysis_job
+-- Purpose:   Wake idle workers as soon as the backend enqueues a job.
+--
+-- An AFTER INSERT trigger publishes the new job id on the
+-- 'analysis_jobs_queued' channel. Workers configured with a direct Postgres
+-- connection (DATABASE_URL) LISTEN on that channel and run a claim cycle
+-- immediately instead of waiting for their next poll. Polling stays in place
+-- as the safety net: NOTIFY is fire-and-forget and is lost while no listener
+-- is connected.
+--
+-- The payload is only the job id; tokens and storage paths are never sent.
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION public.notify_analysis_job_queued()
+RETURNS trigger
+LANGUAGE plpgsql
+SET search_path = public
+AS $$
+BEGIN
+    PERFORM pg_notify('analysis_jobs_queued', NEW.id::text);
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS analysis_jobs_notify_queued ON public.analysis_jobs;
+
+CREATE TRIGGER analysis_jobs_notify_queued
+    AFTER INSERT ON public.analysis_jobs
+    FOR EACH ROW
+    WHEN (NEW.status = 'queued')
+    EXECUTE FUNCTION public.notify_analysis_job_queued();
+
+REVOKE EXECUTE ON FUNCTION public.notify_analysis_job_queued() FROM PUBLIC;
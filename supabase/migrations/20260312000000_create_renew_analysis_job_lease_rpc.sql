@@ -0,0 +1,63 @@
+-- =============================================================================
+-- Migration: 20260312000000_create_renew_analysis_job_lease_rpc
+-- Purpose:   Let a worker extend the lease of a job it is still processing.
+--
+-- The worker heartbeat calls this RPC every ~lease/3 seconds while
+-- process_job is alive, which allows short leases (~30 s) without long
+-- analyses losing their lease mid-run. A crashed worker stops renewing, so
+-- its job becomes reclaimable within one short lease.
+--
+-- The expiry is computed with the database clock (like claim_analysis_job)
+-- so worker clock skew cannot shorten or extend a lease.
+-- =============================================================================
+
+DROP FUNCTION IF EXISTS public.renew_analysis_job_lease(uuid, text, int);
+
+-- -----------------------------------------------------------------------------
+-- Function: public.renew_analysis_job_lease
+--
+-- Parameters:
+--   p_job_id     uuid   Job whose lease is renewed.
+--   p_token      text   Lease token issued at claim time (token guard).
+--   p_lease_secs int    New lease duration from now, in seconds (1 to 3600).
+--
+-- Returns: the new job_token_expires_at, or NULL when no running row matches
+--          (the lease was lost: expired and reclaimed, or released).
+-- -----------------------------------------------------------------------------
+CREATE OR REPLACE FUNCTION public.renew_analysis_job_lease(
+    p_job_id     uuid,
+    p_token      text,
+    p_lease_secs int DEFAULT 300
+)
+RETURNS timestamptz
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_expires_at timestamptz;
+BEGIN
+    IF p_token IS NULL THEN
+        RAISE EXCEPTION 'renew_analysis_job_lease: p_token must not be NULL'
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    IF p_lease_secs < 1 OR p_lease_secs > 3600 THEN
+        RAISE EXCEPTION 'renew_analysis_job_lease: p_lease_secs must be between 1 and 3600 (got %)',
+            p_lease_secs
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    UPDATE analysis_jobs
+    SET    job_token_expires_at = now() + make_interval(secs => p_lease_secs)
+    WHERE  id = p_job_id
+      AND  job_token = p_token
+      AND  status = 'running'
+    RETURNING job_token_expires_at INTO v_expires_at;
+
+    RETURN v_expires_at;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.renew_analysis_job_lease(uuid, text, int) FROM PUBLIC;
+GRANT  EXECUTE ON FUNCTION public.renew_analysis_job_lease(uuid, text, int) TO   service_role;
@@ -0,0 +1,28 @@
+-- =============================================================================
+-- Migration: 20260313000000_add_analysis_job_reuse_columns
+-- Purpose:   Make POST /api/analysis/start idempotent and let it reuse
+--            results of documents that were already analyzed.
+--
+--   request_id          → the client's requestId; unique, so a retried
+--                         submission resolves to the job it already created.
+--   pipeline_version    → version of the analysis pipeline the job targets;
+--                         a result is only reused for the same version.
+--   reused_from_job_id  → set on jobs created as a copy of an earlier
+--                         succeeded job (no worker ran for them).
+--
+-- The partial index serves the backend's reuse lookup: the latest succeeded
+-- job for a (sha256, pipeline_version) pair.
+-- =============================================================================
+
+ALTER TABLE analysis_jobs
+  ADD COLUMN IF NOT EXISTS request_id uuid,
+  ADD COLUMN IF NOT EXISTS pipeline_version text,
+  ADD COLUMN IF NOT EXISTS reused_from_job_id uuid;
+
+CREATE UNIQUE INDEX IF NOT EXISTS analysis_jobs_request_id_key
+  ON analysis_jobs (request_id)
+  WHERE request_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS analysis_jobs_reusable_result_idx
+  ON analysis_jobs (sha256, pipeline_version, completed_at DESC)
+  WHERE status = 'succeeded';
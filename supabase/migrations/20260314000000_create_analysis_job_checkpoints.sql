@@ -0,0 +1,89 @@
+-- =============================================================================
+-- Migration: 20260314000000_create_analysis_job_checkpoints
+-- Purpose:   Persist the output of completed pipeline stages so a requeued job
+--            resumes where it stopped instead of starting over.
+--
+--   analysis_job_checkpoints → one row per (job, stage).  A checkpoint is only
+--                              used while its sha256 and pipeline_version
+--                              still match the job and the worker.
+--
+-- Writes go through save_analysis_job_checkpoint, which applies the same
+-- token guard as stage updates: only the worker holding the lease can record
+-- a checkpoint.  Rows are removed with their job.
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS analysis_job_checkpoints (
+    job_id           uuid        NOT NULL REFERENCES analysis_jobs (id) ON DELETE CASCADE,
+    stage            text        NOT NULL,
+    sha256           text        NOT NULL,
+    pipeline_version text        NOT NULL,
+    payload          jsonb       NOT NULL,
+    created_at       timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (job_id, stage)
+);
+
+-- Only the service role (worker) reads or writes checkpoints.
+ALTER TABLE analysis_job_checkpoints ENABLE ROW LEVEL SECURITY;
+
+DROP FUNCTION IF EXISTS public.save_analysis_job_checkpoint(uuid, text, text, text, text, jsonb);
+
+-- -----------------------------------------------------------------------------
+-- Function: public.save_analysis_job_checkpoint
+--
+-- Parameters:
+--   p_job_id           uuid   Job the checkpoint belongs to.
+--   p_token            text   Lease token issued at claim time (token guard).
+--   p_stage            text   Stage whose output is stored.
+--   p_sha256           text   Content hash the output was computed from.
+--   p_pipeline_version text   Worker pipeline version that produced it.
+--   p_payload          jsonb  The stage output.
+--
+-- Returns: true when the checkpoint was stored, false when no running row
+--          matches the token (the lease was lost).
+-- -----------------------------------------------------------------------------
+CREATE OR REPLACE FUNCTION public.save_analysis_job_checkpoint(
+    p_job_id           uuid,
+    p_token            text,
+    p_stage            text,
+    p_sha256           text,
+    p_pipeline_version text,
+    p_payload          jsonb
+)
+RETURNS boolean
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    IF p_token IS NULL THEN
+        RAISE EXCEPTION 'save_analysis_job_checkpoint: p_token must not be NULL'
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    PERFORM 1
+    FROM   analysis_jobs
+    WHERE  id = p_job_id
+      AND  job_token = p_token
+      AND  status = 'running'
+    FOR SHARE;
+
+    IF NOT FOUND THEN
+        RETURN false;
+    END IF;
+
+    INSERT INTO analysis_job_checkpoints
+        (job_id, stage, sha256, pipeline_version, payload)
+    VALUES
+        (p_job_id, p_stage, p_sha256, p_pipeline_version, p_payload)
+    ON CONFLICT (job_id, stage) DO UPDATE
+    SET    sha256           = EXCLUDED.sha256,
+           pipeline_version = EXCLUDED.pipeline_version,
+           payload          = EXCLUDED.payload,
+           created_at       = now();
+
+    RETURN true;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.save_analysis_job_checkpoint(uuid, text, text, text, text, jsonb) FROM PUBLIC;
+GRANT  EXECUTE ON FUNCTION public.save_analysis_job_checkpoint(uuid, text, text, text, text, jsonb) TO   service_role;
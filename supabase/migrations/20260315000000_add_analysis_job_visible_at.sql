@@ -0,0 +1,224 @@
+-- =============================================================================
+-- Migration: 20260315000000_add_analysis_job_visible_at
+-- Purpose:   Delay requeued jobs so a failing dependency is not retried in a
+--            hot loop.
+--
+--   visible_at → earliest time a queued job may be claimed.  The worker sets
+--                it when it requeues a job (exponential backoff with jitter,
+--                or the retry-after suggested by the failing stage) and clears
+--                it otherwise.  NULL means claimable immediately, so rows
+--                written by the backend are unaffected.
+--
+-- Both claim RPCs are recreated with the extra condition on Case A; their
+-- signatures, validation and lease semantics are unchanged.  Expired leases
+-- (Case B) are reclaimed regardless of visible_at.
+-- =============================================================================
+
+ALTER TABLE analysis_jobs
+  ADD COLUMN IF NOT EXISTS visible_at timestamptz;
+
+DROP FUNCTION IF EXISTS public.claim_analysis_job(text, int);
+
+CREATE OR REPLACE FUNCTION public.claim_analysis_job(
+    p_token      text,
+    p_lease_secs int DEFAULT 300
+)
+RETURNS SETOF analysis_jobs
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    -- Input validation (unchanged from original)
+
+    IF p_token IS NULL THEN
+        RAISE EXCEPTION 'claim_analysis_job: p_token must not be NULL'
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    IF length(p_token) < 32 OR length(p_token) > 64 THEN
+        RAISE EXCEPTION 'claim_analysis_job: p_token length must be between 32 and 64 characters (got %)',
+            length(p_token)
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    IF p_token !~ '^[A-Za-z0-9_\-]+$' THEN
+        RAISE EXCEPTION 'claim_analysis_job: p_token contains disallowed characters; must match ^[A-Za-z0-9_-]+'
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    IF p_lease_secs < 1 OR p_lease_secs > 3600 THEN
+        RAISE EXCEPTION 'claim_analysis_job: p_lease_secs must be between 1 and 3600 (got %)',
+            p_lease_secs
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    -- Core logic: atomic SELECT ... FOR UPDATE SKIP LOCKED + UPDATE RETURNING.
+    --
+    -- Eligible jobs — two cases:
+    --
+    --   Case A (queued):
+    --     status = 'queued'
+    --     AND (visible_at IS NULL OR visible_at <= now())
+    --
+    --   Case B (running, crashed worker):
+    --     status = 'running'
+    --     AND job_token_expires_at IS NOT NULL
+    --     AND job_token_expires_at < now()
+    --
+    --   Both cases require: attempts < max_attempts
+
+    RETURN QUERY
+    UPDATE analysis_jobs
+    SET
+        status               = 'running',
+        stage                = 'created',
+        job_token            = p_token,
+        job_token_expires_at = now() + make_interval(secs => p_lease_secs),
+        attempts             = attempts + 1,
+        updated_at           = now()
+    WHERE id = (
+        SELECT id
+        FROM   analysis_jobs
+        WHERE  attempts < max_attempts
+          AND  (
+                   -- Case A: queued job whose retry delay has elapsed
+                   (
+                       status = 'queued'
+                       AND (visible_at IS NULL OR visible_at <= now())
+                   )
+                   OR
+                   -- Case B: running job with expired lease (crashed worker)
+                   (
+                       status = 'running'
+                       AND job_token_expires_at IS NOT NULL
+                       AND job_token_expires_at < now()
+                   )
+               )
+        ORDER BY created_at ASC
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING *;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.claim_analysis_job(text, int) FROM PUBLIC;
+GRANT  EXECUTE ON FUNCTION public.claim_analysis_job(text, int) TO   service_role;
+
+DROP FUNCTION IF EXISTS public.claim_analysis_jobs(text[], int);
+
+-- -----------------------------------------------------------------------------
+-- Function: public.claim_analysis_jobs
+--
+-- Parameters:
+--   p_tokens     text[]      One worker-generated lease token per job to claim.
+--                            1 to 64 tokens; each must be 32-64 characters,
+--                            matching ^[A-Za-z0-9_\-]+$, and unique.
+--   p_lease_secs int DEFAULT 300
+--                            Lease duration in seconds (1 to 3600).
+--
+-- Returns: SETOF analysis_jobs (0 to array_length(p_tokens) rows)
+-- -----------------------------------------------------------------------------
+CREATE OR REPLACE FUNCTION public.claim_analysis_jobs(
+    p_tokens     text[],
+    p_lease_secs int DEFAULT 300
+)
+RETURNS SETOF analysis_jobs
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_limit int;
+    v_token text;
+BEGIN
+    IF p_tokens IS NULL THEN
+        RAISE EXCEPTION 'claim_analysis_jobs: p_tokens must not be NULL'
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    v_limit := coalesce(array_length(p_tokens, 1), 0);
+    IF v_limit < 1 OR v_limit > 64 THEN
+        RAISE EXCEPTION 'claim_analysis_jobs: p_tokens must contain between 1 and 64 tokens (got %)',
+            v_limit
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    FOREACH v_token IN ARRAY p_tokens LOOP
+        IF v_token IS NULL THEN
+            RAISE EXCEPTION 'claim_analysis_jobs: p_tokens must not contain NULL'
+                USING ERRCODE = 'invalid_parameter_value';
+        END IF;
+
+        IF length(v_token) < 32 OR length(v_token) > 64 THEN
+            RAISE EXCEPTION 'claim_analysis_jobs: token length must be between 32 and 64 characters (got %)',
+                length(v_token)
+                USING ERRCODE = 'invalid_parameter_value';
+        END IF;
+
+        IF v_token !~ '^[A-Za-z0-9_\-]+$' THEN
+            RAISE EXCEPTION 'claim_analysis_jobs: token contains disallowed characters; must match ^[A-Za-z0-9_-]+'
+                USING ERRCODE = 'invalid_parameter_value';
+        END IF;
+    END LOOP;
+
+    IF (SELECT count(DISTINCT t) FROM unnest(p_tokens) AS t) <> v_limit THEN
+        RAISE EXCEPTION 'claim_analysis_jobs: p_tokens must be unique'
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    IF p_lease_secs < 1 OR p_lease_secs > 3600 THEN
+        RAISE EXCEPTION 'claim_analysis_jobs: p_lease_secs must be between 1 and 3600 (got %)',
+            p_lease_secs
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    -- Core logic: lock up to v_limit eligible rows with FOR UPDATE SKIP LOCKED,
+    -- number them in FIFO order, and hand row N the N-th token.
+    --
+    -- Row locking is done in its own CTE because FOR UPDATE cannot be combined
+    -- with window functions in the same SELECT.
+    RETURN QUERY
+    WITH locked AS (
+        SELECT id, created_at
+        FROM   analysis_jobs
+        WHERE  attempts < max_attempts
+          AND  (
+                   -- Case A: queued job whose retry delay has elapsed
+                   (
+                       status = 'queued'
+                       AND (visible_at IS NULL OR visible_at <= now())
+                   )
+                   OR
+                   -- Case B: running job with expired lease (crashed worker)
+                   (
+                       status = 'running'
+                       AND job_token_expires_at IS NOT NULL
+                       AND job_token_expires_at < now()
+                   )
+               )
+        ORDER BY created_at ASC
+        LIMIT v_limit
+        FOR UPDATE SKIP LOCKED
+    ),
+    numbered AS (
+        SELECT id, row_number() OVER (ORDER BY created_at ASC, id) AS rn
+        FROM   locked
+    )
+    UPDATE analysis_jobs AS j
+    SET
+        status               = 'running',
+        stage                = 'created',
+        job_token            = p_tokens[n.rn::int],
+        job_token_expires_at = now() + make_interval(secs => p_lease_secs),
+        attempts             = j.attempts + 1,
+        updated_at           = now()
+    FROM numbered AS n
+    WHERE j.id = n.id
+    RETURNING j.*;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.claim_analysis_jobs(text[], int) FROM PUBLIC;
+GRANT  EXECUTE ON FUNCTION public.claim_analysis_jobs(text[], int) TO   service_role;
@@ -0,0 +1,139 @@
+-- =============================================================================
+-- Migration: 20260316000000_add_analysis_job_cancellation
+-- Purpose:   Let the client cancel an analysis it no longer waits for.
+--
+--   cancel_requested → set by POST /api/analysis/cancel.  A queued job is
+--                      cancelled on the spot; a running job is stopped by its
+--                      worker at the next stage boundary (or verification
+--                      step) with the terminal status 'cancelled'.
+--
+-- request_analysis_job_cancel applies both cases atomically, so a job that
+-- is claimed concurrently still ends up with the flag set.
+--
+-- renew_analysis_job_lease now also returns the flag: workers learn about a
+-- cancellation from the heartbeat they already send, at no extra round trip.
+-- A job requeued after the flag was set is finalized by the worker that
+-- claims it, without running the pipeline.
+--
+-- The status CHECK constraint only allowed queued, running, succeeded and
+-- failed; it is replaced by one that also allows 'cancelled'.  The original
+-- constraint was created outside these migrations, so it is looked up by
+-- column rather than by name.
+-- =============================================================================
+
+ALTER TABLE analysis_jobs
+  ADD COLUMN IF NOT EXISTS cancel_requested boolean NOT NULL DEFAULT false;
+
+DO $$
+DECLARE
+    v_conname text;
+BEGIN
+    FOR v_conname IN
+        SELECT con.conname
+        FROM   pg_constraint con
+        JOIN   pg_attribute att
+          ON   att.attrelid = con.conrelid
+         AND   att.attnum = con.conkey[1]
+        WHERE  con.conrelid = 'public.analysis_jobs'::regclass
+          AND  con.contype = 'c'
+          AND  cardinality(con.conkey) = 1
+          AND  att.attname = 'status'
+    LOOP
+        EXECUTE format('ALTER TABLE analysis_jobs DROP CONSTRAINT %I', v_conname);
+    END LOOP;
+END;
+$$;
+
+ALTER TABLE analysis_jobs
+  ADD CONSTRAINT analysis_jobs_status_check
+  CHECK (status IN ('queued', 'running', 'succeeded', 'failed', 'cancelled'));
+
+DROP FUNCTION IF EXISTS public.request_analysis_job_cancel(uuid);
+
+-- -----------------------------------------------------------------------------
+-- Function: public.request_analysis_job_cancel
+--
+-- Parameters:
+--   p_job_id uuid   Job to cancel (the caller has checked its poll token).
+--
+-- Returns: the job's status after the call — 'cancelled' for a job that was
+--          queued, 'running' for a job whose worker will stop it — or NULL
+--          when the job is not queued or running (already finished).
+-- -----------------------------------------------------------------------------
+CREATE OR REPLACE FUNCTION public.request_analysis_job_cancel(
+    p_job_id uuid
+)
+RETURNS text
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_status text;
+BEGIN
+    -- Right-hand sides see the row as it was before the update.
+    UPDATE analysis_jobs
+    SET    cancel_requested = true,
+           status           = CASE WHEN status = 'queued' THEN 'cancelled' ELSE status END,
+           completed_at     = CASE WHEN status = 'queued' THEN now() ELSE completed_at END,
+           updated_at       = now()
+    WHERE  id = p_job_id
+      AND  status IN ('queued', 'running')
+    RETURNING status INTO v_status;
+
+    RETURN v_status;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.request_analysis_job_cancel(uuid) FROM PUBLIC;
+GRANT  EXECUTE ON FUNCTION public.request_analysis_job_cancel(uuid) TO   service_role;
+
+-- The return type changes, so the function must be dropped first.
+DROP FUNCTION IF EXISTS public.renew_analysis_job_lease(uuid, text, int);
+
+-- -----------------------------------------------------------------------------
+-- Function: public.renew_analysis_job_lease
+--
+-- Parameters:
+--   p_job_id     uuid   Job whose lease is renewed.
+--   p_token      text   Lease token issued at claim time (token guard).
+--   p_lease_secs int    New lease duration from now, in seconds (1 to 3600).
+--
+-- Returns: one row (job_token_expires_at, cancel_requested), or no row when
+--          no running row matches (the lease was lost: expired and
+--          reclaimed, or released).
+-- -----------------------------------------------------------------------------
+CREATE OR REPLACE FUNCTION public.renew_analysis_job_lease(
+    p_job_id     uuid,
+    p_token      text,
+    p_lease_secs int DEFAULT 300
+)
+RETURNS TABLE (job_token_expires_at timestamptz, cancel_requested boolean)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    IF p_token IS NULL THEN
+        RAISE EXCEPTION 'renew_analysis_job_lease: p_token must not be NULL'
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    IF p_lease_secs < 1 OR p_lease_secs > 3600 THEN
+        RAISE EXCEPTION 'renew_analysis_job_lease: p_lease_secs must be between 1 and 3600 (got %)',
+            p_lease_secs
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    RETURN QUERY
+    UPDATE analysis_jobs AS j
+    SET    job_token_expires_at = now() + make_interval(secs => p_lease_secs)
+    WHERE  j.id = p_job_id
+      AND  j.job_token = p_token
+      AND  j.status = 'running'
+    RETURNING j.job_token_expires_at, j.cancel_requested;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.renew_analysis_job_lease(uuid, text, int) FROM PUBLIC;
+GRANT  EXECUTE ON FUNCTION public.renew_analysis_job_lease(uuid, text, int) TO   service_role;
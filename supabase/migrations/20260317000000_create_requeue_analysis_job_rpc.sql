@@ -0,0 +1,82 @@
+-- =============================================================================
+-- Migration: 20260317000000_create_requeue_analysis_job_rpc
+-- Purpose:   Requeue a failed attempt with its retry delay applied by the
+--            database clock.
+--
+-- The worker used to compute visible_at from its own wall clock, so a
+-- skewed worker clock could hide a requeued job far too long or make it
+-- claimable at once.  The worker now sends only the delay; visible_at is
+-- now() + delay, on the same clock the claim RPCs compare it against (like
+-- the lease expiry in claim_analysis_job and renew_analysis_job_lease).
+-- =============================================================================
+
+DROP FUNCTION IF EXISTS public.requeue_analysis_job(uuid, text, text, text, double precision, int);
+
+-- -----------------------------------------------------------------------------
+-- Function: public.requeue_analysis_job
+--
+-- Parameters:
+--   p_job_id           uuid              Job being requeued.
+--   p_token            text              Lease token issued at claim time
+--                                         (token guard).
+--   p_error_code       text              Error recorded for the attempt.
+--   p_error_detail     text              Sanitized error detail (nullable).
+--   p_retry_delay_secs double precision  Seconds before the job may be
+--                                         claimed again; 0 clears visible_at.
+--   p_attempts         int               When not NULL, resets the attempts
+--                                         counter (graceful shutdown hands
+--                                         back an unfinished attempt).
+--
+-- Returns: the job id, or NULL when no row holds the token (the lease was
+--          lost: expired and reclaimed, or released).
+-- -----------------------------------------------------------------------------
+CREATE OR REPLACE FUNCTION public.requeue_analysis_job(
+    p_job_id           uuid,
+    p_token            text,
+    p_error_code       text,
+    p_error_detail     text DEFAULT NULL,
+    p_retry_delay_secs double precision DEFAULT 0,
+    p_attempts         int DEFAULT NULL
+)
+RETURNS uuid
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_job_id uuid;
+BEGIN
+    IF p_token IS NULL THEN
+        RAISE EXCEPTION 'requeue_analysis_job: p_token must not be NULL'
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    IF p_retry_delay_secs IS NULL OR p_retry_delay_secs < 0 OR p_retry_delay_secs > 86400 THEN
+        RAISE EXCEPTION 'requeue_analysis_job: p_retry_delay_secs must be between 0 and 86400 (got %)',
+            p_retry_delay_secs
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    UPDATE analysis_jobs
+    SET    status               = 'queued',
+           stage                = 'created',
+           error_code           = p_error_code,
+           error_detail         = p_error_detail,
+           job_token            = NULL,
+           job_token_expires_at = NULL,
+           visible_at           = CASE
+                                      WHEN p_retry_delay_secs > 0
+                                      THEN now() + make_interval(secs => p_retry_delay_secs)
+                                  END,
+           attempts             = COALESCE(GREATEST(p_attempts, 0), attempts),
+           updated_at           = now()
+    WHERE  id = p_job_id
+      AND  job_token = p_token
+    RETURNING id INTO v_job_id;
+
+    RETURN v_job_id;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.requeue_analysis_job(uuid, text, text, text, double precision, int) FROM PUBLIC;
+GRANT  EXECUTE ON FUNCTION public.requeue_analysis_job(uuid, text, text, text, double precision, int) TO   service_role;
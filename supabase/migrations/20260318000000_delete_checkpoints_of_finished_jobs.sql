@@ -0,0 +1,42 @@
+-- =============================================================================
+-- Migration: 20260318000000_delete_checkpoints_of_finished_jobs
+-- Purpose:   Drop a job's stage checkpoints once it can no longer be retried.
+--
+-- Checkpoints only serve a requeued attempt, but they used to be removed
+-- only with their job, so analysis_job_checkpoints grew with every job ever
+-- run.  An AFTER UPDATE trigger now deletes them when the job reaches a
+-- terminal status (succeeded, failed or cancelled).  Doing it in the
+-- database covers every path that finalizes a job — worker writes and the
+-- cancel RPC alike — without an extra round trip from the worker.  A
+-- requeue sets status back to 'queued', so its checkpoints are kept.
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION public.delete_finished_analysis_job_checkpoints()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    DELETE FROM analysis_job_checkpoints
+    WHERE  job_id = NEW.id;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS analysis_jobs_delete_finished_checkpoints ON public.analysis_jobs;
+
+CREATE TRIGGER analysis_jobs_delete_finished_checkpoints
+    AFTER UPDATE OF status ON public.analysis_jobs
+    FOR EACH ROW
+    WHEN (NEW.status IN ('succeeded', 'failed', 'cancelled')
+          AND NEW.status IS DISTINCT FROM OLD.status)
+    EXECUTE FUNCTION public.delete_finished_analysis_job_checkpoints();
+
+REVOKE EXECUTE ON FUNCTION public.delete_finished_analysis_job_checkpoints() FROM PUBLIC;
+
+-- Checkpoints left behind by jobs that finished before this migration.
+DELETE FROM analysis_job_checkpoints c
+USING  analysis_jobs j
+WHERE  j.id = c.job_id
+  AND  j.status IN ('succeeded', 'failed', 'cancelled');